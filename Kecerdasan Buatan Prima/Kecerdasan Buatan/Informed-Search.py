@@ -8,17 +8,26 @@ Algorithms:
 - Greedy Best-First
 - A*
 - Weighted A*
+- ARA* (anytime weighted A*, best of the weight schedule)
 - IDA* (Iterative Deepening A*)
-- SMA* (simplified memory-bounded A*)
-- Bidirectional A* (simple meet-in-the-middle)
+- SMA* (simplified memory-bounded A*, min-max heap frontier)
+- Bidirectional A* (NBA*)
 
-Outputs: path, cost, nodes expanded, elapsed time (ms)
+Outputs: path, cost, nodes expanded, elapsed time (ms). Every search also
+takes ``stats`` (a search_stats.SearchStats or dict) for the full counters.
 """
 
 import heapq
 import time
 from collections import deque
 
+from csr_graph import CSRGraph
+from indexed_heap import make_open_list
+from minmax_heap import MinMaxHeap
+from search_state import acquire_state, release_state
+from search_stats import SearchStats, elapsed_ms, measure, print_table, record, write_stats
+from search_trace import POP, SKIP, ENQUEUE, BACKTRACK, BOUND
+
 # -------------------------
 # Romania graph (undirected)
 # -------------------------
@@ -46,6 +55,8 @@ GRAPH = {
 }
 
 # Straight-line distances (heuristic) to Bucharest
+# (for any other goal use heuristic_provider.CoordinateHeuristics(GRAPH, COORDS).heuristic(goal)
+# or landmarks.Landmarks.build(GRAPH).heuristic(goal))
 H = {
     "Arad":366, "Bucharest":0, "Craiova":160, "Drobeta":242, "Eforie":161,
     "Fagaras":176, "Giurgiu":77, "Hirsova":151, "Iasi":226, "Lugoj":244,
@@ -53,6 +64,15 @@ H = {
     "Sibiu":253, "Timisoara":329, "Urziceni":80, "Vaslui":199, "Zerind":374
 }
 
+# City positions on the map (planar, same units as the road lengths)
+COORDS = {
+    "Arad":(91, 492), "Bucharest":(400, 327), "Craiova":(253, 288), "Drobeta":(165, 299),
+    "Eforie":(562, 293), "Fagaras":(305, 449), "Giurgiu":(375, 270), "Hirsova":(534, 350),
+    "Iasi":(473, 506), "Lugoj":(165, 379), "Mehadia":(168, 339), "Neamt":(406, 537),
+    "Oradea":(131, 571), "Pitesti":(320, 368), "Rimnicu Vilcea":(233, 410), "Sibiu":(207, 457),
+    "Timisoara":(94, 410), "Urziceni":(456, 350), "Vaslui":(509, 444), "Zerind":(108, 531)
+}
+
 START = "Arad"
 GOAL = "Bucharest"
 
@@ -69,6 +89,87 @@ def reconstruct_from_parent(parent, node):
     path.reverse()
     return path
 
+def bind_graph(graph, h, start, goal):
+    """
+    Return (edges, hval, start, goal, names) for a dict or CSRGraph.
+
+    For a CSRGraph the search runs on integer ids: start/goal are translated,
+    the heuristic table is flattened into a list indexed by id, and ``names``
+    maps ids back for the returned path. For dicts everything stays keyed
+    by name and ``names`` is None.
+    """
+    if isinstance(graph, CSRGraph):
+        return (graph.edges, graph.node_values(h, 0).__getitem__,
+                graph.id_of(start), graph.id_of(goal), graph.names)
+    return (lambda node: graph.get(node, {}).items()), (lambda node: h.get(node, 0)), start, goal, None
+
+def best_first_on_ids(algorithm, graph, h, start, goal, weight, emit, open_list, stats, t0):
+    """
+    A* / weighted A* (f = g + weight*h) on a CSRGraph, with g, parent and
+    closed kept in a pooled search_state.SearchState instead of dicts and
+    a set. Same expansion order, path, cost and counters as the dict loop.
+    """
+    edges = graph.edges
+    hv = graph.node_values(h, 0)
+    start, goal = graph.id_of(start), graph.id_of(goal)
+    state = acquire_state(graph.num_nodes, graph.weight_typecode)
+    gen = state.begin()
+    gscore, parent, closed, stamp = state.g, state.parent, state.closed, state.stamp
+    stamp[start], gscore[start], parent[start], closed[start] = gen, 0, -1, 0
+    open_pq = make_open_list(open_list)
+    open_pq.push((weight*hv[start], 0, start))
+    nodes_expanded = generated = reopened = 0
+    path = None
+
+    while open_pq:
+        f, g, node = open_pq.pop()
+        if closed[node]:
+            open_pq.stale_pops += 1
+            if emit:
+                emit(SKIP, node)
+            continue
+        closed[node] = 1
+        nodes_expanded += 1
+        if emit:
+            emit(POP, node)
+        if node == goal:
+            path = decode_path(state.path(node), graph.names)
+            break
+        g_node = gscore[node]
+        for nbr, w in edges(node):
+            generated += 1
+            tentative_g = g_node + w
+            if stamp[nbr] != gen:
+                stamp[nbr] = gen
+                closed[nbr] = 0
+            elif tentative_g >= gscore[nbr]:
+                continue
+            elif closed[nbr]:
+                reopened += 1
+            gscore[nbr] = tentative_g
+            parent[nbr] = node
+            open_pq.push((tentative_g + weight*hv[nbr], tentative_g, nbr))
+            if emit:
+                emit(ENQUEUE, nbr)
+    cost = float('inf') if path is None else gscore[goal]
+    release_state(state)
+    # Every expanded node is closed, and nothing is ever un-closed
+    record(stats, algorithm, t0, nodes_expanded, generated, reopened=reopened,
+           max_closed=nodes_expanded, open_lists=(open_pq,))
+    return path, cost, nodes_expanded, elapsed_ms(t0)
+
+def bind_tracer(tracer, algorithm, start, goal):
+    """Return the tracer's emit function (or None when tracing is off)."""
+    if tracer is None:
+        return None
+    tracer.begin(algorithm, start=start, goal=goal)
+    return tracer.emit
+
+def decode_path(path, names):
+    if path is None or names is None:
+        return path
+    return [names[node] for node in path]
+
 def path_cost(graph, path):
     if not path:
         return float('inf')
@@ -80,272 +181,833 @@ def path_cost(graph, path):
 # -------------------------
 # Greedy Best-First Search
 # -------------------------
-def greedy_best_first(graph, h, start, goal):
-    t0 = time.time()
+def greedy_best_first(graph, h, start, goal, tracer=None, stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "greedy_best_first", start, goal)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
     open_pq = []
-    heapq.heappush(open_pq, (h[start], start))
+    heapq.heappush(open_pq, (hval(start), start))
     parent = {start: None}
     closed = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = stale = 0
+    max_open = 1
+    path = None
 
     while open_pq:
         _, node = heapq.heappop(open_pq)
         if node in closed:
+            stale += 1
+            if emit:
+                emit(SKIP, node)
             continue
         closed.add(node)
         nodes_expanded += 1
+        if emit:
+            emit(POP, node)
         if node == goal:
-            path = reconstruct_from_parent(parent, node)
-            return path, path_cost(graph, path), nodes_expanded, (time.time()-t0)*1000
-        for nbr in graph.get(node, {}):
+            path = decode_path(reconstruct_from_parent(parent, node), names)
+            break
+        for nbr, _ in edges(node):
+            generated += 1
             if nbr not in closed:
                 # set parent only first time to preserve simple path
                 if nbr not in parent:
                     parent[nbr] = node
-                heapq.heappush(open_pq, (h.get(nbr, 0), nbr))
-    return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+                heapq.heappush(open_pq, (hval(nbr), nbr))
+                if emit:
+                    emit(ENQUEUE, nbr)
+        if len(open_pq) > max_open:
+            max_open = len(open_pq)
+    # Every entry pushed was either popped (expanded or stale) or is still queued
+    record(stats, "greedy_best_first", t0, nodes_expanded, generated,
+           pushes=nodes_expanded + stale + len(open_pq), stale_pops=stale,
+           max_open=max_open, max_closed=len(closed))
+    if path is None:
+        return None, float('inf'), nodes_expanded, elapsed_ms(t0)
+    return path, path_cost(graph, path), nodes_expanded, elapsed_ms(t0)
 
 # -------------------------
 # A* Search
 # -------------------------
-def a_star(graph, h, start, goal):
-    t0 = time.time()
-    open_pq = []
-    heapq.heappush(open_pq, (h[start], 0, start))  # (f, g, node)
+def a_star(graph, h, start, goal, tracer=None, open_list='lazy', stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "a_star", start, goal)
+    if isinstance(graph, CSRGraph):
+        return best_first_on_ids("a_star", graph, h, start, goal, 1, emit, open_list, stats, t0)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    open_pq = make_open_list(open_list)
+    open_pq.push((hval(start), 0, start))  # (f, g, node)
     parent = {start: None}
     gscore = {start: 0}
     closed = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = reopened = 0
+    path = None
 
     while open_pq:
-        f, g, node = heapq.heappop(open_pq)
+        f, g, node = open_pq.pop()
         if node in closed:
+            open_pq.stale_pops += 1
+            if emit:
+                emit(SKIP, node)
             continue
         closed.add(node)
         nodes_expanded += 1
+        if emit:
+            emit(POP, node)
         if node == goal:
-            path = reconstruct_from_parent(parent, node)
-            return path, gscore[node], nodes_expanded, (time.time()-t0)*1000
-        for nbr, w in graph.get(node, {}).items():
+            path = decode_path(reconstruct_from_parent(parent, node), names)
+            break
+        for nbr, w in edges(node):
+            generated += 1
             tentative_g = gscore[node] + w
             if nbr not in gscore or tentative_g < gscore[nbr]:
+                if nbr in closed:
+                    reopened += 1
                 gscore[nbr] = tentative_g
                 parent[nbr] = node
-                heapq.heappush(open_pq, (tentative_g + h.get(nbr,0), tentative_g, nbr))
-    return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+                open_pq.push((tentative_g + hval(nbr), tentative_g, nbr))
+                if emit:
+                    emit(ENQUEUE, nbr)
+    record(stats, "a_star", t0, nodes_expanded, generated, reopened=reopened,
+           max_closed=len(closed), open_lists=(open_pq,))
+    if path is None:
+        return None, float('inf'), nodes_expanded, elapsed_ms(t0)
+    return path, gscore[goal], nodes_expanded, elapsed_ms(t0)
 
 # -------------------------
 # Weighted A* (g + w*h)
 # -------------------------
-def weighted_a_star(graph, h, start, goal, weight=1.5):
-    t0 = time.time()
-    open_pq = []
-    heapq.heappush(open_pq, (weight*h[start], 0, start))
+def weighted_a_star(graph, h, start, goal, weight=1.5, tracer=None, open_list='lazy', stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "weighted_a_star", start, goal)
+    if isinstance(graph, CSRGraph):
+        return best_first_on_ids("weighted_a_star", graph, h, start, goal, weight, emit,
+                                 open_list, stats, t0)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    open_pq = make_open_list(open_list)
+    open_pq.push((weight*hval(start), 0, start))
     parent = {start: None}
     gscore = {start: 0}
     closed = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = reopened = 0
+    path = None
 
     while open_pq:
-        f, g, node = heapq.heappop(open_pq)
+        f, g, node = open_pq.pop()
         if node in closed:
+            open_pq.stale_pops += 1
+            if emit:
+                emit(SKIP, node)
             continue
         closed.add(node)
         nodes_expanded += 1
+        if emit:
+            emit(POP, node)
         if node == goal:
-            path = reconstruct_from_parent(parent, node)
-            return path, gscore[node], nodes_expanded, (time.time()-t0)*1000
-        for nbr, wcost in graph.get(node, {}).items():
+            path = decode_path(reconstruct_from_parent(parent, node), names)
+            break
+        for nbr, wcost in edges(node):
+            generated += 1
             tentative_g = gscore[node] + wcost
             if nbr not in gscore or tentative_g < gscore[nbr]:
+                if nbr in closed:
+                    reopened += 1
                 gscore[nbr] = tentative_g
                 parent[nbr] = node
-                heapq.heappush(open_pq, (tentative_g + weight*h.get(nbr,0), tentative_g, nbr))
-    return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+                open_pq.push((tentative_g + weight*hval(nbr), tentative_g, nbr))
+                if emit:
+                    emit(ENQUEUE, nbr)
+    record(stats, "weighted_a_star", t0, nodes_expanded, generated, reopened=reopened,
+           max_closed=len(closed), open_lists=(open_pq,))
+    if path is None:
+        return None, float('inf'), nodes_expanded, elapsed_ms(t0)
+    return path, gscore[goal], nodes_expanded, elapsed_ms(t0)
+
+# -------------------------
+# ARA* (Anytime Repairing A*)
+# -------------------------
+def ara_star(graph, h, start, goal, initial_weight=3.0, weight_step=0.5, deadline=None,
+             tracer=None, open_list='lazy', stats=None):
+    """
+    Anytime weighted A*: a generator of ever better paths.
+
+    Runs weighted A* with ``initial_weight``, then lowers the weight by
+    ``weight_step`` down to 1. g-values and parents are kept between
+    iterations. A node improved after it was closed goes to INCONS, and the
+    next iteration re-opens only the open and INCONS nodes, so each run
+    repairs the previous one instead of starting over (Likhachev et al.).
+
+    Yields ``(path, cost, nodes_expanded, ms, bound)`` whenever the path
+    or its suboptimality bound improves; ``cost <= bound * optimal`` for
+    a consistent h. The last value yielded is the best so far; a bound of
+    1 means it is optimal. ``deadline`` (seconds from the call) stops the
+    search early, as does simply not asking for the next value.
+
+    The cost yielded is that of the path yielded. A node improved after it
+    was closed gets a new parent, but its descendants keep their old g
+    until the next iteration, so the parent walk to goal can be cheaper
+    than g(goal).
+
+    Raises ValueError (on the first next()) when weight_step <= 0, which
+    would never lower the weight.
+    """
+    if weight_step <= 0:
+        raise ValueError("weight_step must be positive")
+    t0 = time.perf_counter_ns()
+    stop_at = None if deadline is None else time.monotonic() + deadline
+    emit = bind_tracer(tracer, "ara_star", start, goal)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    inf = float('inf')
+    parent = {start: None}
+    gscore = {start: 0}
+    open_nodes = {start}
+    incons = set()  # improved after being closed in the current iteration
+    open_lists = []
+    nodes_expanded = generated = reopened = max_closed = 0
+    best_cost, best_bound = inf, inf
+    weight = max(1.0, initial_weight)
+
+    while True:
+        open_pq = make_open_list(open_list)
+        open_lists.append(open_pq)
+        for node in open_nodes:
+            open_pq.push((gscore[node] + weight*hval(node), gscore[node], node))
+        closed = set()
+        if emit:
+            emit(BOUND, None, weight)
+        goal_g = gscore.get(goal, inf)
+        goal_f = goal_g + weight*hval(goal)
+
+        while open_pq:
+            f, g, node = open_pq.peek()
+            if node not in open_nodes or g != gscore[node]:
+                open_pq.pop()
+                open_pq.stale_pops += 1
+                continue
+            if f >= goal_f:
+                break
+            if stop_at is not None and time.monotonic() >= stop_at:
+                record(stats, "ara_star", t0, nodes_expanded, generated, reopened=reopened,
+                       max_closed=max(max_closed, len(closed)), open_lists=open_lists, sequential=True)
+                return
+            open_pq.pop()
+            open_nodes.discard(node)
+            closed.add(node)
+            nodes_expanded += 1
+            if emit:
+                emit(POP, node)
+            for nbr, wcost in edges(node):
+                generated += 1
+                tentative_g = g + wcost
+                if tentative_g < gscore.get(nbr, inf):
+                    gscore[nbr] = tentative_g
+                    parent[nbr] = node
+                    if nbr == goal:
+                        goal_g = tentative_g
+                        goal_f = goal_g + weight*hval(goal)
+                    if nbr in closed:
+                        reopened += 1
+                        incons.add(nbr)
+                    else:
+                        open_nodes.add(nbr)
+                        open_pq.push((tentative_g + weight*hval(nbr), tentative_g, nbr))
+                        if emit:
+                            emit(ENQUEUE, nbr)
+
+        max_closed = max(max_closed, len(closed))
+        if goal_g == inf:
+            break
+        # Every path to goal passes an open or INCONS node, so the smallest
+        # unweighted f among them is a lower bound on the optimal cost.
+        lower = min((gscore[node] + hval(node) for node in open_nodes | incons), default=inf)
+        path = decode_path(reconstruct_from_parent(parent, goal), names)
+        cost = path_cost(graph, path)  # <= goal_g, see above
+        if cost <= lower:
+            bound = 1.0
+        else:
+            bound = min(weight, cost / lower) if lower > 0 else weight
+        if cost < best_cost or bound < best_bound:
+            best_cost, best_bound = cost, bound
+            yield path, cost, nodes_expanded, elapsed_ms(t0), bound
+        if bound <= 1.0 or weight <= 1.0:
+            break
+        weight = max(1.0, weight - weight_step)
+        open_nodes |= incons
+        incons = set()
+    record(stats, "ara_star", t0, nodes_expanded, generated, reopened=reopened,
+           max_closed=max_closed, open_lists=open_lists, sequential=True)
 
 # -------------------------
 # IDA* (Iterative Deepening A*)
 # -------------------------
-def ida_star(graph, h, start, goal):
-    t0 = time.time()
-    bound = h[start]
-    nodes_expanded = 0
+def ida_star(graph, h, start, goal, tracer=None, transposition_size=0, stats=None):
+    """
+    IDA* with an O(1) cycle check (a set mirrors the current path).
+
+    transposition_size > 0 enables a transposition table of at most that
+    many nodes, each holding the best g it was searched from and the
+    backed-up f of that failed subtree. A node reached again with no better
+    g in the same iteration is pruned and returns its backed-up f shifted
+    by the extra g. The table is cleared per bound: with a path-based cycle
+    check, backed-up values are not safe lower bounds for later
+    iterations (they can feed on each other around cycles and push the
+    bound past the optimum). When ``stats`` is given,
+    ``stats['iterations']`` also gets one entry per bound with the
+    generated, expanded, re-expanded (same node expanded again within the
+    iteration) and pruned counts; max_open is the deepest path and
+    max_closed the largest table.
+    """
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "ida_star", start, goal)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    bound = hval(start)
+    nodes_expanded = generated = pushes = max_table = 0
+    deepest = 1
+    on_path = {start}
+    table = {}  # node -> (best g, backed-up f) in the current iteration
+    counts = None
+    expanded_nodes = None
 
     def search(path, g, bound):
-        nonlocal nodes_expanded
+        nonlocal nodes_expanded, generated, pushes, deepest
         node = path[-1]
-        f = g + h.get(node, 0)
+        entry = table.get(node)
+        if entry is not None and entry[0] <= g:
+            if counts is not None:
+                counts['pruned'] += 1
+            return g + entry[1] - entry[0], None
+        f = g + hval(node)
         if f > bound:
             return f, None
+        nodes_expanded += 1
         if node == goal:
             return True, path.copy()
+        if counts is not None:
+            if node in expanded_nodes:
+                counts['reexpanded'] += 1
+            expanded_nodes.add(node)
         min_threshold = float('inf')
-        for nbr, w in graph.get(node, {}).items():
-            if nbr in path:
+        for nbr, w in edges(node):
+            generated += 1
+            if nbr in on_path:
                 continue
-            nodes_expanded += 1
+            pushes += 1
             path.append(nbr)
+            on_path.add(nbr)
+            if len(path) > deepest:
+                deepest = len(path)
+            if emit:
+                emit(ENQUEUE, nbr)
             t, result = search(path, g + w, bound)
             if result:
                 return True, result
             if t < min_threshold:
                 min_threshold = t
             path.pop()
+            on_path.discard(nbr)
+            if emit:
+                emit(BACKTRACK, nbr)
+        if transposition_size and (entry is not None or len(table) < transposition_size):
+            table[node] = (g, min_threshold)
         return min_threshold, None
 
+    iterations = []
     while True:
+        table.clear()
+        if stats is not None:
+            counts = {'bound': bound, 'generated': generated, 'expanded': nodes_expanded,
+                      'reexpanded': 0, 'pruned': 0}
+            expanded_nodes = set()
         t, result = search([start], 0, bound)
-        if result:
-            return result, path_cost(graph, result), nodes_expanded, (time.time()-t0)*1000
-        if t == float('inf'):
-            return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+        max_table = max(max_table, len(table))
+        if counts is not None:
+            counts['generated'] = generated - counts['generated']
+            counts['expanded'] = nodes_expanded - counts['expanded']
+            iterations.append(counts)
+        if result or t == float('inf'):
+            break
         bound = t
 
+    record(stats, "ida_star", t0, nodes_expanded, generated, pushes=pushes,
+           reopened=sum(it['reexpanded'] for it in iterations),
+           max_open=deepest, max_closed=max_table, iterations=iterations, table_size=len(table))
+    if not result:
+        return None, float('inf'), nodes_expanded, elapsed_ms(t0)
+    result = decode_path(result, names)
+    return result, path_cost(graph, result), nodes_expanded, elapsed_ms(t0)
+
 # -------------------------
-# Simplified SMA* (memory-bounded A*)
-#   - This is a simple approximate SMA*:
-#     keep frontier up to memory_limit best f-values, drop worst.
+# SMA* (Simplified Memory-bounded A*, Russell 1992)
 # -------------------------
-def sma_star(graph, h, start, goal, memory_limit=8):
-    t0 = time.time()
-    frontier = [(h[start], 0, start, [start])]  # (f, g, node, path)
-    nodes_expanded = 0
-
-    while frontier:
-        # pop best (smallest f)
-        frontier.sort(key=lambda x: x[0])
-        f, g, node, path = frontier.pop(0)
-        nodes_expanded += 1
-        if node == goal:
-            return path, g, nodes_expanded, (time.time()-t0)*1000
-        # expand
-        for nbr, w in graph.get(node, {}).items():
-            if nbr in path:  # avoid cycles in path
+class _SMANode:
+    __slots__ = ('state', 'g', 'f', 'depth', 'parent', 'children', 'forgotten',
+                 'successors', 'generated', 'seq')
+
+    def __init__(self, state, g, f, depth, parent, seq):
+        self.state = state
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.children = {}    # state -> _SMANode in memory
+        self.forgotten = {}   # state -> backed-up f of a forgotten child
+        self.successors = None
+        self.generated = 0    # successors generated at least once
+        self.seq = seq
+
+    def key(self):
+        # Best = lowest f, deepest first; worst = highest f, shallowest first
+        return (self.f, -self.depth, self.seq, self)
+
+    def fully_generated(self):
+        return self.generated == len(self.successors)
+
+    def has_more(self):
+        return not self.fully_generated() or bool(self.forgotten)
+
+def sma_star(graph, h, start, goal, memory_limit=8, tracer=None, stats=None):
+    """
+    SMA* with at most ``memory_limit`` search-tree nodes in memory.
+
+    The open leaves sit in a min-max heap: the best one (lowest f, deepest)
+    generates its next successor, and when memory is full the worst one
+    (highest f, shallowest; never on the path being extended) is forgotten.
+    Its f is remembered by its parent, which goes back into the heap and
+    regenerates that child when it is the best again. Once a node has
+    generated every successor its f is backed up to the smallest f of its
+    children (in memory or forgotten), and so on up the tree.
+
+    A successor at depth memory_limit - 1 that is not the goal gets f = inf,
+    since no path through it fits. The search is optimal when the shallowest
+    optimal solution fits in memory; otherwise it returns the best path that
+    fits, which may not be optimal (no path when none fits). Each step
+    generates one successor, so expanded = generated; a forgotten child
+    generated again counts as reopened, and max_closed is the most tree
+    nodes in memory. ``stats`` also gets max_nodes, forgotten and
+    regenerated.
+    """
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "sma_star", start, goal)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    inf = float('inf')
+    if memory_limit < 2:
+        raise ValueError("memory_limit must be at least 2")
+    seq = 0
+    root = _SMANode(start, 0, hval(start), 0, None, seq)
+    open_leaves = MinMaxHeap()
+    open_leaves.push(root.key())
+    in_memory = max_nodes = 1
+    nodes_expanded = forgotten = regenerated = 0
+    path = None
+
+    def successors_of(node):
+        on_path = set()
+        ancestor = node
+        while ancestor is not None:
+            on_path.add(ancestor.state)
+            ancestor = ancestor.parent
+        cheapest = {}
+        for nbr, w in edges(node.state):
+            if nbr not in on_path and w < cheapest.get(nbr, inf):
+                cheapest[nbr] = w
+        return list(cheapest.items())
+
+    def backup(node):
+        while node is not None and node.fully_generated():
+            best = min(min((c.f for c in node.children.values()), default=inf),
+                       min(node.forgotten.values(), default=inf))
+            if best <= node.f:
+                break
+            node.f = best
+            if node in open_leaves:
+                open_leaves.push(node.key())
+            node = node.parent
+
+    def forget_worst(current):
+        """Drop the worst leaf that is not current or one of its ancestors."""
+        nonlocal in_memory, forgotten
+        on_path = set()
+        ancestor = current
+        while ancestor is not None:
+            on_path.add(ancestor)
+            ancestor = ancestor.parent
+        victim = open_leaves.peek_max()[-1]
+        # The worst open node may be a partly expanded parent; its children
+        # in memory have f at least as high, so descend to one of its leaves.
+        while victim.children:
+            off_path = [c for c in victim.children.values() if c not in on_path]
+            if not off_path:
+                victim = None
+                break
+            victim = max(off_path, key=_SMANode.key)
+        if victim is None or victim in on_path:
+            # All f values tie along the current path: take any other leaf
+            victim = max((entry[-1] for entry in open_leaves.entries()
+                          if not entry[-1].children and entry[-1] not in on_path),
+                         key=_SMANode.key)
+        open_leaves.remove(victim)
+        parent = victim.parent
+        del parent.children[victim.state]
+        parent.forgotten[victim.state] = victim.f
+        if parent not in open_leaves:
+            open_leaves.push(parent.key())
+        in_memory -= 1
+        forgotten += 1
+        if emit:
+            emit(SKIP, victim.state)
+
+    while open_leaves:
+        node = open_leaves.pop_min()[-1]
+        if emit:
+            emit(POP, node.state)
+        if node.f == inf:
+            break
+        if node.state == goal:
+            path = []
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            path = decode_path(path[::-1], names)
+            break
+
+        # Next successor: a new one, else the best forgotten one
+        if node.successors is None:
+            node.successors = successors_of(node)
+            if not node.successors:
+                # Dead end: keep it as the first leaf to forget
+                node.f = inf
+                open_leaves.push(node.key())
+                backup(node.parent)
                 continue
-            new_g = g + w
-            new_f = new_g + h.get(nbr,0)
-            frontier.append((new_f, new_g, nbr, path + [nbr]))
-        # enforce memory limit (drop worst f entries)
-        if len(frontier) > memory_limit:
-            frontier.sort(key=lambda x: x[0])  # smallest first
-            # drop from end until size ok
-            while len(frontier) > memory_limit:
-                frontier.pop()
-    return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+        if not node.fully_generated():
+            state, w = node.successors[node.generated]
+            node.generated += 1
+            remembered = 0
+        else:
+            state = min(node.forgotten, key=node.forgotten.get)
+            remembered = node.forgotten.pop(state)
+            w = next(cost for nbr, cost in node.successors if nbr == state)
+            regenerated += 1
+        nodes_expanded += 1
+
+        g = node.g + w
+        if state != goal and node.depth + 1 >= memory_limit - 1:
+            f = inf
+        else:
+            f = max(node.f, g + hval(state), remembered)
+        if in_memory >= memory_limit:
+            forget_worst(node)
+        seq += 1
+        child = _SMANode(state, g, f, node.depth + 1, node, seq)
+        node.children[state] = child
+        in_memory += 1
+        max_nodes = max(max_nodes, in_memory)
+        open_leaves.push(child.key())
+        if emit:
+            emit(ENQUEUE, state)
+        if node.has_more():
+            open_leaves.push(node.key())
+            if emit:
+                emit(ENQUEUE, node.state)
+        backup(node)
+
+    record(stats, "sma_star", t0, nodes_expanded, nodes_expanded, pushes=open_leaves.pushes,
+           reopened=regenerated, max_open=open_leaves.max_size, max_closed=max_nodes,
+           max_nodes=max_nodes, forgotten=forgotten, regenerated=regenerated)
+    if path is None:
+        return None, float('inf'), nodes_expanded, elapsed_ms(t0)
+    return path, path_cost(graph, path), nodes_expanded, elapsed_ms(t0)
 
 # -------------------------
-# Bidirectional A* (simple meet-in-the-middle)
+# Bidirectional A* (NBA*, Pijls & Post 2009)
 # -------------------------
-def bidirectional_a_star(graph, h, start, goal):
-    t0 = time.time()
-    # forward and backward structures
-    open_f = [(h[start], 0, start)]
-    open_b = [(h[goal], 0, goal)]
-    g_f = {start: 0}
-    g_b = {goal: 0}
-    parent_f = {start: None}
-    parent_b = {goal: None}
-    closed_f = {}
-    closed_b = {}
-    nodes_expanded = 0
-    best_cost = float('inf')
-    meeting = None
-
-    while open_f or open_b:
-        # choose side to expand (smaller top f)
-        top_f = open_f[0][0] if open_f else float('inf')
-        top_b = open_b[0][0] if open_b else float('inf')
-        side = 'f' if top_f <= top_b else 'b'
-
-        if side == 'f' and open_f:
-            f, g, node = heapq.heappop(open_f)
-            if node in closed_f:
-                continue
-            closed_f[node] = g_f[node]
+def bind_reverse(graph, reverse_graph, h_back, start, goal):
+    """Return (backward edges, backward hval) matching bind_graph's ids."""
+    if isinstance(graph, CSRGraph):
+        reverse_graph = reverse_graph if isinstance(reverse_graph, CSRGraph) else graph.reverse()
+        return reverse_graph.edges, graph.node_values(h_back, 0).__getitem__
+    if reverse_graph is None:
+        reverse_graph = {}
+        for u, nbrs in graph.items():
+            for v, w in nbrs.items():
+                reverse_graph.setdefault(v, {})[u] = w
+    return (lambda node: reverse_graph.get(node, {}).items()), (lambda node: h_back.get(node, 0))
+
+def bidirectional_on_ids(graph, h, start, goal, emit, open_list, stats, t0, reverse_graph, h_back):
+    """
+    bidirectional_a_star on a CSRGraph, with each side's g and parent in a
+    pooled search_state.SearchState. A node is done (taken off either open
+    list) when its closed flag is set in the state of the side that took
+    it; the loop is otherwise the dict version's.
+    """
+    start, goal = graph.id_of(start), graph.id_of(goal)
+    reverse_graph = reverse_graph if isinstance(reverse_graph, CSRGraph) else graph.reverse()
+    hval = graph.node_values(h, 0)
+    hback = graph.node_values({} if h_back is None else h_back, 0)
+    inf = float('inf')
+    fwd = acquire_state(graph.num_nodes, graph.weight_typecode)
+    bwd = acquire_state(graph.num_nodes, graph.weight_typecode)
+    fwd_gen, bwd_gen = fwd.begin(), bwd.begin()
+    for state, gen, root in ((fwd, fwd_gen, start), (bwd, bwd_gen, goal)):
+        state.stamp[root], state.g[root], state.parent[root], state.closed[root] = gen, 0, -1, 0
+    open_f = make_open_list(open_list)
+    open_f.push((hval[start], 0, start))
+    open_b = make_open_list(open_list)
+    open_b.push((hback[goal], 0, goal))
+    sides = (
+        (open_f, fwd.g, fwd.parent, fwd.closed, fwd.stamp, fwd_gen, graph.edges, hval, hback),
+        (open_b, bwd.g, bwd.parent, bwd.closed, bwd.stamp, bwd_gen, reverse_graph.edges, hback, hval),
+    )
+    tops = [hval[start], hback[goal]]
+    nodes_expanded = generated = rejected = 0
+    best_cost, meeting = (0, start) if start == goal else (inf, None)
+
+    def clean_top(open_pq, g):
+        """Drop entries of finished nodes and stale g; return the smallest f."""
+        while open_pq:
+            f, g_entry, node = open_pq.peek()
+            if (not (fwd.closed[node] and fwd.stamp[node] == fwd_gen)
+                    and not (bwd.closed[node] and bwd.stamp[node] == bwd_gen)
+                    and g_entry == g[node]):
+                return f
+            open_pq.pop()
+            open_pq.stale_pops += 1
+        return inf
+
+    while open_f and open_b and max(tops) < best_cost:
+        side = 0 if len(open_f) <= len(open_b) else 1
+        open_pq, g, parent, closed, stamp, gen, side_edges, h_mine, h_other = sides[side]
+        _, g_other, _, closed_other, stamp_other, gen_other, _, _, _ = sides[1 - side]
+        f, g_node, node = open_pq.pop()
+        closed[node] = 1
+        if emit:
+            emit(POP, node)
+        if f >= best_cost or g_node + tops[1 - side] - h_other[node] >= best_cost:
+            # Rejected: no path through node can beat best_cost
+            rejected += 1
+            if emit:
+                emit(SKIP, node)
+        else:
             nodes_expanded += 1
-            if node in closed_b:
-                total = g_f[node] + closed_b[node]
-                if total < best_cost:
-                    best_cost = total
-                    meeting = node
-            for nbr, w in graph.get(node, {}).items():
-                tentative = g_f[node] + w
-                if tentative < g_f.get(nbr, float('inf')) and tentative < best_cost:
-                    g_f[nbr] = tentative
-                    parent_f[nbr] = node
-                    heapq.heappush(open_f, (tentative + h.get(nbr,0), tentative, nbr))
-        elif side == 'b' and open_b:
-            f, g, node = heapq.heappop(open_b)
-            if node in closed_b:
-                continue
-            closed_b[node] = g_b[node]
+            for nbr, w in side_edges(node):
+                generated += 1
+                seen = stamp[nbr] == gen
+                seen_other = stamp_other[nbr] == gen_other
+                if (seen and closed[nbr]) or (seen_other and closed_other[nbr]):
+                    continue
+                tentative = g_node + w
+                if not seen:
+                    stamp[nbr] = gen
+                    closed[nbr] = 0
+                elif tentative >= g[nbr]:
+                    continue
+                g[nbr] = tentative
+                parent[nbr] = node
+                open_pq.push((tentative + h_mine[nbr], tentative, nbr))
+                if emit:
+                    emit(ENQUEUE, nbr)
+                if seen_other:
+                    total = tentative + g_other[nbr]
+                    if total < best_cost:
+                        best_cost, meeting = total, nbr
+        tops[0] = clean_top(open_f, fwd.g)
+        tops[1] = clean_top(open_b, bwd.g)
+
+    path = None
+    if meeting is not None:
+        path = fwd.path(meeting)
+        node = bwd.parent[meeting]
+        while node != -1:
+            path.append(node)
+            node = bwd.parent[node]
+        path = decode_path(path, graph.names)
+    release_state(fwd)
+    release_state(bwd)
+    # Every pop is done: expanded or rejected
+    record(stats, "bidirectional_a_star", t0, nodes_expanded, generated, stale_pops=rejected,
+           max_closed=nodes_expanded + rejected, open_lists=(open_f, open_b), rejected=rejected)
+    if path is None:
+        return None, inf, nodes_expanded, elapsed_ms(t0)
+    return path, path_cost(graph, path), nodes_expanded, elapsed_ms(t0)
+
+def bidirectional_a_star(graph, h, start, goal, tracer=None, open_list='lazy', stats=None,
+                         reverse_graph=None, h_back=None):
+    """
+    Optimal bidirectional A* (NBA*).
+
+    The forward search runs on ``graph`` with h (lower bounds to goal), the
+    backward search on ``reverse_graph`` (derived when not given) with
+    h_back (lower bounds from start; 0 when not given). Both must be
+    consistent. The side with fewer open nodes moves next. Every node is
+    taken off an open list at most once over both sides. A node is rejected
+    unexpanded when g + h >= L or g + F_other - h_other >= L (L = best
+    meeting cost found, F_other = smallest f on the other side), since no
+    path through it can beat L. The search stops once either side's
+    smallest f reaches L.
+    """
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "bidirectional_a_star", start, goal)
+    if isinstance(graph, CSRGraph):
+        return bidirectional_on_ids(graph, h, start, goal, emit, open_list, stats, t0,
+                                    reverse_graph, h_back)
+    edges, hval, start, goal, names = bind_graph(graph, h, start, goal)
+    back_edges, hback = bind_reverse(graph, reverse_graph, {} if h_back is None else h_back, start, goal)
+    inf = float('inf')
+    open_f = make_open_list(open_list)
+    open_f.push((hval(start), 0, start))
+    open_b = make_open_list(open_list)
+    open_b.push((hback(goal), 0, goal))
+    sides = (
+        (open_f, {start: 0}, {start: None}, edges, hval, hback),
+        (open_b, {goal: 0}, {goal: None}, back_edges, hback, hval),
+    )
+    tops = [hval(start), hback(goal)]
+    done = set()  # nodes taken off either open list
+    nodes_expanded = generated = rejected = 0
+    best_cost, meeting = (0, start) if start == goal else (inf, None)
+
+    def clean_top(open_pq, g):
+        """Drop entries of finished nodes and stale g; return the smallest f."""
+        while open_pq:
+            f, g_entry, node = open_pq.peek()
+            if node not in done and g_entry == g[node]:
+                return f
+            open_pq.pop()
+            open_pq.stale_pops += 1
+        return inf
+
+    while open_f and open_b and max(tops) < best_cost:
+        side = 0 if len(open_f) <= len(open_b) else 1
+        open_pq, g, parent, side_edges, h_mine, h_other = sides[side]
+        _, g_other, _, _, _, _ = sides[1 - side]
+        f, g_node, node = open_pq.pop()
+        done.add(node)
+        if emit:
+            emit(POP, node)
+        if f >= best_cost or g_node + tops[1 - side] - h_other(node) >= best_cost:
+            # Rejected: no path through node can beat best_cost
+            rejected += 1
+            if emit:
+                emit(SKIP, node)
+        else:
             nodes_expanded += 1
-            if node in closed_f:
-                total = g_b[node] + closed_f[node]
-                if total < best_cost:
-                    best_cost = total
-                    meeting = node
-            for nbr, w in graph.get(node, {}).items():
-                tentative = g_b[node] + w
-                if tentative < g_b.get(nbr, float('inf')) and tentative < best_cost:
-                    g_b[nbr] = tentative
-                    parent_b[nbr] = node
-                    heapq.heappush(open_b, (tentative + h.get(nbr,0), tentative, nbr))
-
-        # termination condition: smallest f on both sides >= best_cost
-        min_f_f = open_f[0][0] if open_f else float('inf')
-        min_f_b = open_b[0][0] if open_b else float('inf')
-        if min(min_f_f, min_f_b) >= best_cost and meeting is not None:
-            # reconstruct path
-            # forward path to meeting
-            path_f = []
-            n = meeting
-            while n is not None:
-                path_f.append(n)
-                n = parent_f.get(n)
-            path_f.reverse()
-            # backward path to meeting
-            path_b = []
-            n = meeting
-            while n is not None:
-                path_b.append(n)
-                n = parent_b.get(n)
-            # path_b is meeting -> goal, we need to append tail excluding meeting
-            full = path_f + path_b[1:]
-            return full, path_cost(GRAPH, full), nodes_expanded, (time.time()-t0)*1000
-
-    return None, float('inf'), nodes_expanded, (time.time()-t0)*1000
+            for nbr, w in side_edges(node):
+                generated += 1
+                if nbr in done:
+                    continue
+                tentative = g_node + w
+                if tentative < g.get(nbr, inf):
+                    g[nbr] = tentative
+                    parent[nbr] = node
+                    open_pq.push((tentative + h_mine(nbr), tentative, nbr))
+                    if emit:
+                        emit(ENQUEUE, nbr)
+                    total = tentative + g_other.get(nbr, inf)
+                    if total < best_cost:
+                        best_cost, meeting = total, nbr
+        tops[0] = clean_top(open_f, sides[0][1])
+        tops[1] = clean_top(open_b, sides[1][1])
+
+    # Rejected nodes leave the open lists unexpanded, like stale entries
+    record(stats, "bidirectional_a_star", t0, nodes_expanded, generated, stale_pops=rejected,
+           max_closed=len(done), open_lists=(open_f, open_b), rejected=rejected)
+    if meeting is None:
+        return None, inf, nodes_expanded, elapsed_ms(t0)
+    path = reconstruct_from_parent(sides[0][2], meeting)
+    node = sides[1][2][meeting]
+    while node is not None:
+        path.append(node)
+        node = sides[1][2][node]
+    path = decode_path(path, names)
+    return path, path_cost(graph, path), nodes_expanded, elapsed_ms(t0)
 
 # -------------------------
 # Comparison runner
 # -------------------------
-def compare_all(start=START, goal=GOAL):
+def compare_all(start=START, goal=GOAL, memory=True, export=None):
+    """
+    Run every algorithm once on the Romania map and print its result, then
+    a table of its SearchStats. memory=True adds the tracemalloc peak (each
+    search runs a second time for it); ``export`` writes the stats rows to
+    a .csv or .json file. Returns the rows.
+    """
+    from heuristic_provider import CoordinateHeuristics
+
+    # Textbook table for Bucharest, distances from COORDS for any other goal
+    provider = CoordinateHeuristics(GRAPH, COORDS)
+    h = H if goal == GOAL else provider.heuristic(goal)
+    h_back = provider.heuristic(start)
+    # Each experiment takes the stats object to fill (None for the memory run)
     experiments = [
-        ("Greedy Best-First", lambda: greedy_best_first(GRAPH, H, start, goal)),
-        ("A*", lambda: a_star(GRAPH, H, start, goal)),
-        ("Weighted A* (w=1.5)", lambda: weighted_a_star(GRAPH, H, start, goal, 1.5)),
-        ("IDA*", lambda: ida_star(GRAPH, H, start, goal)),
-        ("SMA* (mem=8)", lambda: sma_star(GRAPH, H, start, goal, memory_limit=8)),
-        ("Bidirectional A*", lambda: bidirectional_a_star(GRAPH, H, start, goal)),
+        ("Greedy Best-First", lambda stats: greedy_best_first(GRAPH, h, start, goal, stats=stats)),
+        ("A*", lambda stats: a_star(GRAPH, h, start, goal, stats=stats)),
+        ("Weighted A* (w=1.5)", lambda stats: weighted_a_star(GRAPH, h, start, goal, 1.5, stats=stats)),
+        ("ARA* (w=3 -> 1)", lambda stats: deque(ara_star(GRAPH, h, start, goal, stats=stats),
+                                               maxlen=1)[0][:4]),
+        ("IDA*", lambda stats: ida_star(GRAPH, h, start, goal, stats=stats)),
+        ("SMA* (mem=8)", lambda stats: sma_star(GRAPH, h, start, goal, memory_limit=8, stats=stats)),
+        ("Bidirectional A*", lambda stats: bidirectional_a_star(GRAPH, h, start, goal, h_back=h_back,
+                                                                stats=stats)),
     ]
 
-    print("\n=== Comparing Informed Search Algorithms (Arad -> Bucharest) ===\n")
+    print(f"\n=== Comparing Informed Search Algorithms ({start} -> {goal}) ===\n")
+    rows = []
     for name, func in experiments:
-        t_start = time.time()
-        result = func()
-        # results have varying tuple formats, normalize:
-        # most return (path, cost, nodes_expanded, ms)
-        # greedy returns (path, cost, nodes_expanded, ms) as well
-        if result is None:
-            print(f"{name}: No result returned")
-            continue
-        path, cost, nodes, ms = result
-        # If ms looks like seconds (float small), we already compute ms above
+        stats = SearchStats(label=name, start=start, goal=goal)
+        path, cost, nodes, ms = measure(func, stats, memory)
+        rows.append(stats)
         print(f"{name}:")
         print(f"  Path: {path}")
         print(f"  Cost: {cost}")
         print(f"  Nodes expanded: {nodes}")
         print(f"  Time elapsed: {ms:.3f} ms\n")
+    print_table(rows, "Search statistics:")
+    print()
+    if export:
+        write_stats(rows, export)
+    return rows
+
+def compare_ida_transpositions(n=100, seed=0, table_size=1 << 16):
+    """
+    IDA* with and without the transposition table on a small grid with a
+    weak (halved Manhattan) heuristic, where paths reach the same cells in
+    many orders.
+    """
+    from graph_generators import grid_graph, heuristic_table, pick_query
+
+    graph, coords = grid_graph(n, seed=seed)
+    start, goal = pick_query(graph, seed=3)
+    h = {node: value // 2 for node, value in heuristic_table(graph, coords, goal, "manhattan").items()}
+    print(f"=== IDA* transpositions on a {graph} grid ({start} -> {goal}) ===\n")
+    for size in (0, table_size):
+        stats = SearchStats()
+        _, cost, expanded, ms = ida_star(graph, h, start, goal, transposition_size=size, stats=stats)
+        label = f"table of {size}" if size else "no table"
+        print(f"{label}: cost {cost}, expanded {expanded}, generated {stats['generated']}, {ms:.2f} ms")
+        for i, it in enumerate(stats['iterations']):
+            print(f"  iteration {i} bound {it['bound']:3d}: expanded {it['expanded']:5d}, "
+                  f"re-expanded {it['reexpanded']:5d}, pruned {it['pruned']:4d}")
+        print()
+
+def compare_anytime(n=20000, seed=0, deadline=None):
+    """
+    Solutions ARA* yields on a road-like graph, next to a single A* run.
+    With ``deadline`` (seconds) only the paths found in time are listed.
+    """
+    from graph_generators import heuristic_table, pick_query, road_like_graph
+
+    graph, coords = road_like_graph(n, seed=seed)
+    start, goal = pick_query(graph, seed=seed)
+    h = heuristic_table(graph, coords, goal)
+    _, cost, expanded, ms = a_star(graph, h, start, goal)
+    print(f"=== ARA* on {graph} ({start} -> {goal}) ===\n")
+    print(f"A*: cost {cost}, expanded {expanded}, {ms:.2f} ms")
+    for path, cost, expanded, ms, bound in ara_star(graph, h, start, goal, deadline=deadline):
+        assert cost == path_cost(graph, path)
+        print(f"ARA*: cost {cost}, bound {bound:.3f}, expanded {expanded} in total, {ms:.2f} ms")
+    print()
 
 if __name__ == "__main__":
     compare_all()
+    compare_ida_transpositions()
+    compare_anytime()
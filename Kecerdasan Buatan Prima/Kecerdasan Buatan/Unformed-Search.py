@@ -1,5 +1,10 @@
 from collections import deque
-import heapq
+import time
+
+from csr_graph import CSRGraph
+from integer_queues import make_queue, queue_weight_range
+from search_stats import SearchStats, measure, print_table, record, write_stats
+from search_trace import POP, SKIP, ENQUEUE, BACKTRACK
 
 # -----------------------------------------
 # ROMANIA MAP GRAPH (Edges with cost)
@@ -27,92 +32,241 @@ romania_map = {
     'Neamt': {'Iasi': 87}
 }
 
+# -------------------------------------------------------------------
+# Graph binding (dict-of-dicts or CSRGraph)
+# -------------------------------------------------------------------
+def bind_graph(graph, start, goal):
+    """
+    Return (edges, start, goal, names).
+
+    With a CSRGraph the searches run on integer ids and ``names`` maps the
+    result back; with a dict they run on names and ``names`` is None.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.edges, graph.id_of(start), graph.id_of(goal), graph.names
+    return (lambda node: graph[node].items()), start, goal, None
+
+
+def bind_tracer(tracer, algorithm, start, goal):
+    """Return the tracer's emit function (or None when tracing is off)."""
+    if tracer is None:
+        return None
+    tracer.begin(algorithm, start=start, goal=goal)
+    return tracer.emit
+
+
+def decode_path(path, names):
+    if path is None or names is None:
+        return path
+    return [names[node] for node in path]
+
+
+def walk_parents(parent, node):
+    """Follow parent pointers from node back to the root; returns root..node."""
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
 # -------------------------------------------------------------------
 # 1. BFS (Breadth-First Search)
 # -------------------------------------------------------------------
-def bfs(start, goal):
-    queue = deque([(start, [start])])
+def bfs(start, goal, graph=romania_map, tracer=None, stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "bfs", start, goal)
+    edges, start, goal, names = bind_graph(graph, start, goal)
+    queue = deque([start])
+    parent = {start: None}
     visited = set()
-    expanded = 0
+    expanded = generated = stale = 0
+    max_open = 1
+    path = None
 
     while queue:
-        node, path = queue.popleft()
+        node = queue.popleft()
+        if node in visited:
+            # Enqueued again before its first copy was expanded
+            stale += 1
+            if emit:
+                emit(SKIP, node)
+            continue
         expanded += 1
+        if emit:
+            emit(POP, node)
 
         if node == goal:
-            return path, expanded
+            path = decode_path(walk_parents(parent, node), names)
+            break
 
         visited.add(node)
-        for neighbor in romania_map[node]:
+        for neighbor, _ in edges(node):
+            generated += 1
             if neighbor not in visited:
-                queue.append((neighbor, path + [neighbor]))
+                # FIFO: the first enqueue of a node is also its first dequeue
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                queue.append(neighbor)
+                if emit:
+                    emit(ENQUEUE, neighbor)
+        if len(queue) > max_open:
+            max_open = len(queue)
 
-    return None, expanded
+    record(stats, "bfs", t0, expanded, generated, pushes=expanded + stale + len(queue),
+           stale_pops=stale, max_open=max_open, max_closed=len(visited))
+    return path, expanded
 
 
 # -------------------------------------------------------------------
 # 2. DFS (Depth-First Search)
 # -------------------------------------------------------------------
-def dfs(start, goal):
-    stack = [(start, [start])]
+def dfs(start, goal, graph=romania_map, tracer=None, stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "dfs", start, goal)
+    edges, start, goal, names = bind_graph(graph, start, goal)
+    stack = [(start, None)]  # (node, node that pushed it)
+    parent = {}
     visited = set()
-    expanded = 0
+    expanded = generated = stale = 0
+    max_open = 1
+    path = None
 
     while stack:
-        node, path = stack.pop()
+        node, via = stack.pop()
+        if node in visited:
+            # Pushed again by another node before this copy surfaced
+            stale += 1
+            if emit:
+                emit(SKIP, node)
+            continue
         expanded += 1
+        if emit:
+            emit(POP, node)
+
+        # LIFO: a node's parent is whoever pushed the entry popped first
+        parent[node] = via
 
         if node == goal:
-            return path, expanded
+            path = decode_path(walk_parents(parent, node), names)
+            break
 
         visited.add(node)
-        for neighbor in romania_map[node]:
+        for neighbor, _ in edges(node):
+            generated += 1
             if neighbor not in visited:
-                stack.append((neighbor, path + [neighbor]))
+                stack.append((neighbor, node))
+                if emit:
+                    emit(ENQUEUE, neighbor)
+        if len(stack) > max_open:
+            max_open = len(stack)
 
-    return None, expanded
+    record(stats, "dfs", t0, expanded, generated, pushes=expanded + stale + len(stack),
+           stale_pops=stale, max_open=max_open, max_closed=len(visited))
+    return path, expanded
 
 
 # -------------------------------------------------------------------
 # 3. Uniform-Cost Search (Dijkstra)
 # -------------------------------------------------------------------
-def ucs(start, goal):
-    pq = [(0, start, [start])]
+def ucs(start, goal, graph=romania_map, tracer=None, queue='auto', stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "ucs", start, goal)
+    # queue='bucket' / 'radix' swap in an integer queue (same pop order as
+    # heapq); the weights are only scanned for those
+    pq = make_queue(queue, queue_weight_range(queue, graph))
+    edges, start, goal, names = bind_graph(graph, start, goal)
+    pq.push((0, start, start))  # (cost, node, node that pushed it)
+    parent = {start: None}
     visited = {}
-    expanded = 0
+    expanded = generated = stale = 0
+    max_open = 1
+    path = cost = None
 
     while pq:
-        cost, node, path = heapq.heappop(pq)
-        expanded += 1
+        cost, node, via = pq.pop()
+
+        # The first pop of a node is its cheapest entry, so its pusher
+        # is the parent on a shortest path.
+        if node not in parent:
+            parent[node] = via
 
         if node == goal:
-            return path, cost, expanded
+            expanded += 1
+            if emit:
+                emit(POP, node)
+            path = decode_path(walk_parents(parent, node), names)
+            break
 
         if node in visited and visited[node] <= cost:
+            stale += 1
+            if emit:
+                emit(SKIP, node)
             continue
+        expanded += 1
+        if emit:
+            emit(POP, node)
 
         visited[node] = cost
 
-        for neighbor, weight in romania_map[node].items():
-            heapq.heappush(pq, (cost + weight, neighbor, path + [neighbor]))
+        for neighbor, weight in edges(node):
+            generated += 1
+            pq.push((cost + weight, neighbor, node))
+            if emit:
+                emit(ENQUEUE, neighbor)
+        if len(pq) > max_open:
+            max_open = len(pq)
+    else:
+        cost = None
 
-    return None, None, expanded
+    record(stats, "ucs", t0, expanded, generated, pushes=expanded + stale + len(pq),
+           stale_pops=stale, max_open=max_open, max_closed=len(visited))
+    return path, cost, expanded
 
 
 # -------------------------------------------------------------------
 # 4. Depth-Limited Search (DLS)
 # -------------------------------------------------------------------
-def dls(node, goal, limit, path, expanded):
-    expanded[0] += 1
-
+def dls(node, goal, limit, path, expanded, graph=romania_map, tracer=None, stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "dls", node, goal)
+    edges, node, goal, names = bind_graph(graph, node, goal)
+    if names is not None:
+        path = [graph.id_of(n) for n in path]
+    else:
+        path = list(path)
+    counts = [0, 0, len(path)]  # expanded, generated, deepest path
+    result = decode_path(_dls(edges, node, goal, limit, path, counts, emit), names)
+    expanded[0] += counts[0]
+    # Tree search: every generated node is pushed on the path, nothing is closed
+    record(stats, "dls", t0, counts[0], counts[1], pushes=counts[1], max_open=counts[2])
+    return result
+
+
+def _dls(edges, node, goal, limit, path, counts, emit=None):
+    # `path` is one shared stack: push before recursing, pop after, and
+    # copy it only when the goal is found. Nodes at the depth limit are
+    # goal-tested but not expanded.
     if node == goal:
-        return path
+        counts[0] += 1
+        return list(path)
 
     if limit <= 0:
         return None
 
-    for neighbor in romania_map[node]:
-        result = dls(neighbor, goal, limit - 1, path + [neighbor], expanded)
+    counts[0] += 1
+    for neighbor, _ in edges(node):
+        counts[1] += 1
+        path.append(neighbor)
+        if len(path) > counts[2]:
+            counts[2] = len(path)
+        if emit:
+            emit(ENQUEUE, neighbor)
+        result = _dls(edges, neighbor, goal, limit - 1, path, counts, emit)
+        path.pop()
+        if emit:
+            emit(BACKTRACK, neighbor)
         if result is not None:
             return result
 
@@ -122,86 +276,207 @@ def dls(node, goal, limit, path, expanded):
 # -------------------------------------------------------------------
 # 5. Iterative Deepening Search (IDS)
 # -------------------------------------------------------------------
-def ids(start, goal, max_depth=20):
-    for depth in range(max_depth):
-        expanded = [0]
-        result = dls(start, goal, depth, [start], expanded)
-        if result is not None:
-            return result, expanded[0], depth
-    return None, None, None
+# Runs on an explicit stack, so depth is not capped by the recursion limit.
+# ``depth_of`` is the best-depth table: a node is only visited again when
+# reached at a strictly smaller depth. Every node on the current path has a
+# smaller recorded depth than its descendants, so the same table also
+# rejects cycles (Arad -> Zerind -> Arad) in O(1).
+#
+# With reuse_boundary=True the nodes cut off at limit d are kept, and
+# iteration d + 1 continues from them instead of re-walking depths 0..d.
+# That stores the whole table between iterations (like BFS); pass False
+# for classic iterative deepening, which forgets everything between
+# iterations and only ever holds one path plus the table of the current
+# iteration. Both return a shallowest path. ``expanded`` counts the nodes
+# whose successors were walked (plus the goal) over all iterations; a node
+# relabelled at a smaller depth counts as reopened.
+def ids(start, goal, max_depth=20, graph=romania_map, tracer=None, reuse_boundary=True,
+        stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "ids", start, goal)
+    edges, start, goal, names = bind_graph(graph, start, goal)
+    expanded = generated = pushes = reopened = max_open = max_closed = 0
+    if emit:
+        emit(POP, start)
+
+    def finish(path, depth):
+        record(stats, "ids", t0, expanded, generated, pushes=pushes, reopened=reopened,
+               max_open=max_open, max_closed=max(max_closed, len(depth_of)))
+        return decode_path(path, names), expanded, depth
+
+    depth_of = {start: 0}
+    if start == goal:
+        expanded = 1
+        return finish([start], 0)
+    parent = {start: None}
+    boundary = [start]
+    for limit in range(1, max_depth):
+        if not reuse_boundary:
+            max_closed = max(max_closed, len(depth_of))
+            depth_of = {start: 0}
+            parent = {start: None}
+            boundary = [start]
+        cut_off = []
+        for root in boundary:
+            stack = [(root, depth_of[root], iter(edges(root)))]
+            expanded += 1
+            pushes += 1
+            if emit:
+                emit(ENQUEUE, root)
+            while stack:
+                node, depth, successors = stack[-1]
+                for neighbor, _ in successors:
+                    generated += 1
+                    if depth_of.get(neighbor, limit + 1) <= depth + 1:
+                        continue
+                    if neighbor in depth_of:
+                        reopened += 1
+                    depth_of[neighbor] = depth + 1
+                    parent[neighbor] = node
+                    if emit:
+                        emit(POP, neighbor)
+                    if neighbor == goal:
+                        expanded += 1
+                        return finish(walk_parents(parent, neighbor), depth + 1)
+                    pushes += 1
+                    if depth + 1 < limit:
+                        stack.append((neighbor, depth + 1, iter(edges(neighbor))))
+                        expanded += 1
+                        if emit:
+                            emit(ENQUEUE, neighbor)
+                    else:
+                        cut_off.append(neighbor)
+                    if len(stack) + len(cut_off) > max_open:
+                        max_open = len(stack) + len(cut_off)
+                    break
+                else:
+                    stack.pop()
+                    if emit:
+                        emit(BACKTRACK, node)
+        if not cut_off:
+            break
+        if reuse_boundary:
+            boundary = cut_off
+    return finish(None, None)
 
 
 # -------------------------------------------------------------------
 # 6. Bidirectional Search (BFS-based)
 # -------------------------------------------------------------------
-def bidirectional_search(start, goal):
-    front = {start: [start]}
-    back = {goal: [goal]}
+def bidirectional_search(start, goal, graph=romania_map, tracer=None, stats=None):
+    t0 = time.perf_counter_ns()
+    emit = bind_tracer(tracer, "bidirectional_search", start, goal)
+    edges, start, goal, names = bind_graph(graph, start, goal)
+    front = {start: None}  # parent pointers towards start
+    back = {goal: None}    # parent pointers towards goal
 
     front_queue = deque([start])
     back_queue = deque([goal])
 
-    expanded = 0
+    expanded = generated = 0
+    max_open = 2
+
+    def join(meet):
+        # Every node in front / back was queued once; each queue holds the rest
+        record(stats, "bidirectional_search", t0, expanded, generated,
+               pushes=len(front) + len(back), max_open=max_open, max_closed=len(front) + len(back))
+        if meet is None:
+            return None
+        path = walk_parents(front, meet)
+        path.extend(reversed(walk_parents(back, meet)[:-1]))
+        return decode_path(path, names)
 
     while front_queue and back_queue:
         # Expand front
         f = front_queue.popleft()
         expanded += 1
+        if emit:
+            emit(POP, f)
 
-        for n in romania_map[f]:
+        for n, _ in edges(f):
+            generated += 1
             if n not in front:
-                front[n] = front[f] + [n]
+                front[n] = f
                 front_queue.append(n)
+                if emit:
+                    emit(ENQUEUE, n)
 
                 if n in back:
-                    return front[n] + back[n][::-1][1:], expanded
+                    return join(n), expanded
 
         # Expand back
         b = back_queue.popleft()
         expanded += 1
+        if emit:
+            emit(POP, b)
 
-        for n in romania_map[b]:
+        for n, _ in edges(b):
+            generated += 1
             if n not in back:
-                back[n] = back[b] + [n]
+                back[n] = b
                 back_queue.append(n)
+                if emit:
+                    emit(ENQUEUE, n)
 
                 if n in front:
-                    return front[n] + back[n][::-1][1:], expanded
+                    return join(n), expanded
+        if len(front_queue) + len(back_queue) > max_open:
+            max_open = len(front_queue) + len(back_queue)
 
-    return None, expanded
+    return join(None), expanded
 
 
 # -------------------------------------------------------------------
 # COMPARISON FUNCTION
 # -------------------------------------------------------------------
-def compare_uninformed(start="Arad", goal="Bucharest"):
+def compare_uninformed(start="Arad", goal="Bucharest", memory=True, export=None):
+    """
+    Run every algorithm once and print its result, then a table of its
+    SearchStats. memory=True adds the tracemalloc peak (each search runs a
+    second time for it); ``export`` writes the stats rows to a .csv or
+    .json file. Returns the rows.
+    """
     print("\n===== COMPARING UNINFORMED SEARCH ALGORITHMS =====\n")
+    rows = []
+
+    def run(label, search):
+        stats = SearchStats(label=label, start=start, goal=goal)
+        rows.append(stats)
+        return measure(search, stats, memory)
 
     # 1. BFS
-    bfs_path, bfs_exp = bfs(start, goal)
+    bfs_path, bfs_exp = run("BFS", lambda stats: bfs(start, goal, stats=stats))
     print(f"BFS Path: {bfs_path}  |  Nodes Expanded: {bfs_exp}")
 
     # 2. DFS
-    dfs_path, dfs_exp = dfs(start, goal)
+    dfs_path, dfs_exp = run("DFS", lambda stats: dfs(start, goal, stats=stats))
     print(f"DFS Path: {dfs_path}  |  Nodes Expanded: {dfs_exp}")
 
     # 3. UCS / Dijkstra
-    ucs_path, ucs_cost, ucs_exp = ucs(start, goal)
+    ucs_path, ucs_cost, ucs_exp = run("UCS", lambda stats: ucs(start, goal, stats=stats))
     print(f"UCS Path: {ucs_path}  |  Cost: {ucs_cost}  |  Nodes Expanded: {ucs_exp}")
 
     # 4. DLS (limit=4)
-    dls_exp = [0]
-    dls_path = dls(start, goal, 4, [start], dls_exp)
-    print(f"DLS Path (limit=4): {dls_path}  |  Nodes Expanded: {dls_exp[0]}")
+    dls_path = run("DLS (limit=4)", lambda stats: dls(start, goal, 4, [start], [0], stats=stats))
+    print(f"DLS Path (limit=4): {dls_path}  |  Nodes Expanded: {rows[-1]['expanded']}")
 
     # 5. IDS
-    ids_path, ids_exp, depth = ids(start, goal)
+    ids_path, ids_exp, depth = run("IDS", lambda stats: ids(start, goal, stats=stats))
     print(f"IDS Path: {ids_path}  |  Depth Found: {depth}  |  Nodes Expanded: {ids_exp}")
+    ids_path, ids_exp, depth = run("IDS (no boundary reuse)",
+                                   lambda stats: ids(start, goal, reuse_boundary=False, stats=stats))
+    print(f"IDS Path (no boundary reuse): {ids_path}  |  Depth Found: {depth}  |  Nodes Expanded: {ids_exp}")
 
     # 6. Bidirectional Search
-    bi_path, bi_exp = bidirectional_search(start, goal)
+    bi_path, bi_exp = run("Bidirectional", lambda stats: bidirectional_search(start, goal, stats=stats))
     print(f"Bidirectional Path: {bi_path}  |  Nodes Expanded: {bi_exp}")
 
+    print()
+    print_table(rows, "Search statistics:")
+    if export:
+        write_stats(rows, export)
+    return rows
+
 
 # -------------------------------------------------------------------
 # RUN COMPARISON
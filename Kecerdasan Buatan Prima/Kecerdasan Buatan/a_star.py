@@ -1,6 +1,7 @@
-import heapq
+from indexed_heap import make_open_list
+from search_trace import POP, SKIP, ENQUEUE, GOAL, EXHAUSTED
 
-def a_star_search(graph, weights, heuristics, start, goal):
+def a_star_search(graph, weights, heuristics, start, goal, tracer=None, open_list='lazy', stats=None):
     """
     A* Search implementation with simulation.
 
@@ -10,6 +11,12 @@ def a_star_search(graph, weights, heuristics, start, goal):
     heuristics (dict): Heuristic values for each node.
     start: Starting node.
     goal: Goal node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+    open_list (str): Priority queue backend: 'lazy' (heapq with duplicate
+        entries), 'indexed' (binary heap with decrease-key) or 'pairing'.
+    stats (dict): Optional dict filled with the open list counters
+        (pushes, decrease_keys, pops, stale_pops, max_size).
 
     Returns:
     list or None: Path from start to goal if found, else None.
@@ -17,21 +24,33 @@ def a_star_search(graph, weights, heuristics, start, goal):
     if start == goal:
         return [start]
 
-    priority_queue = [(heuristics[start], 0, start)]  # (f, g, node)
+    priority_queue = make_open_list(open_list)
+    priority_queue.push((heuristics[start], 0, start))  # (f, g, node)
     g_cost = {start: 0}
     parent = {start: None}
 
-    print(f"Starting A* Search from {start} to {goal}")
-    print(f"Heuristics: {heuristics}")
-    print(f"Initial priority queue: {priority_queue}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("a_star", start=start, goal=goal, heuristics=heuristics,
+                     open_list=open_list)
+        emit = tracer.emit
 
     while priority_queue:
-        f, g, current = heapq.heappop(priority_queue)
-        print(f"Popped: {current} (f: {f}, g: {g}, h: {heuristics[current]})")
+        f, g, current = priority_queue.pop()
+        if g > g_cost[current]:
+            # Superseded duplicate (only the lazy heap keeps these)
+            priority_queue.stale_pops += 1
+            if emit:
+                emit(SKIP, current, f)
+            continue
+        if emit:
+            emit(POP, current, f, g)
 
         if current == goal:
-            print(f"Goal {goal} reached!")
+            if emit:
+                emit(GOAL, current)
+            if stats is not None:
+                stats.update(priority_queue.stats())
             return reconstruct_path(parent, goal)
 
         for neighbor in graph.get(current, []):
@@ -40,14 +59,15 @@ def a_star_search(graph, weights, heuristics, start, goal):
             if neighbor not in g_cost or new_g < g_cost[neighbor]:
                 g_cost[neighbor] = new_g
                 f_new = new_g + heuristics[neighbor]
-                heapq.heappush(priority_queue, (f_new, new_g, neighbor))
+                priority_queue.push((f_new, new_g, neighbor))
                 parent[neighbor] = current
-                print(f"Updated neighbor: {neighbor} (g: {new_g}, h: {heuristics[neighbor]}, f: {f_new})")
-
-        print(f"Priority queue now: {priority_queue}")
-        print("---")
+                if emit:
+                    emit(ENQUEUE, neighbor, new_g, f_new)
 
-    print("No path found")
+    if emit:
+        emit(EXHAUSTED)
+    if stats is not None:
+        stats.update(priority_queue.stats())
     return None
 
 def reconstruct_path(parent, goal):
@@ -61,6 +81,10 @@ def reconstruct_path(parent, goal):
 
 # Example usage
 if __name__ == "__main__":
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B(1), C(4); B -> D(2); C -> E(3); D -> E(1)
     graph = {
         'A': ['B', 'C'],
@@ -79,14 +103,16 @@ if __name__ == "__main__":
         ('D', 'E'): 1
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
@@ -96,7 +122,9 @@ if __name__ == "__main__":
         print(f"{edge}: {weight}")
     print()
 
-    path = a_star_search(graph, weights, heuristics, 'A', 'E')
+    tracer = SearchTracer()
+    path = a_star_search(graph, weights, heuristics, 'A', 'E', tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
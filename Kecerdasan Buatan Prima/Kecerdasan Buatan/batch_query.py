@@ -0,0 +1,248 @@
+"""
+Run many (start, goal) queries across processes.
+
+    with SharedGraph(graph) as shared:
+        for (start, goal), result in run_batch(shared, queries, 'a_star', h=H):
+            ...
+
+SharedGraph packs the graph into CSR form once and copies its offsets,
+targets and weights (plus the pickled node names) into
+``multiprocessing.shared_memory`` blocks. Pool workers attach to those
+blocks by name in their initializer and wrap them in a CSRGraph whose
+arrays are memoryviews over the shared pages, so the graph is neither
+pickled per task nor copied per worker.
+
+Queries are read lazily from any iterable and sent in chunks of
+``chunksize`` pairs to amortize IPC. At most ``prefetch`` chunks per
+worker are in flight, so an input of tens of millions of queries never
+has to fit in memory. Results stream back either in input order
+(``ordered=True``) or as chunks complete.
+
+``algorithm`` names any search function of Informed-Search.py
+(greedy_best_first, a_star, weighted_a_star, ida_star, sma_star,
+bidirectional_a_star; called as ``f(graph, h, start, goal, **kwargs)``) or
+Unformed-Search.py (bfs, dfs, ucs, ids, bidirectional_search; called as
+``f(start, goal, graph=graph, **kwargs)``). Each result is the function's
+own return tuple.
+"""
+
+import itertools
+import os
+import pickle
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from csr_graph import CSRGraph
+from path_memory_benchmark import load_script
+
+INFORMED = ('greedy_best_first', 'a_star', 'weighted_a_star', 'ida_star', 'sma_star',
+            'bidirectional_a_star')
+UNINFORMED = ('bfs', 'dfs', 'ucs', 'ids', 'bidirectional_search')
+
+
+class SharedGraph:
+    """
+    A CSRGraph published in shared memory.
+
+    Use as a context manager (or call close()) so the blocks are unlinked
+    when the batch is done.
+
+    Args:
+    graph (dict or CSRGraph): Graph in any supported format.
+    """
+
+    def __init__(self, graph):
+        graph = CSRGraph.from_dict(graph)
+        self.blocks = []
+        self.descriptor = {
+            'names': self._publish(pickle.dumps(graph.names, pickle.HIGHEST_PROTOCOL), 'B'),
+            'offsets': self._publish(graph.offsets, 'q'),
+            'targets': self._publish(graph.targets, 'i'),
+            'weights': self._publish(graph.weights, graph.weight_typecode),
+        }
+
+    def _publish(self, data, typecode):
+        raw = memoryview(data).cast('B')
+        block = shared_memory.SharedMemory(create=True, size=max(raw.nbytes, 1))
+        block.buf[:raw.nbytes] = raw
+        self.blocks.append(block)
+        return block.name, typecode, raw.nbytes
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(descriptor):
+    """
+    Open the blocks of a SharedGraph descriptor in this process.
+
+    Returns:
+    CSRGraph: Graph whose arrays are memoryviews over the shared blocks.
+    list: The SharedMemory handles (keep them alive while using the graph).
+    """
+    blocks = []
+
+    def view(name, typecode, nbytes):
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        return block.buf[:nbytes].cast(typecode)
+
+    names = pickle.loads(view(*descriptor['names']))
+    graph = CSRGraph(names, view(*descriptor['offsets']), view(*descriptor['targets']),
+                     view(*descriptor['weights']))
+    return graph, blocks
+
+
+# -------------------------
+# Worker side
+# -------------------------
+_worker = {}
+
+
+def search_runner(algorithm, graph, h=None, **kwargs):
+    """
+    Bind a search function of either script to one graph and heuristic.
+
+    Args:
+    algorithm (str): Search function name (see module docstring).
+    graph (dict or CSRGraph): Graph to search.
+    h (dict or object): Heuristic for informed searches; an object with
+        ``heuristic(goal)`` gives a per-goal heuristic.
+    **kwargs: Extra keyword arguments for the search function.
+
+    Returns:
+    callable: ``run(start, goal)`` returning the search function's result.
+    """
+    if algorithm in INFORMED:
+        search = getattr(load_script('Informed-Search.py'), algorithm)
+        h = {} if h is None else h
+
+        def run(start, goal):
+            heuristic = h.heuristic(goal) if hasattr(h, 'heuristic') else h
+            return search(graph, heuristic, start, goal, **kwargs)
+    elif algorithm in UNINFORMED:
+        search = getattr(load_script('Unformed-Search.py'), algorithm)
+
+        def run(start, goal):
+            return search(start, goal, graph=graph, **kwargs)
+    else:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {INFORMED + UNINFORMED}")
+    return run
+
+
+def _init_worker(descriptor, algorithm, h, kwargs):
+    graph, blocks = attach(descriptor)
+    _worker.update(graph=graph, blocks=blocks, run=search_runner(algorithm, graph, h, **kwargs))
+
+
+def _run_chunk(chunk):
+    run = _worker['run']
+    return [(query, run(*query)) for query in chunk]
+
+
+# -------------------------
+# Driver
+# -------------------------
+def run_batch(graph, queries, algorithm='a_star', h=None, workers=None, chunksize=256,
+              ordered=True, prefetch=2, mp_context=None, **kwargs):
+    """
+    Answer ``(start, goal)`` queries on a process pool.
+
+    Args:
+    graph (SharedGraph, dict or CSRGraph): Graph; anything but a
+        SharedGraph is published (and unlinked afterwards) by this call.
+    queries (iterable): ``(start, goal)`` pairs, consumed lazily.
+    algorithm (str): Search function name (see module docstring).
+    h (dict or object): Heuristic for informed searches, pickled once per
+        worker. An object with ``heuristic(goal)`` (e.g. landmarks.Landmarks)
+        gives a per-goal heuristic.
+    workers (int): Pool size, default os.cpu_count().
+    chunksize (int): Queries per task.
+    ordered (bool): Yield in input order, else as chunks complete.
+    prefetch (int): Chunks in flight per worker.
+    mp_context: Optional multiprocessing context for the pool.
+    **kwargs: Extra keyword arguments for the search function.
+
+    Yields:
+    tuple: ``((start, goal), result)`` with the search function's result.
+    """
+    if algorithm not in INFORMED + UNINFORMED:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {INFORMED + UNINFORMED}")
+    owned = not isinstance(graph, SharedGraph)
+    shared = SharedGraph(graph) if owned else graph
+    workers = workers or os.cpu_count() or 1
+    queries = iter(queries)
+    chunks = iter(lambda: list(itertools.islice(queries, chunksize)), [])
+
+    try:
+        with ProcessPoolExecutor(workers, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=(shared.descriptor, algorithm, h, kwargs)) as pool:
+            limit = workers * prefetch
+            if ordered:
+                pending = deque()
+                for chunk in itertools.islice(chunks, limit):
+                    pending.append(pool.submit(_run_chunk, chunk))
+                while pending:
+                    results = pending.popleft().result()
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(pool.submit(_run_chunk, chunk))
+                    yield from results
+            else:
+                pending = {pool.submit(_run_chunk, chunk) for chunk in itertools.islice(chunks, limit)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk = next(chunks, None)
+                        if chunk is not None:
+                            pending.add(pool.submit(_run_chunk, chunk))
+                    for future in done:
+                        yield from future.result()
+    finally:
+        if owned:
+            shared.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    import time
+
+    from graph_generators import road_like_graph
+    from landmarks import Landmarks
+
+    graph, _ = road_like_graph(20000, seed=0)
+    rng = random.Random(0)
+    queries = [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes))
+               for _ in range(400)]
+    landmarks = Landmarks.build(graph, count=8)
+    informed = load_script('Informed-Search.py')
+
+    t0 = time.perf_counter()
+    serial = [informed.a_star(graph, landmarks.heuristic(g), s, g)[1] for s, g in queries]
+    serial_s = time.perf_counter() - t0
+    print(f"{graph}, {len(queries)} a_star queries with ALT landmarks")
+    print(f"  serial loop:   {serial_s:6.2f} s")
+
+    with SharedGraph(graph) as shared:
+        for ordered in (True, False):
+            t0 = time.perf_counter()
+            results = list(run_batch(shared, queries, 'a_star', h=landmarks,
+                                     chunksize=16, ordered=ordered))
+            elapsed = time.perf_counter() - t0
+            costs = dict((query, result[1]) for query, result in results)
+            assert [costs[q] for q in queries] == serial
+            if ordered:
+                assert [query for query, _ in results] == queries
+            label = "ordered" if ordered else "as completed"
+            print(f"  {os.cpu_count()} workers, {label:12s} {elapsed:6.2f} s")
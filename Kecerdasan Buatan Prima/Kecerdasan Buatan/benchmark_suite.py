@@ -0,0 +1,273 @@
+"""
+Scaling benchmark for every search algorithm in the repo.
+
+Runs the algorithms of Informed-Search.py, Unformed-Search.py and
+dijkstra.py on the seeded graph families of graph_generators.py and prints
+one record per (family, size, algorithm) as JSON lines or CSV:
+
+    family, nodes, edges, algorithm, start, goal, status, found, cost,
+    path_len, expanded, time_ms, peak_frontier, peak_mem_kib
+
+Each algorithm runs twice in a forked child process:
+  1. untraced, for ``time_ms`` (perf_counter around the call);
+  2. with a FrontierProbe tracer and tracemalloc, for ``peak_frontier``
+     (most open-list / stack entries alive at once) and ``peak_mem_kib``
+     (peak Python allocation of the search, graph excluded).
+The child is killed after ``--timeout`` seconds (status "timeout").
+Algorithms with exponential worst cases are only run up to the sizes in
+SIZE_CAPS (status "skipped" above that).
+
+Usage:
+    python benchmark_suite.py
+    python benchmark_suite.py --sizes 100 1000 10000 100000 1000000 --timeout 120
+    python benchmark_suite.py --families grid road --format csv --output bench.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import sys
+import time
+import tracemalloc
+
+from dijkstra import dijkstra
+from graph_generators import GENERATORS, heuristic_table, pick_query
+from path_memory_benchmark import load_script
+from search_trace import POP, SKIP, ENQUEUE, BACKTRACK
+
+FIELDS = [
+    "family", "nodes", "edges", "algorithm", "start", "goal", "status", "found",
+    "cost", "path_len", "expanded", "time_ms", "peak_frontier", "peak_mem_kib",
+]
+
+# Largest graph (in nodes) each exponential-time algorithm is run on
+SIZE_CAPS = {
+    "ida_star": 1000,
+    "sma_star": 10000,
+}
+
+HEURISTIC_METRIC = {"grid": "manhattan"}
+
+
+class FrontierProbe:
+    """
+    Tracer that only counts live open-list entries.
+
+    ENQUEUE adds an entry; POP, SKIP and BACKTRACK remove one. The initial
+    entries (the start node, or both ends for bidirectional searches) are
+    pushed without an event, so each run's count is shifted by its lowest
+    value before taking the peak. ``begin`` may be called several times per
+    search (IDS calls it per depth); the peak is kept across calls.
+    """
+
+    def __init__(self):
+        self.live = 0
+        self.low = 0
+        self.high = 0
+        self.peak = 0
+        self.events = 0
+
+    def begin(self, algorithm, **meta):
+        self._settle()
+        self.live = self.low = self.high = 0
+
+    def emit(self, kind, node=None, a=None, b=None, c=None):
+        self.events += 1
+        if kind == ENQUEUE:
+            self.live += 1
+            if self.live > self.high:
+                self.high = self.live
+        elif kind == POP or kind == SKIP or kind == BACKTRACK:
+            self.live -= 1
+            if self.live < self.low:
+                self.low = self.live
+
+    def _settle(self):
+        self.peak = max(self.peak, self.high - self.low)
+
+    def result(self):
+        self._settle()
+        return self.peak if self.events else None
+
+
+def algorithms():
+    """Return ``[(name, run(graph, h, start, goal, tracer) -> (path, cost, expanded))]``."""
+    informed = load_script('Informed-Search.py')
+    unformed = load_script('Unformed-Search.py')
+
+    def informed_run(func, **kwargs):
+        def run(graph, h, start, goal, tracer):
+            path, cost, expanded, _ = func(graph, h, start, goal, tracer=tracer, **kwargs)
+            return path, cost, expanded
+        return run
+
+    def bfs(graph, h, start, goal, tracer):
+        path, expanded = unformed.bfs(start, goal, graph=graph, tracer=tracer)
+        return path, None, expanded
+
+    def dfs(graph, h, start, goal, tracer):
+        path, expanded = unformed.dfs(start, goal, graph=graph, tracer=tracer)
+        return path, None, expanded
+
+    def ucs(graph, h, start, goal, tracer):
+        return unformed.ucs(start, goal, graph=graph, tracer=tracer)
+
+    def ids(graph, h, start, goal, tracer):
+        path, expanded, _ = unformed.ids(start, goal, max_depth=graph.num_nodes,
+                                         graph=graph, tracer=tracer)
+        return path, None, expanded
+
+    def bidirectional(graph, h, start, goal, tracer):
+        path, expanded = unformed.bidirectional_search(start, goal, graph=graph, tracer=tracer)
+        return path, None, expanded
+
+    def single_source(graph, h, start, goal, tracer):
+        distances, previous = dijkstra(graph, start, tracer=tracer)
+        cost = distances.get(goal, math.inf)
+        if cost == math.inf:
+            path = None
+        else:
+            path = [goal]
+            while path[-1] != start:
+                path.append(previous[path[-1]])
+            path.reverse()
+        settled = sum(1 for d in distances.values() if d != math.inf)
+        return path, cost, settled
+
+    return [
+        ("greedy_best_first", informed_run(informed.greedy_best_first)),
+        ("a_star", informed_run(informed.a_star)),
+        ("weighted_a_star", informed_run(informed.weighted_a_star, weight=1.5)),
+        ("ida_star", informed_run(informed.ida_star)),
+        ("sma_star", informed_run(informed.sma_star, memory_limit=4096)),
+        ("bidirectional_a_star", informed_run(informed.bidirectional_a_star)),
+        ("bfs", bfs),
+        ("dfs", dfs),
+        ("ucs", ucs),
+        ("ids", ids),
+        ("bidirectional", bidirectional),
+        ("dijkstra", single_source),
+    ]
+
+
+def measure(run, graph, h, start, goal):
+    """Timed run, then a probed run under tracemalloc. Returns a partial record."""
+    t0 = time.perf_counter()
+    path, cost, expanded = run(graph, h, start, goal, None)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    probe = FrontierProbe()
+    tracemalloc.start()
+    run(graph, h, start, goal, probe)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    found = path is not None
+    return {
+        "status": "ok",
+        "found": found,
+        "cost": cost if found else None,
+        "path_len": len(path) - 1 if found else None,
+        "expanded": expanded,
+        "time_ms": round(elapsed, 3),
+        "peak_frontier": probe.result(),
+        "peak_mem_kib": round(peak / 1024, 1),
+    }
+
+
+def _child(conn, run, graph, h, start, goal):
+    try:
+        conn.send(measure(run, graph, h, start, goal))
+    except Exception as exc:  # reported as a record, the suite keeps going
+        conn.send({"status": f"error: {type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def run_isolated(run, graph, h, start, goal, timeout):
+    """Run ``measure`` in a forked process so a slow search can be killed."""
+    ctx = multiprocessing.get_context('fork')
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_child, args=(sender, run, graph, h, start, goal))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            record = receiver.recv()
+        except EOFError:
+            record = {"status": "crashed"}
+    else:
+        record = {"status": "timeout"}
+        process.terminate()
+    process.join()
+    receiver.close()
+    return record
+
+
+def benchmark(families, sizes, timeout=30, seed=0, only=None):
+    """
+    Yield one record (dict with FIELDS keys) per family, size and algorithm.
+
+    Args:
+    families (list): Keys of graph_generators.GENERATORS.
+    sizes (list): Requested node counts.
+    timeout (float): Seconds allowed per algorithm run (both passes).
+    seed (int): Seed for the generators and the query.
+    only (set): Optional subset of algorithm names.
+    """
+    suite = [(name, run) for name, run in algorithms() if not only or name in only]
+    for family in families:
+        for size in sizes:
+            graph, coords = GENERATORS[family](size, seed=seed)
+            start, goal = pick_query(graph, seed=seed)
+            h = heuristic_table(graph, coords, goal, HEURISTIC_METRIC.get(family, "euclidean"))
+            base = {
+                "family": family, "nodes": graph.num_nodes, "edges": graph.num_edges,
+                "start": start, "goal": goal,
+            }
+            for name, run in suite:
+                record = dict.fromkeys(FIELDS)
+                record.update(base, algorithm=name)
+                if graph.num_nodes > SIZE_CAPS.get(name, math.inf):
+                    record["status"] = "skipped"
+                else:
+                    record.update(run_isolated(run, graph, h, start, goal, timeout))
+                yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--families", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000])
+    parser.add_argument("--algorithms", nargs="+", help="subset of algorithm names")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per algorithm run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", help="write records here instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = None
+        if args.format == "csv":
+            writer = csv.DictWriter(out, fieldnames=FIELDS)
+            writer.writeheader()
+        records = benchmark(args.families, args.sizes, args.timeout, args.seed,
+                            set(args.algorithms) if args.algorithms else None)
+        for record in records:
+            if writer:
+                writer.writerow(record)
+            else:
+                out.write(json.dumps(record) + "\n")
+            out.flush()
+            print(f"{record['family']:10s} n={record['nodes']:<8d} {record['algorithm']:21s}"
+                  f" {record['status']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
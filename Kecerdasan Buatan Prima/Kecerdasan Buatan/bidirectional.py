@@ -1,6 +1,8 @@
 from collections import deque
 
-def bidirectional_search(graph, start, goal):
+from search_trace import POP, ENQUEUE, INTERSECT, EXHAUSTED
+
+def bidirectional_search(graph, start, goal, tracer=None):
     """
     Bidirectional Search implementation with simulation.
 
@@ -8,6 +10,8 @@ def bidirectional_search(graph, start, goal):
     graph (dict): Adjacency list representation of the graph.
     start: Starting node.
     goal: Goal node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list or None: Path from start to goal if found, else None.
@@ -25,43 +29,46 @@ def bidirectional_search(graph, start, goal):
     backward_visited = set([goal])
     backward_parent = {goal: None}
 
-    print(f"Starting Bidirectional Search from {start} to {goal}")
-    print(f"Initial forward queue: {list(forward_queue)}")
-    print(f"Initial backward queue: {list(backward_queue)}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("bidirectional", start=start, goal=goal)
+        emit = tracer.emit
 
     while forward_queue and backward_queue:
         # Forward expansion
         current_forward = forward_queue.popleft()
-        print(f"Expanding forward from: {current_forward}")
+        if emit:
+            emit(POP, current_forward, None, None, 'f')
         for neighbor in graph.get(current_forward, []):
             if neighbor not in forward_visited:
                 forward_visited.add(neighbor)
                 forward_queue.append(neighbor)
                 forward_parent[neighbor] = current_forward
-                print(f"Forward: Added {neighbor} to queue, parent {current_forward}")
+                if emit:
+                    emit(ENQUEUE, neighbor, current_forward, None, 'f')
                 if neighbor in backward_visited:
-                    print(f"Intersection found at {neighbor}!")
+                    if emit:
+                        emit(INTERSECT, neighbor)
                     return reconstruct_path(forward_parent, backward_parent, neighbor, start, goal)
 
         # Backward expansion
         current_backward = backward_queue.popleft()
-        print(f"Expanding backward from: {current_backward}")
+        if emit:
+            emit(POP, current_backward, None, None, 'b')
         for neighbor in graph.get(current_backward, []):
             if neighbor not in backward_visited:
                 backward_visited.add(neighbor)
                 backward_queue.append(neighbor)
                 backward_parent[neighbor] = current_backward
-                print(f"Backward: Added {neighbor} to queue, parent {current_backward}")
+                if emit:
+                    emit(ENQUEUE, neighbor, current_backward, None, 'b')
                 if neighbor in forward_visited:
-                    print(f"Intersection found at {neighbor}!")
+                    if emit:
+                        emit(INTERSECT, neighbor)
                     return reconstruct_path(forward_parent, backward_parent, neighbor, start, goal)
 
-        print(f"Forward queue: {list(forward_queue)}")
-        print(f"Backward queue: {list(backward_queue)}")
-        print("---")
-
-    print("No path found")
+    if emit:
+        emit(EXHAUSTED)
     return None
 
 def reconstruct_path(forward_parent, backward_parent, intersection, start, goal):
@@ -83,6 +90,9 @@ def reconstruct_path(forward_parent, backward_parent, intersection, start, goal)
 
 # Example usage
 if __name__ == "__main__":
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Undirected graph: A <-> B, C; B <-> D; C <-> E; D <-> E
     graph = {
         'A': ['B', 'C'],
@@ -97,7 +107,9 @@ if __name__ == "__main__":
         print(f"{node}: {neighbors}")
     print()
 
-    path = bidirectional_search(graph, 'A', 'E')
+    tracer = SearchTracer()
+    path = bidirectional_search(graph, 'A', 'E', tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
@@ -1,104 +1,193 @@
 import heapq
 
-def bidirectional_a_star(graph, reverse_graph, weights, heuristics, start, goal):
+from search_trace import POP, SKIP, ENQUEUE, INTERSECT, EXHAUSTED
+
+def reverse_adjacency(graph):
+    """Reverse adjacency list: ``{v: [u, ...]}`` for every edge ``u -> v``."""
+    reverse_graph = {node: [] for node in graph}
+    for u, neighbors in graph.items():
+        for v in neighbors:
+            reverse_graph.setdefault(v, []).append(u)
+    return reverse_graph
+
+def bidirectional_a_star(graph, reverse_graph, weights, heuristics, start, goal, tracer=None,
+                         reverse_heuristics=None):
     """
-    Bidirectional A* implementation with simulation.
+    Optimal bidirectional A* (NBA*, Pijls & Post) with simulation.
+
+    The forward search is guided by ``heuristics`` (estimates of the cost
+    to goal) and the backward search by ``reverse_heuristics`` (estimates
+    of the cost from start; all zero when not given). Both must be
+    consistent. Each step expands the side with fewer open nodes. A node
+    leaves the open lists at most once over both sides, and it is rejected
+    without expansion when
+
+        g(x) + h(x) >= L    or    g(x) + F_other - h_other(x) >= L
+
+    where L is the best meeting cost so far and F_other the smallest f on
+    the other side. The search stops as soon as either side's smallest f
+    reaches L, so the returned path is a shortest one.
 
     Args:
     graph (dict): Adjacency list from start to goal.
-    reverse_graph (dict): Adjacency list from goal to start.
+    reverse_graph (dict or None): Adjacency list from goal to start;
+        derived from graph when None.
     weights (dict): Weights for edges, e.g., {(u,v): weight}.
-    heuristics (dict): Heuristic values for each node.
+    heuristics (dict): Heuristic values (cost to goal) for each node.
     start: Starting node.
     goal: Goal node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+    reverse_heuristics (dict): Heuristic values (cost from start).
 
     Returns:
     list or None: Path from start to goal if found, else None.
     """
-    def reconstruct_path(forward_parent, backward_parent, intersection, start, goal):
-        path = []
-        current = intersection
-        while current != start:
-            path.append(current)
-            current = forward_parent[current]
-        path.append(start)
-        path.reverse()
-        current = intersection
-        while current != goal:
-            current = backward_parent[current]
-            path.append(current)
-        return path
+    if reverse_graph is None:
+        reverse_graph = reverse_adjacency(graph)
+    if reverse_heuristics is None:
+        reverse_heuristics = {}
+    inf = float('inf')
+
+    emit = None
+    if tracer is not None:
+        tracer.begin("bidirectional_a_star", start=start, goal=goal, heuristics=heuristics,
+                     reverse_heuristics=reverse_heuristics)
+        emit = tracer.emit
 
     if start == goal:
         return [start]
 
-    forward_open = [(heuristics[start], start)]
-    backward_open = [(heuristics[goal], goal)]
-    forward_closed = set()
-    backward_closed = set()
-    forward_parent = {start: None}
-    backward_parent = {goal: None}
-    forward_g = {start: 0}
-    backward_g = {goal: 0}
-
-    print(f"Starting Bidirectional A* from {start} to {goal}")
-    print(f"Heuristics: {heuristics}")
-    print()
-
-    while forward_open and backward_open:
-        # Forward search
-        f_f, current_f = heapq.heappop(forward_open)
-        if current_f in forward_closed:
-            continue
-        forward_closed.add(current_f)
-        print(f"Forward expand: {current_f} (f: {f_f})")
-
-        if current_f in backward_closed:
-            print(f"Intersection at {current_f}")
-            return reconstruct_path(forward_parent, backward_parent, current_f, start, goal)
-
-        for neighbor in graph.get(current_f, []):
-            if neighbor in forward_closed:
-                continue
-            edge_weight = weights.get((current_f, neighbor), 1)
-            tentative_g = forward_g[current_f] + edge_weight
-            if neighbor not in forward_g or tentative_g < forward_g[neighbor]:
-                forward_g[neighbor] = tentative_g
-                f = tentative_g + heuristics[neighbor]
-                heapq.heappush(forward_open, (f, neighbor))
-                forward_parent[neighbor] = current_f
-                print(f"  Forward enqueue: {neighbor} (g: {tentative_g}, h: {heuristics[neighbor]}, f: {f})")
-
-        # Backward search
-        f_b, current_b = heapq.heappop(backward_open)
-        if current_b in backward_closed:
+    forward = {
+        'open': [(heuristics.get(start, 0), 0, start)], 'g': {start: 0}, 'parent': {start: None},
+        'h': lambda node: heuristics.get(node, 0),
+        'neighbors': lambda node: ((nbr, weights.get((node, nbr), 1)) for nbr in graph.get(node, [])),
+        'side': 'f',
+    }
+    backward = {
+        'open': [(reverse_heuristics.get(goal, 0), 0, goal)], 'g': {goal: 0}, 'parent': {goal: None},
+        'h': lambda node: reverse_heuristics.get(node, 0),
+        'neighbors': lambda node: ((nbr, weights.get((nbr, node), 1))  # Reverse edge
+                                   for nbr in reverse_graph.get(node, [])),
+        'side': 'b',
+    }
+    done = set()  # nodes taken off either open list
+    best_cost, meeting = inf, None
+
+    def top(search):
+        """Drop finished and stale entries; return the smallest f (inf when empty)."""
+        open_heap, g = search['open'], search['g']
+        while open_heap:
+            f, g_entry, node = open_heap[0]
+            if node not in done and g_entry == g[node]:
+                return f
+            heapq.heappop(open_heap)
+        return inf
+
+    while True:
+        top_f, top_b = top(forward), top(backward)
+        if max(top_f, top_b) >= best_cost or top_f == inf or top_b == inf:
+            break
+        mine, other = ((forward, backward) if len(forward['open']) <= len(backward['open'])
+                       else (backward, forward))
+        f, g_node, node = heapq.heappop(mine['open'])
+        done.add(node)
+        side = mine['side']
+        if emit:
+            emit(POP, node, f, None, side)
+        if f >= best_cost or g_node + top(other) - other['h'](node) >= best_cost:
+            if emit:
+                emit(SKIP, node, f, None, side)
             continue
-        backward_closed.add(current_b)
-        print(f"Backward expand: {current_b} (f: {f_b})")
-
-        if current_b in forward_closed:
-            print(f"Intersection at {current_b}")
-            return reconstruct_path(forward_parent, backward_parent, current_b, start, goal)
-
-        for neighbor in reverse_graph.get(current_b, []):
-            if neighbor in backward_closed:
+        for neighbor, edge_weight in mine['neighbors'](node):
+            if neighbor in done:
                 continue
-            edge_weight = weights.get((neighbor, current_b), 1)  # Reverse edge
-            tentative_g = backward_g[current_b] + edge_weight
-            if neighbor not in backward_g or tentative_g < backward_g[neighbor]:
-                backward_g[neighbor] = tentative_g
-                f = tentative_g + heuristics[neighbor]
-                heapq.heappush(backward_open, (f, neighbor))
-                backward_parent[neighbor] = current_b
-                print(f"  Backward enqueue: {neighbor} (g: {tentative_g}, h: {heuristics[neighbor]}, f: {f})")
-
-        print("---")
+            tentative_g = g_node + edge_weight
+            if tentative_g < mine['g'].get(neighbor, inf):
+                mine['g'][neighbor] = tentative_g
+                mine['parent'][neighbor] = node
+                f = tentative_g + mine['h'](neighbor)
+                heapq.heappush(mine['open'], (f, tentative_g, neighbor))
+                if emit:
+                    emit(ENQUEUE, neighbor, tentative_g, f, side)
+                total = tentative_g + other['g'].get(neighbor, inf)
+                if total < best_cost:
+                    best_cost, meeting = total, neighbor
+                    if emit:
+                        emit(INTERSECT, neighbor, total)
+
+    if meeting is None:
+        if emit:
+            emit(EXHAUSTED)
+        return None
+    path = []
+    current = meeting
+    while current is not None:
+        path.append(current)
+        current = forward['parent'][current]
+    path.reverse()
+    current = backward['parent'][meeting]
+    while current is not None:
+        path.append(current)
+        current = backward['parent'][current]
+    return path
+
+def compare_with_a_star(families=("geometric", "road"), n=20000, queries=20, seed=0):
+    """
+    Expanded nodes and time per query: Informed-Search a_star against its
+    bidirectional_a_star (NBA*), with h_back = 0 and with a real backward
+    heuristic (Euclidean distance from start; the generated graphs are
+    undirected).
 
-    print("No path found")
-    return None
+    Args:
+    families (tuple): graph_generators families with coordinates.
+    n (int): Approximate graph size.
+    queries (int): Queries per family.
+    seed (int): Generator seed.
+    """
+    import time
+
+    from graph_generators import GENERATORS, pick_query
+    from heuristic_provider import CoordinateHeuristics
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    runs = {
+        'a_star': lambda graph, rev, h, hb, s, t: informed.a_star(graph, h, s, t),
+        'nba_star h_back=0': lambda graph, rev, h, hb, s, t: informed.bidirectional_a_star(
+            graph, h, s, t, reverse_graph=rev),
+        'nba_star': lambda graph, rev, h, hb, s, t: informed.bidirectional_a_star(
+            graph, h, s, t, reverse_graph=rev, h_back=hb),
+    }
+    for family in families:
+        graph, coords = GENERATORS[family](n, seed=seed)
+        reverse_graph = graph.reverse()  # built once, shared by every query
+        provider = CoordinateHeuristics(graph, coords)
+        totals = {name: [0, 0.0] for name in runs}
+        for q in range(queries):
+            start, goal = pick_query(graph, seed=seed * 100003 + q)
+            h = provider.heuristic(goal)
+            h_back = provider.heuristic(start)
+            costs = set()
+            for name, run in runs.items():
+                t0 = time.perf_counter()
+                _, cost, expanded, _ = run(graph, reverse_graph, h, h_back, start, goal)
+                totals[name][0] += expanded
+                totals[name][1] += time.perf_counter() - t0
+                costs.add(cost)
+            assert len(costs) == 1, (family, start, goal, costs)
+        print(f"{family} {graph}, {queries} queries, per-query averages:")
+        for name, (expanded, seconds) in totals.items():
+            print(f"  {name:18s} expanded {expanded / queries:9.1f}   {seconds / queries * 1000:8.3f} ms")
 
 # Example usage
 if __name__ == "__main__":
+    import sys
+
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B(1), C(4); B -> D(2); C -> E(3); D -> E(1)
     graph = {
         'A': ['B', 'C'],
@@ -108,15 +197,6 @@ if __name__ == "__main__":
         'E': []
     }
 
-    # Reverse graph for backward search
-    reverse_graph = {
-        'E': ['C', 'D'],
-        'D': ['B'],
-        'C': ['A'],
-        'B': ['A'],
-        'A': []
-    }
-
     # Weights
     weights = {
         ('A', 'B'): 1,
@@ -126,14 +206,18 @@ if __name__ == "__main__":
         ('D', 'E'): 1
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
+    # Backward heuristics (Manhattan distance from A)
+    reverse_heuristics = provider.heuristic('A')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
@@ -143,8 +227,17 @@ if __name__ == "__main__":
         print(f"{edge}: {weight}")
     print()
 
-    path = bidirectional_a_star(graph, reverse_graph, weights, heuristics, 'A', 'E')
+    tracer = SearchTracer()
+    # reverse_graph=None: the backward adjacency is derived from graph
+    path = bidirectional_a_star(graph, None, weights, heuristics, 'A', 'E', tracer=tracer,
+                                reverse_heuristics=reverse_heuristics)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
         print("\nNo path found")
+    print()
+
+    # python bidirectional_heuristic.py --compare also runs the 20k-node A* vs NBA* comparison
+    if "--compare" in sys.argv[1:]:
+        compare_with_a_star()
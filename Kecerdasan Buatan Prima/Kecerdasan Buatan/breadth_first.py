@@ -1,46 +1,68 @@
 from collections import deque
 
-def breadth_first_search(graph, start):
+from search_trace import POP, ENQUEUE, EXHAUSTED
+
+def breadth_first_search(graph, start, mode="top_down", stats=None, tracer=None):
     """
     Breadth First Search (BFS) implementation with simulation.
 
     Args:
     graph (dict): Adjacency list representation of the graph.
     start: Starting node.
+    mode (str): "top_down" for the queue-based simulation below, or
+        "direction_optimizing" to switch between top-down and bottom-up
+        expansion (vectorized_bfs.direction_optimizing_bfs, needs NumPy).
+    stats (dict): Optional dict that receives the number of edges inspected
+        by each mode (``top_down_edges`` / ``bottom_up_edges``).
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list: List of visited nodes in BFS order.
     """
+    if mode == "direction_optimizing":
+        from vectorized_bfs import direction_optimizing_bfs
+        return direction_optimizing_bfs(graph, start, stats=stats)
+    if mode != "top_down":
+        raise ValueError(f"Unknown BFS mode: {mode}")
+
     visited = set()
     queue = deque([start])
     visited.add(start)
     bfs_order = []
+    edges_inspected = 0
 
-    print(f"Starting BFS from node: {start}")
-    print(f"Initial queue: {list(queue)}")
-    print(f"Initial visited: {list(visited)}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("breadth_first", start=start)
+        emit = tracer.emit
 
     while queue:
         current = queue.popleft()
         bfs_order.append(current)
-        print(f"Dequeued: {current}")
-        print(f"Current BFS order: {bfs_order}")
+        if emit:
+            emit(POP, current)
 
         for neighbor in graph.get(current, []):
+            edges_inspected += 1
             if neighbor not in visited:
                 visited.add(neighbor)
                 queue.append(neighbor)
-                print(f"Enqueued neighbor: {neighbor}")
-                print(f"Queue now: {list(queue)}")
-                print(f"Visited now: {list(visited)}")
-        print("---")
+                if emit:
+                    emit(ENQUEUE, neighbor)
 
-    print(f"\nFinal BFS traversal order: {bfs_order}")
+    if emit:
+        emit(EXHAUSTED)
+    if stats is not None:
+        stats['top_down_edges'] = edges_inspected
+        stats['bottom_up_edges'] = 0
     return bfs_order
 
 # Example usage
 if __name__ == "__main__":
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Simple graph: A -> B, C; B -> D; C -> E
     graph = {
         'A': ['B', 'C'],
@@ -55,4 +77,6 @@ if __name__ == "__main__":
         print(f"{node}: {neighbors}")
     print()
 
-    breadth_first_search(graph, 'A')
+    tracer = SearchTracer()
+    breadth_first_search(graph, 'A', tracer=tracer)
+    replay(tracer)
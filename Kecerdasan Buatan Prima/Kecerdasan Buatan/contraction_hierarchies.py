@@ -0,0 +1,311 @@
+"""
+Contraction Hierarchies (Geisberger et al.) for fast point-to-point queries.
+
+Preprocessing contracts nodes one at a time, least important first. When
+node v is removed, every pair of remaining neighbors u -> v -> w gets a
+shortcut u -> w of cost w(u, v) + w(v, w), unless a local "witness" search
+from u that avoids v already finds a path that is no longer. Importance is
+the edge difference (shortcuts added minus edges removed) plus the number
+of already-contracted neighbors, kept up to date lazily.
+
+After contraction every edge points either up or down the order. A query
+runs Dijkstra forward from the start over upward edges and backward from
+the goal over (reversed) downward edges; both searches only climb, so they
+settle a few hundred nodes even on large road graphs. Shortcuts remember
+the node they bypass, which is used to unpack the path back into original
+edges.
+
+    ch = ContractionHierarchy.build(graph)
+    path, cost, settled = ch.query('Arad', 'Bucharest')
+"""
+
+import heapq
+
+from csr_graph import CSRGraph
+
+
+class ContractionHierarchy:
+    """
+    A contracted graph ready for queries.
+
+    Args:
+    names (list): Node name for each id.
+    rank (list): Contraction order position of each id.
+    up (CSRGraph): Edges u -> v with rank[v] > rank[u] (names are ids).
+    down (CSRGraph): Reversed edges: for u -> v with rank[u] > rank[v],
+        an edge v -> u (names are ids).
+    middle (dict): ``(u, v) -> bypassed node`` for every shortcut.
+    """
+
+    def __init__(self, names, rank, up, down, middle):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+
+    @property
+    def num_shortcuts(self):
+        return len(self.middle)
+
+    # -------------------------
+    # Preprocessing
+    # -------------------------
+    @classmethod
+    def build(cls, graph, witness_limit=64):
+        """
+        Contract every node of a graph.
+
+        Args:
+        graph (dict or CSRGraph): Weighted graph, e.g. ``{u: {v: w}}``.
+        witness_limit (int): Nodes a witness search may settle before it
+            gives up (and the shortcut is added to be safe).
+
+        Returns:
+        ContractionHierarchy: The preprocessed hierarchy.
+        """
+        graph = CSRGraph.from_dict(graph)
+        n = graph.num_nodes
+        out_adj = [{} for _ in range(n)]
+        in_adj = [{} for _ in range(n)]
+        for u in range(n):
+            for v, w in graph.edges(u):
+                if u != v and w < out_adj[u].get(v, float('inf')):
+                    out_adj[u][v] = w
+                    in_adj[v][u] = w
+
+        def shortcuts_for(v):
+            """Shortcuts needed to contract v right now."""
+            needed = []
+            outgoing = out_adj[v]
+            for u, w_uv in in_adj[v].items():
+                limit = w_uv + max((w for x, w in outgoing.items() if x != u), default=0)
+                dist = _witness_search(out_adj, u, v, limit, witness_limit)
+                for x, w_vx in outgoing.items():
+                    if x != u and dist.get(x, float('inf')) > w_uv + w_vx:
+                        needed.append((u, x, w_uv + w_vx))
+            return needed
+
+        contracted_neighbors = [0] * n
+
+        def priority(v):
+            edge_difference = len(shortcuts_for(v)) - len(in_adj[v]) - len(out_adj[v])
+            return edge_difference + contracted_neighbors[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        heapq.heapify(queue)
+        rank = [0] * n
+        up_edges, down_edges = [], []
+        middle = {}
+        order = 0
+
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Lazy update: re-evaluate and put back if no longer the minimum
+            current = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            rank[v] = order
+            order += 1
+            for x, w in out_adj[v].items():
+                up_edges.append((v, x, w))
+            for u, w in in_adj[v].items():
+                down_edges.append((v, u, w))
+
+            for u, x, w in shortcuts_for(v):
+                if w < out_adj[u].get(x, float('inf')):
+                    out_adj[u][x] = w
+                    in_adj[x][u] = w
+                    middle[(u, x)] = v
+            for x in out_adj[v]:
+                del in_adj[x][v]
+                contracted_neighbors[x] += 1
+            for u in in_adj[v]:
+                del out_adj[u][v]
+                contracted_neighbors[u] += 1
+            out_adj[v] = {}
+            in_adj[v] = {}
+
+        ids = range(n)
+        return cls(graph.names, rank, CSRGraph.from_edges(ids, up_edges),
+                   CSRGraph.from_edges(ids, down_edges), middle)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def query(self, start, goal):
+        """
+        Shortest path by bidirectional upward Dijkstra.
+
+        Args:
+        start: Start node name.
+        goal: Goal node name.
+
+        Returns:
+        list or None: Path from start to goal in original nodes.
+        int or float: Path cost (inf when unreachable).
+        int: Nodes settled by both searches.
+        """
+        s, t = self.index[start], self.index[goal]
+        inf = float('inf')
+        dist = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})
+        heaps = ([(0, s)], [(0, t)])
+        graphs = (self.up.edges, self.down.edges)
+        settled = 0
+        best, meeting = (0, s) if s == t else (inf, None)
+
+        while heaps[0] or heaps[1]:
+            # Alternate by the smaller key; a side stops once its smallest
+            # key cannot improve the best meeting cost.
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            heap = heaps[side]
+            d, u = heapq.heappop(heap)
+            if d >= best:
+                heap.clear()
+                continue
+            mine, other = dist[side], dist[1 - side]
+            if d > mine[u]:
+                continue
+            settled += 1
+            if u in other and d + other[u] < best:
+                best, meeting = d + other[u], u
+            for v, w in graphs[side](u):
+                nd = d + w
+                if nd < mine.get(v, inf):
+                    mine[v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        if meeting is None:
+            return None, inf, settled
+        # start -> meeting (forward tree), then meeting -> goal (backward tree)
+        hops = []
+        node = meeting
+        while node is not None:
+            hops.append(node)
+            node = parent[0][node]
+        hops.reverse()
+        node = parent[1][meeting]
+        while node is not None:
+            hops.append(node)
+            node = parent[1][node]
+        return self.unpack(hops), best, settled
+
+    def unpack(self, hops):
+        """Expand a path of (possibly shortcut) edges into original node names."""
+        names, middle = self.names, self.middle
+        path = [names[hops[0]]]
+        for a, b in zip(hops, hops[1:]):
+            stack = [(a, b)]
+            while stack:
+                u, v = stack.pop()
+                mid = middle.get((u, v))
+                if mid is None:
+                    path.append(names[v])
+                else:
+                    # Push the second half first so the first half unpacks first
+                    stack.append((mid, v))
+                    stack.append((u, mid))
+        return path
+
+    def __repr__(self):
+        return (f"ContractionHierarchy(num_nodes={len(self.names)}, "
+                f"up_edges={self.up.num_edges}, down_edges={self.down.num_edges}, "
+                f"shortcuts={self.num_shortcuts})")
+
+
+def _witness_search(out_adj, source, avoid, limit, max_settled):
+    """
+    Dijkstra from source in the remaining graph, skipping ``avoid``, that
+    stops past ``limit`` or after ``max_settled`` nodes.
+
+    Returns:
+    dict: Tentative distances found.
+    """
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap and settled < max_settled:
+        d, u = heapq.heappop(heap)
+        if d > limit:
+            break
+        if d > dist[u]:
+            continue
+        settled += 1
+        for v, w in out_adj[u].items():
+            if v == avoid:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def compare_settled(n=4000, queries=100, seed=0):
+    """
+    Settled / expanded nodes per query: CH against a_star and ucs on a
+    road-like graph.
+
+    Args:
+    n (int): Approximate graph size.
+    queries (int): Number of random reachable queries.
+    seed (int): Generator seed.
+    """
+    import time
+
+    from graph_generators import heuristic_table, pick_query, road_like_graph
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    unformed = load_script('Unformed-Search.py')
+
+    graph, coords = road_like_graph(n, seed=seed)
+    t0 = time.perf_counter()
+    ch = ContractionHierarchy.build(graph)
+    print(f"Road-like graph: {graph}")
+    print(f"Preprocessing: {(time.perf_counter() - t0):.2f} s, {ch}")
+
+    totals = {'ch': [0, 0.0], 'a_star': [0, 0.0], 'ucs': [0, 0.0]}
+    for q in range(queries):
+        start, goal = pick_query(graph, seed=seed * 100003 + q)
+        h = heuristic_table(graph, coords, goal)
+
+        t0 = time.perf_counter()
+        path, cost, settled = ch.query(start, goal)
+        totals['ch'][0] += settled
+        totals['ch'][1] += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _, a_cost, expanded, _ = informed.a_star(graph, h, start, goal)
+        totals['a_star'][0] += expanded
+        totals['a_star'][1] += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _, u_cost, expanded = unformed.ucs(start, goal, graph=graph)
+        totals['ucs'][0] += expanded
+        totals['ucs'][1] += time.perf_counter() - t0
+
+        assert cost == a_cost == u_cost, (start, goal, cost, a_cost, u_cost)
+        assert sum(graph[a][b] for a, b in zip(path, path[1:])) == cost
+
+    print(f"\n{queries} queries, per-query averages:")
+    for name, (count, seconds) in totals.items():
+        print(f"  {name:7s} settled/expanded {count / queries:9.1f}   "
+              f"{seconds / queries * 1000:8.3f} ms")
+
+
+# Example usage
+if __name__ == "__main__":
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    ch = ContractionHierarchy.build(informed.GRAPH)
+    print(ch)
+    print(f"Arad -> Bucharest: {ch.query('Arad', 'Bucharest')}\n")
+
+    compare_settled()
@@ -0,0 +1,273 @@
+from array import array
+from collections.abc import Mapping
+
+
+class CSRGraph(Mapping):
+    """
+    Compact integer-indexed graph in CSR (compressed sparse row) form.
+
+    Node names are mapped to integer ids once. The successors of node id ``u``
+    are ``targets[offsets[u]:offsets[u + 1]]`` with the matching edge costs in
+    ``weights``, so an edge costs one slot in two flat arrays instead of a
+    dict entry or a ``(u, v)`` tuple key.
+
+    The search functions detect a CSRGraph and run on integer ids through
+    ``edges(u)``. For everything else the graph still behaves like the
+    read-only dict-of-dicts ``{name: {neighbor: weight}}`` used by
+    ``romania_map`` and ``GRAPH``.
+
+    Attributes:
+    names (list): Node name for each id.
+    index (dict): Node name -> id.
+    offsets (array): Row start of each node, length ``num_nodes + 1``.
+    targets (array): Successor ids, length ``num_edges``.
+    weights (array): Edge costs aligned with ``targets``. Integer typecode when
+        every weight is an integer, float otherwise. The three arrays may
+        also be memoryviews (e.g. over shared memory, see batch_query.py).
+    version (int): Bumped by ``set_weight`` so caches can detect changes.
+    """
+
+    def __init__(self, names, offsets, targets, weights):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.version = 0
+
+    # -------------------------
+    # Construction
+    # -------------------------
+    @classmethod
+    def from_edges(cls, names, edges):
+        """
+        Build a graph from ``(u, v, weight)`` triples of integer ids.
+
+        Edges keep their input order inside each row, so traversal order
+        matches the dict the edges came from.
+
+        Args:
+        names (list): Node name for each id.
+        edges (iterable): ``(u, v, weight)`` triples with ids < len(names).
+
+        Returns:
+        CSRGraph: The packed graph.
+        """
+        sources = array('i')
+        targets = array('i')
+        costs = []
+        for u, v, w in edges:
+            sources.append(u)
+            targets.append(v)
+            costs.append(w)
+
+        n = len(names)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        typecode = 'q' if all(isinstance(w, int) for w in costs) else 'd'
+        cursor = array('q', offsets[:n])
+        packed_targets = array('i', bytes(4 * len(sources)))
+        packed_weights = array(typecode, bytes(8 * len(sources)))
+        for u, v, w in zip(sources, targets, costs):
+            slot = cursor[u]
+            packed_targets[slot] = v
+            packed_weights[slot] = w
+            cursor[u] = slot + 1
+        return cls(names, offsets, packed_targets, packed_weights)
+
+    @classmethod
+    def from_dict(cls, graph, weights=None):
+        """
+        Build a graph from any of the dict formats used in this project.
+
+        Supported row formats:
+        - ``{u: {v: w}}`` (``romania_map``, ``GRAPH``)
+        - ``{u: [(v, w), ...]}`` (dijkstra.py)
+        - ``{u: [v, ...]}`` with ``weights={(u, v): w}``, missing weights
+          default to 1 (a_star.py, weighted_a_star.py, ...)
+
+        Args:
+        graph (dict): Adjacency in one of the formats above.
+        weights (dict): Optional ``{(u, v): weight}`` for plain adjacency lists.
+
+        Returns:
+        CSRGraph: The packed graph.
+        """
+        if isinstance(graph, CSRGraph):
+            return graph
+
+        index = {}
+        names = []
+
+        def node_id(name):
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(names)
+                names.append(name)
+            return i
+
+        for u in graph:
+            node_id(u)
+
+        edges = []
+        weights = weights or {}
+        for u, row in graph.items():
+            uid = index[u]
+            if isinstance(row, Mapping):
+                entries = row.items()
+            else:
+                entries = (
+                    entry if isinstance(entry, tuple) and len(entry) == 2
+                    else (entry, weights.get((u, entry), 1))
+                    for entry in row
+                )
+            for v, w in entries:
+                edges.append((uid, node_id(v), w))
+        return cls.from_edges(names, edges)
+
+    # -------------------------
+    # Integer-id interface (used by the search functions)
+    # -------------------------
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def weight_typecode(self):
+        """'q' for integer weights, 'd' for floats (array or memoryview)."""
+        return getattr(self.weights, 'typecode', None) or self.weights.format
+
+    def weight_range(self):
+        """(min, max) edge weight, (0, 0) without edges; cached per ``version``."""
+        cached = self.__dict__.get('_weight_range')
+        if cached is None or cached[0] != self.version:
+            weights = self.weights
+            cached = self._weight_range = (self.version, (min(weights), max(weights))
+                                           if len(weights) else (0, 0))
+        return cached[1]
+
+    def id_of(self, name):
+        return self.index[name]
+
+    def edges(self, u):
+        """Return ``(v, weight)`` id pairs for the successors of id ``u``."""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def node_values(self, values, default=0):
+        """
+        Turn a ``{name: value}`` dict (e.g. a heuristic table) into a list indexed by id.
+
+        Objects with a ``by_id(graph)`` method (such as landmark heuristics)
+        build the list themselves.
+        """
+        if hasattr(values, 'by_id'):
+            return values.by_id(self)
+        get = values.get
+        return [get(name, default) for name in self.names]
+
+    def reverse(self):
+        """Return the transposed graph (every edge ``u -> v`` becomes ``v -> u``)."""
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        return CSRGraph.from_edges(
+            self.names,
+            ((targets[e], u, weights[e])
+             for u in range(self.num_nodes)
+             for e in range(offsets[u], offsets[u + 1])),
+        )
+
+    def set_weight(self, u, v, weight):
+        """
+        Change the cost of existing edge ``u -> v`` (node names) in place.
+
+        Raises:
+        KeyError: If the edge does not exist.
+        """
+        uid, vid = self.index[u], self.index[v]
+        for e in range(self.offsets[uid], self.offsets[uid + 1]):
+            if self.targets[e] == vid:
+                if self.weight_typecode == 'q' and not isinstance(weight, int):
+                    self.weights = array('d', self.weights)
+                self.weights[e] = weight
+                self.version += 1
+                return
+        raise KeyError((u, v))
+
+    # -------------------------
+    # Read-only dict-of-dicts view
+    # -------------------------
+    def __getitem__(self, name):
+        return _Row(self, self.index[name])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __repr__(self):
+        return f"CSRGraph(num_nodes={self.num_nodes}, num_edges={self.num_edges})"
+
+
+class _Row(Mapping):
+    """Successors of one node as a read-only ``{neighbor_name: weight}`` mapping."""
+
+    __slots__ = ('_graph', '_lo', '_hi')
+
+    def __init__(self, graph, u):
+        self._graph = graph
+        self._lo = graph.offsets[u]
+        self._hi = graph.offsets[u + 1]
+
+    def __getitem__(self, name):
+        g = self._graph
+        vid = g.index[name]
+        for e in range(self._lo, self._hi):
+            if g.targets[e] == vid:
+                return g.weights[e]
+        raise KeyError(name)
+
+    def __iter__(self):
+        names = self._graph.names
+        return (names[v] for v in self._graph.targets[self._lo:self._hi])
+
+    def __len__(self):
+        return self._hi - self._lo
+
+    def items(self):
+        g = self._graph
+        names = g.names
+        return [(names[v], w) for v, w in
+                zip(g.targets[self._lo:self._hi], g.weights[self._lo:self._hi])]
+
+
+# Example usage
+if __name__ == "__main__":
+    graph = {
+        'A': {'B': 1, 'C': 4},
+        'B': {'C': 2, 'D': 5},
+        'C': {'D': 1},
+        'D': {}
+    }
+
+    csr = CSRGraph.from_dict(graph)
+    print(csr)
+    print(f"names:   {csr.names}")
+    print(f"offsets: {csr.offsets.tolist()}")
+    print(f"targets: {csr.targets.tolist()}")
+    print(f"weights: {csr.weights.tolist()}")
+    print(f"Successors of B: {dict(csr['B'])}")
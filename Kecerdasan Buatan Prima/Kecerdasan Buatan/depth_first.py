@@ -1,10 +1,14 @@
-def depth_first_search(graph, start):
+from search_trace import POP, SKIP, ENQUEUE, EXHAUSTED
+
+def depth_first_search(graph, start, tracer=None):
     """
     Depth First Search (DFS) implementation with simulation.
 
     Args:
     graph (dict): Adjacency list representation of the graph.
     start: Starting node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list: List of visited nodes in DFS order.
@@ -13,35 +17,37 @@ def depth_first_search(graph, start):
     stack = [start]
     dfs_order = []
 
-    print(f"Starting DFS from node: {start}")
-    print(f"Initial stack: {stack}")
-    print(f"Initial visited: {list(visited)}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("depth_first", start=start)
+        emit = tracer.emit
 
     while stack:
         current = stack.pop()
         if current not in visited:
             visited.add(current)
             dfs_order.append(current)
-            print(f"Popped and visited: {current}")
-            print(f"Current DFS order: {dfs_order}")
-            print(f"Visited now: {list(visited)}")
+            if emit:
+                emit(POP, current)
 
             # Push neighbors in reverse order to simulate depth-first
             for neighbor in reversed(graph.get(current, [])):
                 if neighbor not in visited:
                     stack.append(neighbor)
-                    print(f"Pushed neighbor: {neighbor}")
-                    print(f"Stack now: {stack}")
-        else:
-            print(f"Skipped {current} (already visited)")
-        print("---")
+                    if emit:
+                        emit(ENQUEUE, neighbor)
+        elif emit:
+            emit(SKIP, current)
 
-    print(f"\nFinal DFS traversal order: {dfs_order}")
+    if emit:
+        emit(EXHAUSTED)
     return dfs_order
 
 # Example usage
 if __name__ == "__main__":
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Simple graph: A -> B, C; B -> D; C -> E
     graph = {
         'A': ['B', 'C'],
@@ -56,4 +62,6 @@ if __name__ == "__main__":
         print(f"{node}: {neighbors}")
     print()
 
-    depth_first_search(graph, 'A')
+    tracer = SearchTracer()
+    depth_first_search(graph, 'A', tracer=tracer)
+    replay(tracer)
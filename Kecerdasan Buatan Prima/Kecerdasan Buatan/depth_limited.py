@@ -1,4 +1,6 @@
-def depth_limited_search(graph, start, goal, limit):
+from search_trace import POP, GOAL, CUTOFF, BACKTRACK, EXHAUSTED
+
+def depth_limited_search(graph, start, goal, limit, tracer=None):
     """
     Depth Limited Search (DLS) implementation with simulation.
 
@@ -7,21 +9,24 @@ def depth_limited_search(graph, start, goal, limit):
     start: Starting node.
     goal: Goal node.
     limit: Depth limit.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list or None: Path to goal if found within limit, else None.
     """
     def dls_recursive(node, goal, limit, path, visited):
-        print(f"Visiting node: {node} at depth {len(path)-1}")
-        print(f"Current path: {path}")
-        print(f"Visited: {list(visited)}")
+        if emit:
+            emit(POP, node, len(path) - 1)
 
         if node == goal:
-            print(f"Goal {goal} found!")
+            if emit:
+                emit(GOAL, node)
             return path
 
         if len(path) - 1 >= limit:
-            print(f"Depth limit {limit} reached at node {node}, cutting off")
+            if emit:
+                emit(CUTOFF, node, limit)
             return None
 
         visited.add(node)
@@ -33,23 +38,26 @@ def depth_limited_search(graph, start, goal, limit):
                     return result
 
         visited.remove(node)  # Backtrack
-        print(f"Backtracking from {node}")
+        if emit:
+            emit(BACKTRACK, node)
         return None
 
     visited = set()
-    print(f"Starting DLS from {start} to {goal} with depth limit {limit}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("depth_limited", start=start, goal=goal, limit=limit)
+        emit = tracer.emit
 
     result = dls_recursive(start, goal, limit, [start], visited)
-
-    if result:
-        print(f"\nPath found: {result}")
-    else:
-        print(f"\nNo path found within depth limit {limit}")
+    if result is None and emit:
+        emit(EXHAUSTED)
     return result
 
 # Example usage
 if __name__ == "__main__":
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph with depth exceeding limit: A -> B -> C -> D -> E
     graph = {
         'A': ['B'],
@@ -64,4 +72,11 @@ if __name__ == "__main__":
         print(f"{node}: {neighbors}")
     print()
 
-    depth_limited_search(graph, 'A', 'E', 2)  # Limit 2, goal at depth 4
+    limit = 2  # Goal at depth 4
+    tracer = SearchTracer()
+    result = depth_limited_search(graph, 'A', 'E', limit, tracer=tracer)
+    replay(tracer)
+    if result:
+        print(f"\nPath found: {result}")
+    else:
+        print(f"\nNo path found within depth limit {limit}")
@@ -1,52 +1,209 @@
-import heapq
+import sys
 
-def dijkstra(graph, start):
+from csr_graph import CSRGraph
+from integer_queues import (dial_sssp, integer_weight_range, make_queue, queue_weight_range,
+                            radix_sssp, select_queue)
+from search_trace import POP, SKIP, ENQUEUE, EXHAUSTED
+
+def dijkstra(graph, start, tracer=None, queue='auto'):
     """
     Dijkstra's algorithm implementation with simulation.
 
     Args:
-    graph (dict): Adjacency list with weights, e.g., {'A': [('B', 1), ('C', 4)]}
+    graph (dict or CSRGraph): Adjacency list with weights, e.g., {'A': [('B', 1), ('C', 4)]}
     start: Starting node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+    queue (str): Priority queue engine: 'heap', 'bucket' (Dial), 'radix',
+        or 'auto' ('heap', or Dial's buckets for a CSRGraph with small
+        positive integer weights; see integer_queues). All engines pop in
+        the same order, so the results are identical.
 
     Returns:
     dict: Shortest distances from start to all nodes.
     dict: Previous nodes for path reconstruction.
     """
+    if isinstance(graph, CSRGraph):
+        return dijkstra_csr(graph, start, queue)
+
     # Priority queue: (distance, node)
-    pq = [(0, start)]
+    pq = make_queue(queue, queue_weight_range(queue, graph))
+    pq.push((0, start))
     distances = {node: float('inf') for node in graph}
     distances[start] = 0
     previous = {node: None for node in graph}
 
-    print(f"Starting Dijkstra from node: {start}")
-    print(f"Initial distances: {distances}")
-    print(f"Initial priority queue: {pq}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("dijkstra", start=start, nodes=list(graph))
+        emit = tracer.emit
 
     while pq:
-        current_distance, current_node = heapq.heappop(pq)
-        print(f"Popped: {current_node} with distance {current_distance}")
+        current_distance, current_node = pq.pop()
 
         if current_distance > distances[current_node]:
-            print(f"Skipping {current_node} as better path found")
+            if emit:
+                emit(SKIP, current_node, current_distance)
             continue
+        if emit:
+            emit(POP, current_node, current_distance)
 
         for neighbor, weight in graph.get(current_node, []):
             distance = current_distance + weight
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
                 previous[neighbor] = current_node
-                heapq.heappush(pq, (distance, neighbor))
-                print(f"Updated distance for {neighbor} to {distance} via {current_node}")
-                print(f"Priority queue now: {pq}")
-                print(f"Distances now: {distances}")
-        print("---")
+                pq.push((distance, neighbor))
+                if emit:
+                    emit(ENQUEUE, neighbor, distance, current_node)
+
+    if emit:
+        emit(EXHAUSTED)
+    return distances, previous
+
+def dijkstra_csr(graph, start, queue='auto'):
+    """
+    Dijkstra's algorithm over a CSRGraph, without the per-step simulation.
+
+    Runs on integer ids with list-backed distance/previous tables and only
+    converts back to name-keyed dicts at the end. With positive integer
+    weights the bucket / radix engines run as whole-search loops
+    (integer_queues.dial_sssp / radix_sssp).
+
+    Args:
+    graph (CSRGraph): Packed graph.
+    start: Starting node name.
+    queue (str): Priority queue engine, as for dijkstra.
+
+    Returns:
+    dict: Shortest distances from start to all nodes.
+    dict: Previous nodes for path reconstruction.
+    """
+    names = graph.names
+    source = graph.id_of(start)
+    # Full-graph searches may use dial_sssp; the range is cached on the graph
+    weight_range = None if queue == 'heap' else integer_weight_range(graph)
+    kind = select_queue(queue, weight_range, whole_search=True)
+    if kind == 'bucket' and weight_range[0] > 0:
+        dist, prev = dial_sssp(graph, source, weight_range[1])
+    elif kind == 'radix' and weight_range[0] > 0:
+        dist, prev = radix_sssp(graph, source)
+    else:
+        dist = [float('inf')] * graph.num_nodes
+        prev = [-1] * graph.num_nodes
+        dist[source] = 0
+        pq = make_queue(kind, weight_range)
+        pq.push((0, source))
+        push, pop = pq.push, pq.pop
+        edges = graph.edges
 
-    print(f"\nFinal shortest distances: {distances}")
+        while pq:
+            current_distance, current_node = pop()
+            if current_distance > dist[current_node]:
+                continue
+            for neighbor, weight in edges(current_node):
+                distance = current_distance + weight
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    prev[neighbor] = current_node
+                    push((distance, neighbor))
+
+    distances = dict(zip(names, dist))
+    previous = {name: (names[p] if p >= 0 else None) for name, p in zip(names, prev)}
     return distances, previous
 
+class DijkstraSearch:
+    """
+    Dijkstra from one source that can be stopped and resumed.
+
+    ``settle(goal)`` expands nodes only until ``goal`` is settled and keeps
+    the frontier, so a later call for a farther goal continues where the
+    last one stopped instead of starting over. Goals settled earlier are
+    answered without any expansion.
+
+    Args:
+    graph (dict or CSRGraph): ``{u: [(v, w)]}``, ``{u: {v: w}}`` or CSRGraph.
+    start: Source node.
+    queue (str): Priority queue engine, as for dijkstra.
+    """
+
+    def __init__(self, graph, start, queue='auto'):
+        self.graph = graph
+        self.start = start
+        if isinstance(graph, CSRGraph):
+            self._id = graph.id_of
+            self._name = graph.names.__getitem__
+            self._edges = graph.edges
+        else:
+            self._id = self._name = lambda node: node
+            self._edges = lambda node: _row_items(graph.get(node, ()))
+        source = self._id(start)
+        self.dist = {source: 0}
+        self.prev = {source: None}
+        self.settled = set()
+        self.frontier = make_queue(queue, queue_weight_range(queue, graph))
+        self.frontier.push((0, source))
+        self.expanded = 0
+
+    def settle(self, goal):
+        """
+        Expand until ``goal`` is settled or the frontier runs out.
+
+        Returns:
+        int: Nodes expanded by this call (0 if goal was already settled).
+        """
+        target = self._id(goal)
+        dist, prev, settled = self.dist, self.prev, self.settled
+        frontier, edges = self.frontier, self._edges
+        before = self.expanded
+        while target not in settled and frontier:
+            current_distance, current_node = frontier.pop()
+            if current_distance > dist[current_node]:
+                continue
+            settled.add(current_node)
+            self.expanded += 1
+            for neighbor, weight in edges(current_node):
+                distance = current_distance + weight
+                if distance < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = distance
+                    prev[neighbor] = current_node
+                    frontier.push((distance, neighbor))
+        return self.expanded - before
+
+    def distance(self, goal):
+        """Settled distance to goal (inf when not settled / unreachable)."""
+        node = self._id(goal)
+        return self.dist[node] if node in self.settled else float('inf')
+
+    def path(self, goal):
+        """Shortest path to a settled goal, else None."""
+        node = self._id(goal)
+        if node not in self.settled:
+            return None
+        path = []
+        while node is not None:
+            path.append(self._name(node))
+            node = self.prev[node]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        """Approximate memory held by the search state."""
+        # Container overhead plus ~56 bytes per (distance, node) heap tuple;
+        # small ints and names are shared with the graph.
+        return (sys.getsizeof(self.dist) + sys.getsizeof(self.prev)
+                + sys.getsizeof(self.settled) + 56 * len(self.frontier)
+                + 8 * len(self.frontier))
+
+def _row_items(row):
+    """``(v, w)`` pairs of a ``{v: w}`` or ``[(v, w)]`` adjacency row."""
+    return row.items() if isinstance(row, dict) else row
+
 # Example usage
 if __name__ == "__main__":
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Weighted graph: A -> B(1), C(4); B -> C(2), D(5); C -> D(1)
     graph = {
         'A': [('B', 1), ('C', 4)],
@@ -60,4 +217,6 @@ if __name__ == "__main__":
         print(f"{node}: {neighbors}")
     print()
 
-    dijkstra(graph, 'A')
+    tracer = SearchTracer()
+    dijkstra(graph, 'A', tracer=tracer)
+    replay(tracer)
@@ -0,0 +1,310 @@
+"""
+Precomputed all-pairs distance and next-hop tables.
+
+For small and medium graphs that receive the same point-to-point queries
+over and over, all shortest paths are computed once:
+
+    table = open_table(graph, cache_dir)   # build or reuse the cached table
+    path, cost = table.query('Arad', 'Bucharest')
+
+``dist[i, j]`` is the shortest distance from node id i to node id j and
+``next_hop[i, j]`` the id of the node after i on that path (-1 when j is
+unreachable), so a query is one lookup plus O(path length) hops.
+
+Tables are stored as two ``.npy`` files plus a small metadata pickle whose
+names contain the graph hash and FORMAT_VERSION. ``open_table`` maps the
+arrays with ``np.load(mmap_mode='r')``, so worker processes that open the
+same table share its pages through the OS page cache instead of each
+building or reading a private copy.
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra_csr
+
+# Bump when the on-disk layout changes; older files are then rebuilt
+FORMAT_VERSION = 1
+
+# 'auto' uses Floyd-Warshall up to this many nodes, repeated Dijkstra above
+FLOYD_WARSHALL_MAX_NODES = 400
+
+
+def graph_hash(graph):
+    """
+    Content hash of a graph (node names, edges and weights).
+
+    Args:
+    graph (dict or CSRGraph): Graph in any supported format.
+
+    Returns:
+    str: Hex SHA-256 digest.
+    """
+    graph = CSRGraph.from_dict(graph)
+    digest = hashlib.sha256()
+    digest.update(repr(graph.names).encode())
+    digest.update(graph.offsets.tobytes())
+    digest.update(graph.targets.tobytes())
+    digest.update(graph.weight_typecode.encode())
+    digest.update(graph.weights.tobytes())
+    return digest.hexdigest()
+
+
+class DistanceTable:
+    """
+    All-pairs shortest distances and next hops over node ids.
+
+    Args:
+    names (list): Node name for each id.
+    dist (ndarray): float64 (n, n) distances, inf when unreachable.
+    next_hop (ndarray): int32 (n, n) next node ids, -1 when unreachable.
+    integral (bool): Whether costs should be returned as ints.
+    """
+
+    def __init__(self, names, dist, next_hop, integral=False):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.dist = dist
+        self.next_hop = next_hop
+        self.integral = integral
+
+    def distance(self, start, goal):
+        """Shortest distance from start to goal (inf when unreachable)."""
+        d = self.dist[self.index[start], self.index[goal]]
+        if d == np.inf:
+            return float('inf')
+        return int(d) if self.integral else float(d)
+
+    def query(self, start, goal):
+        """
+        Shortest path by following next hops.
+
+        Returns:
+        list or None: Path from start to goal, None when unreachable.
+        int or float: Path cost (inf when unreachable).
+        """
+        i, j = self.index[start], self.index[goal]
+        cost = self.distance(start, goal)
+        if cost == float('inf'):
+            return None, cost
+        next_hop, names = self.next_hop, self.names
+        path = [start]
+        while i != j:
+            i = int(next_hop[i, j])
+            path.append(names[i])
+        return path, cost
+
+    def save(self, directory, key):
+        """Write the table under ``directory`` for graph hash ``key``."""
+        os.makedirs(directory, exist_ok=True)
+        dist_path, next_path, meta_path = table_paths(directory, key)
+        # Write to temporary names and rename, so a concurrent reader never
+        # maps a half-written file.
+        for path, array in ((dist_path, self.dist), (next_path, self.next_hop)):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as fh:
+                np.save(fh, np.ascontiguousarray(array))
+            os.replace(tmp, path)
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as fh:
+            pickle.dump({
+                'format_version': FORMAT_VERSION,
+                'graph_hash': key,
+                'names': self.names,
+                'integral': self.integral,
+            }, fh)
+        os.replace(tmp, meta_path)
+
+    @classmethod
+    def load(cls, directory, key, mmap_mode='r'):
+        """
+        Open a saved table, memory-mapping its arrays.
+
+        Returns:
+        DistanceTable or None: None when no table of this version exists.
+        """
+        dist_path, next_path, meta_path = table_paths(directory, key)
+        if not all(os.path.exists(p) for p in (dist_path, next_path, meta_path)):
+            return None
+        with open(meta_path, 'rb') as fh:
+            meta = pickle.load(fh)
+        if meta['format_version'] != FORMAT_VERSION or meta['graph_hash'] != key:
+            return None
+        return cls(meta['names'], np.load(dist_path, mmap_mode=mmap_mode),
+                   np.load(next_path, mmap_mode=mmap_mode), meta['integral'])
+
+    def __repr__(self):
+        return f"DistanceTable(num_nodes={len(self.names)})"
+
+
+def table_paths(directory, key):
+    """Return the (dist, next_hop, meta) file paths for a graph hash."""
+    stem = os.path.join(directory, f"apsp-{key[:24]}-v{FORMAT_VERSION}")
+    return f"{stem}.dist.npy", f"{stem}.next.npy", f"{stem}.meta.pkl"
+
+
+# -------------------------
+# Builders
+# -------------------------
+def floyd_warshall(graph):
+    """
+    Vectorized Floyd-Warshall: one (n, n) NumPy relaxation per pivot.
+
+    Args:
+    graph (CSRGraph): Packed graph.
+
+    Returns:
+    ndarray: Distances.
+    ndarray: Next hops.
+    """
+    n = graph.num_nodes
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.int32)
+    weights = np.asarray(graph.weights, dtype=np.float64)
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+
+    dist = np.full((n, n), np.inf)
+    next_hop = np.full((n, n), -1, dtype=np.int32)
+    # Parallel edges: keep the cheapest (process in decreasing weight order)
+    order = np.argsort(-weights, kind='stable')
+    dist[sources[order], targets[order]] = weights[order]
+    next_hop[sources, targets] = targets
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = 0
+    next_hop[diagonal, diagonal] = diagonal
+
+    via = np.empty_like(dist)
+    better = np.empty((n, n), dtype=bool)
+    for k in range(n):
+        np.add(dist[:, k, None], dist[None, k, :], out=via)
+        np.less(via, dist, out=better)
+        np.copyto(dist, via, where=better)
+        np.copyto(next_hop, next_hop[:, k, None], where=better)
+    return dist, next_hop
+
+
+def repeated_dijkstra(graph):
+    """
+    One dijkstra_csr run per source; next hops come from each
+    shortest-path tree.
+
+    Args:
+    graph (CSRGraph): Packed graph.
+
+    Returns:
+    ndarray: Distances.
+    ndarray: Next hops.
+    """
+    n = graph.num_nodes
+    index = graph.index
+    dist = np.full((n, n), np.inf)
+    next_hop = np.full((n, n), -1, dtype=np.int32)
+    for s, start in enumerate(graph.names):
+        distances, previous = dijkstra_csr(graph, start)
+        dist[s] = list(distances.values())
+        prev = [-1 if p is None else index[p] for p in previous.values()]
+        hop = [-1] * n
+        hop[s] = s
+        for t in range(n):
+            if hop[t] >= 0 or prev[t] < 0:
+                continue
+            # Walk up the tree until a node with a known hop or a child of
+            # the source, then give the whole walked chain that hop.
+            chain = []
+            node = t
+            while hop[node] < 0 and prev[node] != s:
+                chain.append(node)
+                node = prev[node]
+            if hop[node] < 0:
+                hop[node] = node
+            for c in chain:
+                hop[c] = hop[node]
+        next_hop[s] = hop
+    return dist, next_hop
+
+
+def build_table(graph, method='auto'):
+    """
+    Compute the all-pairs table of a graph.
+
+    Args:
+    graph (dict or CSRGraph): Graph in any supported format.
+    method (str): 'floyd_warshall', 'dijkstra', or 'auto' (Floyd-Warshall
+        up to FLOYD_WARSHALL_MAX_NODES nodes).
+
+    Returns:
+    DistanceTable: The table (in memory).
+    """
+    graph = CSRGraph.from_dict(graph)
+    if method == 'auto':
+        method = 'floyd_warshall' if graph.num_nodes <= FLOYD_WARSHALL_MAX_NODES else 'dijkstra'
+    if method == 'floyd_warshall':
+        dist, next_hop = floyd_warshall(graph)
+    elif method == 'dijkstra':
+        dist, next_hop = repeated_dijkstra(graph)
+    else:
+        raise ValueError(f"Unknown method {method!r}; expected 'auto', 'floyd_warshall' or 'dijkstra'")
+    return DistanceTable(graph.names, dist, next_hop, graph.weight_typecode == 'q')
+
+
+def open_table(graph, directory, method='auto'):
+    """
+    Memory-map the cached table of ``graph``, building and saving it first
+    when no table exists for this graph hash and format version.
+
+    Args:
+    graph (dict or CSRGraph): Graph in any supported format.
+    directory (str): Cache directory.
+    method (str): Builder used on a cache miss (see build_table).
+
+    Returns:
+    DistanceTable: Table backed by read-only memory maps.
+    """
+    graph = CSRGraph.from_dict(graph)
+    key = graph_hash(graph)
+    table = DistanceTable.load(directory, key)
+    if table is None:
+        build_table(graph, method).save(directory, key)
+        table = DistanceTable.load(directory, key)
+    return table
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    unformed = load_script('Unformed-Search.py')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        t0 = time.perf_counter()
+        table = open_table(informed.GRAPH, cache_dir)
+        print(f"Built and saved {table} in {(time.perf_counter() - t0) * 1000:.2f} ms")
+        print(f"Cache files: {sorted(os.listdir(cache_dir))}")
+
+        t0 = time.perf_counter()
+        table = open_table(informed.GRAPH, cache_dir)
+        print(f"Reopened via mmap in {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+        path, cost = table.query('Arad', 'Bucharest')
+        print(f"\nArad -> Bucharest: {path} cost {cost}")
+
+        pairs = [(a, b) for a in informed.GRAPH for b in informed.GRAPH]
+        t0 = time.perf_counter()
+        for a, b in pairs:
+            table.query(a, b)
+        lookup_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for a, b in pairs:
+            unformed.ucs(a, b, graph=informed.GRAPH)
+        ucs_ms = (time.perf_counter() - t0) * 1000
+        for a, b in pairs:
+            assert table.distance(a, b) == unformed.ucs(a, b, graph=informed.GRAPH)[1]
+        print(f"{len(pairs)} queries: table {lookup_ms:.2f} ms, ucs {ucs_ms:.2f} ms")
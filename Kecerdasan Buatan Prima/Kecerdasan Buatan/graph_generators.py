@@ -0,0 +1,269 @@
+"""
+Seeded synthetic graph generators for benchmarking.
+
+Every generator returns ``(graph, coords)``: a CSRGraph whose node names are
+the integer ids ``0..n-1`` and a list of ``(x, y)`` positions indexed by id
+(None for graphs without a geometry). Edge weights are integers, and for
+the geometric families every weight is at least the Euclidean length of the
+edge, so ``heuristic_table`` gives an admissible heuristic for any goal.
+"""
+
+import math
+import random
+from collections import deque
+
+from csr_graph import CSRGraph
+
+
+def _undirected(n, pairs):
+    """CSRGraph from undirected ``(u, v, w)`` pairs (each stored both ways)."""
+    def both_ways():
+        for u, v, w in pairs:
+            yield u, v, w
+            yield v, u, w
+    return CSRGraph.from_edges(range(n), both_ways())
+
+
+# -------------------------
+# 2D grid with obstacles
+# -------------------------
+def grid_graph(n, seed=0, obstacle_ratio=0.2):
+    """
+    4-connected unit-cost grid of about n cells with random blocked cells.
+
+    Args:
+    n (int): Approximate number of cells (the grid is square).
+    seed (int): Random seed.
+    obstacle_ratio (float): Probability that a cell is blocked.
+
+    Returns:
+    CSRGraph: Free cells as nodes.
+    list: (column, row) of each node.
+    """
+    rng = random.Random(seed)
+    side = max(2, math.isqrt(n))
+    cell_id = {}
+    coords = []
+    for r in range(side):
+        for c in range(side):
+            if rng.random() >= obstacle_ratio:
+                cell_id[(r, c)] = len(coords)
+                coords.append((c, r))
+
+    pairs = []
+    for (r, c), u in cell_id.items():
+        right = cell_id.get((r, c + 1))
+        if right is not None:
+            pairs.append((u, right, 1))
+        down = cell_id.get((r + 1, c))
+        if down is not None:
+            pairs.append((u, down, 1))
+    return _undirected(len(coords), pairs), coords
+
+
+# -------------------------
+# Random geometric graph
+# -------------------------
+def random_geometric_graph(n, seed=0, avg_degree=7):
+    """
+    Points uniform in a square, joined when closer than a radius.
+
+    Density is kept constant (100 x 100 units of area per point) and the
+    radius is chosen for the requested average degree. Weights are the
+    rounded-up Euclidean lengths.
+
+    Args:
+    n (int): Number of nodes.
+    seed (int): Random seed.
+    avg_degree (float): Expected number of neighbors per node.
+
+    Returns:
+    CSRGraph: The graph.
+    list: (x, y) of each node.
+    """
+    rng = random.Random(seed)
+    side = 100.0 * math.sqrt(n)
+    radius = 100.0 * math.sqrt(avg_degree / math.pi)
+    coords = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)]
+
+    # Bucket points into radius-sized cells so each point only checks the
+    # 3 x 3 block of cells around it.
+    buckets = {}
+    for i, (x, y) in enumerate(coords):
+        buckets.setdefault((int(x // radius), int(y // radius)), []).append(i)
+
+    pairs = []
+    r2 = radius * radius
+    for (cx, cy), members in buckets.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                others = buckets.get((cx + dx, cy + dy))
+                if not others:
+                    continue
+                for u in members:
+                    ux, uy = coords[u]
+                    for v in others:
+                        if v <= u:
+                            continue
+                        vx, vy = coords[v]
+                        d2 = (ux - vx) ** 2 + (uy - vy) ** 2
+                        if d2 <= r2:
+                            pairs.append((u, v, max(1, math.ceil(math.sqrt(d2)))))
+    return _undirected(n, pairs), coords
+
+
+# -------------------------
+# Scale-free graph (Barabasi-Albert)
+# -------------------------
+def scale_free_graph(n, seed=0, m=2, max_weight=10):
+    """
+    Preferential-attachment graph: each new node links to m existing nodes
+    chosen proportionally to their degree.
+
+    Args:
+    n (int): Number of nodes.
+    seed (int): Random seed.
+    m (int): Edges added per new node.
+    max_weight (int): Weights are uniform in 1..max_weight.
+
+    Returns:
+    CSRGraph: The graph.
+    None: Scale-free graphs have no geometry (use a zero heuristic).
+    """
+    rng = random.Random(seed)
+    m = max(1, min(m, n - 1))
+    # `ends` holds one entry per edge endpoint, so sampling from it is
+    # sampling proportionally to degree.
+    ends = list(range(m))
+    pairs = []
+    for u in range(m, n):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(rng.choice(ends) if ends else rng.randrange(u))
+        for v in chosen:
+            pairs.append((u, v, rng.randint(1, max_weight)))
+            ends.extend((u, v))
+    return _undirected(n, pairs), None
+
+
+# -------------------------
+# Road-like planar graph
+# -------------------------
+def road_like_graph(n, seed=0, removal_ratio=0.1, arterial_every=8):
+    """
+    Jittered lattice with some streets removed, one diagonal per block and
+    faster arterial roads.
+
+    The lattice plus at most one diagonal per cell keeps the graph planar.
+    Local streets cost twice their length, arterials (every
+    ``arterial_every``-th row and column) cost their length, so Euclidean
+    distance stays admissible.
+
+    Args:
+    n (int): Approximate number of nodes (the lattice is square).
+    seed (int): Random seed.
+    removal_ratio (float): Probability that a local street is removed.
+    arterial_every (int): Spacing of arterial rows / columns.
+
+    Returns:
+    CSRGraph: The graph.
+    list: (x, y) of each node.
+    """
+    rng = random.Random(seed)
+    side = max(2, math.isqrt(n))
+    spacing = 100.0
+    coords = [
+        (c * spacing + rng.uniform(-30, 30), r * spacing + rng.uniform(-30, 30))
+        for r in range(side) for c in range(side)
+    ]
+
+    def cost(u, v, arterial):
+        (ux, uy), (vx, vy) = coords[u], coords[v]
+        length = math.hypot(ux - vx, uy - vy)
+        return max(1, math.ceil(length if arterial else 2 * length))
+
+    pairs = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            if c + 1 < side:
+                arterial = r % arterial_every == 0
+                if arterial or rng.random() >= removal_ratio:
+                    pairs.append((u, u + 1, cost(u, u + 1, arterial)))
+            if r + 1 < side:
+                arterial = c % arterial_every == 0
+                if arterial or rng.random() >= removal_ratio:
+                    pairs.append((u, u + side, cost(u, u + side, arterial)))
+            if c + 1 < side and r + 1 < side and rng.random() < 0.3:
+                if rng.random() < 0.5:
+                    pairs.append((u, u + side + 1, cost(u, u + side + 1, False)))
+                else:
+                    pairs.append((u + 1, u + side, cost(u + 1, u + side, False)))
+    return _undirected(side * side, pairs), coords
+
+
+GENERATORS = {
+    "grid": grid_graph,
+    "geometric": random_geometric_graph,
+    "scale_free": scale_free_graph,
+    "road": road_like_graph,
+}
+
+
+# -------------------------
+# Queries and heuristics
+# -------------------------
+def pick_query(graph, seed=0):
+    """
+    Pick a (start, goal) pair where goal is reachable from start.
+
+    The goal is drawn from the nodes reached by a BFS from a random start,
+    restricted to the farther half of that BFS order so queries are not
+    trivially short.
+    """
+    rng = random.Random(seed)
+    start = rng.randrange(graph.num_nodes)
+    seen = bytearray(graph.num_nodes)
+    seen[start] = 1
+    order = [start]
+    queue = deque([start])
+    offsets, targets = graph.offsets, graph.targets
+    while queue:
+        u = queue.popleft()
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if not seen[v]:
+                seen[v] = 1
+                order.append(v)
+                queue.append(v)
+    goal = order[rng.randrange(len(order) // 2, len(order))] if len(order) > 1 else start
+    return graph.names[start], graph.names[goal]
+
+
+def heuristic_table(graph, coords, goal, metric="euclidean"):
+    """
+    ``{node: h}`` distances to goal, in the dict form the searches take.
+
+    Args:
+    graph (CSRGraph): Generated graph.
+    coords (list or None): Node positions; None gives an all-zero table.
+    goal: Goal node.
+    metric (str): "euclidean" or "manhattan" (use manhattan for grid_graph).
+
+    Returns:
+    dict: Heuristic value per node name.
+    """
+    if coords is None:
+        return {}
+    gx, gy = coords[graph.id_of(goal)]
+    if metric == "manhattan":
+        return {name: abs(x - gx) + abs(y - gy) for name, (x, y) in zip(graph.names, coords)}
+    return {name: math.hypot(x - gx, y - gy) for name, (x, y) in zip(graph.names, coords)}
+
+
+# Example usage
+if __name__ == "__main__":
+    for family, generate in GENERATORS.items():
+        graph, coords = generate(1000, seed=1)
+        start, goal = pick_query(graph, seed=1)
+        print(f"{family:10s} {graph}  query {start} -> {goal}")
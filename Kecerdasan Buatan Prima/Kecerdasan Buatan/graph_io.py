@@ -0,0 +1,570 @@
+"""
+Streaming graph ingest and a compact memory-mapped graph file.
+
+Text inputs are read line by line and packed into CSR arrays chunk by
+chunk, so neither the text nor a dict-of-dicts copy of the graph is ever
+held in memory:
+
+    graph = load_edge_list('roads.csv', node_type=int)   # u,v,w rows
+    graph = load_dimacs('USA-road-d.NY.gr')              # DIMACS 'a u v w'
+    coords = load_coordinates('USA-road-d.NY.co', graph)
+
+``save_graph`` writes the binary format below and ``open_graph`` maps it
+back in milliseconds as a MappedGraph, a CSRGraph that every search
+function takes unchanged:
+
+    save_graph(graph, 'ny.kbg', coords=coords)
+    graph = open_graph('ny.kbg')
+
+File layout (little endian, every section 8-byte aligned):
+
+    header    MAGIC, FORMAT_VERSION, flags, num_nodes, num_edges, then an
+              (offset, length) pair per section
+    names     range start (names are start..start+n-1), UTF-8 lines, or a
+              pickled list, as the names allow
+    offsets   int64 CSR row offsets, num_nodes + 1
+    targets   per edge, zigzag varint of the delta to the previous target
+              in edge order (or plain int32 with compress=False); rows keep
+              their edge order, so traversal order is unchanged
+    weights   int64 or float64 per edge
+    coords    optional float64 (x, y) per node
+    heuristic optional float64 value per node (e.g. distances to a depot)
+
+Offsets and weights are used in place through memoryviews over the map
+(copy-on-write, so set_weight works without touching the file).
+Compressed targets are decoded with a few vectorized NumPy passes on open
+(roughly half the bytes of int32 on road-like graphs); uncompressed ones
+are mapped as well, for the fastest possible open.
+"""
+
+import csv
+import itertools
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+MAGIC = b'KBGRAPH\n'
+# Bump when the layout changes; open_graph rejects other versions
+FORMAT_VERSION = 1
+
+SECTIONS = ('names', 'offsets', 'targets', 'weights', 'coords', 'heuristic')
+_HEADER = struct.Struct('<8sIIqq' + 'qq' * len(SECTIONS))
+
+# flags
+FLOAT_WEIGHTS = 1
+NAMES_RANGE = 2
+NAMES_TEXT = 4
+NAMES_PICKLE = 8
+VARINT_TARGETS = 16
+
+CHUNK_SIZE = 1 << 16
+
+
+# -------------------------
+# Streaming ingest
+# -------------------------
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def pack_edges(edges, names=None, directed=True, chunk_size=CHUNK_SIZE):
+    """
+    Build a CSRGraph from a stream of ``(u, v, weight)`` name triples.
+
+    Node ids are given in order of first appearance (after ``names``, if
+    given). Edges are collected chunk by chunk into flat arrays and sorted
+    into rows with NumPy at the end; edges of one row keep their input
+    order.
+
+    Args:
+    edges (iterable): ``(u, v, weight)`` triples, consumed lazily.
+    names (iterable): Optional node names to number first (e.g. isolated
+        nodes, or 1..n for DIMACS).
+    directed (bool): False stores every edge in both directions.
+    chunk_size (int): Edges converted per step.
+
+    Returns:
+    CSRGraph: The packed graph.
+    """
+    index = {}
+    node_names = []
+    for name in names or ():
+        if name not in index:
+            index[name] = len(node_names)
+            node_names.append(name)
+
+    sources, targets = array('i'), array('i')
+    weights = array('q')
+    edges = iter(edges)
+    while True:
+        chunk = list(itertools.islice(edges, chunk_size))
+        if not chunk:
+            break
+        for u, v, w in chunk:
+            uid = index.get(u)
+            if uid is None:
+                uid = index[u] = len(node_names)
+                node_names.append(u)
+            vid = index.get(v)
+            if vid is None:
+                vid = index[v] = len(node_names)
+                node_names.append(v)
+            if weights.typecode == 'q' and not isinstance(w, int):
+                weights = array('d', weights)
+            sources.append(uid)
+            targets.append(vid)
+            weights.append(w)
+            if not directed:
+                sources.append(vid)
+                targets.append(uid)
+                weights.append(w)
+    return _pack(node_names, np.frombuffer(sources, dtype=np.int32),
+                 np.frombuffer(targets, dtype=np.int32), weights)
+
+
+def _pack(names, sources, targets, weights):
+    """CSRGraph from parallel id arrays (stable sort by source)."""
+    n = len(names)
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    dtype = np.int64 if weights.typecode == 'q' else np.float64
+    return CSRGraph(names, _to_array('q', offsets), _to_array('i', targets[order]),
+                    _to_array(weights.typecode, np.frombuffer(weights, dtype=dtype)[order]))
+
+
+def _to_array(typecode, values):
+    packed = array(typecode)
+    packed.frombytes(np.ascontiguousarray(values).tobytes())
+    return packed
+
+
+def iter_edge_list(path, delimiter=None, node_type=str, skip_header=False, comment='#'):
+    """
+    Stream ``(u, v, weight)`` rows of a CSV / TSV / whitespace edge list.
+
+    Args:
+    path (str): File path.
+    delimiter (str): Column separator; by default ',' for .csv, tab for
+        .tsv and runs of whitespace otherwise.
+    node_type (callable): Converts node fields (e.g. int).
+    skip_header (bool): Skip the first non-comment row.
+    comment (str): Lines starting with this are ignored.
+
+    Yields:
+    tuple: ``(u, v, weight)``; weight is 1 when the row has two columns.
+    """
+    if delimiter is None:
+        delimiter = {'.csv': ',', '.tsv': '\t'}.get(os.path.splitext(path)[1].lower())
+    with open(path, newline='', encoding='utf-8') as fh:
+        lines = (line for line in fh if line.strip() and not line.startswith(comment))
+        rows = csv.reader(lines, delimiter=delimiter) if delimiter else (line.split() for line in lines)
+        if skip_header:
+            next(rows, None)
+        for row in rows:
+            if len(row) < 2:
+                raise ValueError(f"{path}: expected 'u v [w]' rows, got {row!r}")
+            weight = _number(row[2]) if len(row) > 2 and row[2].strip() else 1
+            yield node_type(row[0].strip()), node_type(row[1].strip()), weight
+
+
+def load_edge_list(path, delimiter=None, node_type=str, skip_header=False, directed=True,
+                   chunk_size=CHUNK_SIZE):
+    """
+    Load a CSV / TSV / whitespace edge list into a CSRGraph (see
+    iter_edge_list and pack_edges for the arguments).
+    """
+    rows = iter_edge_list(path, delimiter, node_type, skip_header)
+    return pack_edges(rows, directed=directed, chunk_size=chunk_size)
+
+
+def load_dimacs(path, chunk_size=CHUNK_SIZE):
+    """
+    Load a DIMACS shortest-path graph (``p sp n m`` and ``a u v w`` lines).
+
+    Nodes are named by their DIMACS numbers 1..n.
+
+    Returns:
+    CSRGraph: The packed graph (arcs as listed, i.e. directed).
+    """
+    with open(path, encoding='ascii') as fh:
+        num_nodes = None
+        for line in fh:
+            if line.startswith('p'):
+                num_nodes = int(line.split()[2])
+                break
+            if line.startswith('a'):
+                break
+        if num_nodes is None:
+            raise ValueError(f"{path}: no 'p sp n m' line before the arcs")
+
+        def triples():
+            for line in fh:
+                if line.startswith('a'):
+                    _, u, v, w = line.split()
+                    yield int(u), int(v), _number(w)
+        return pack_edges(triples(), names=range(1, num_nodes + 1), chunk_size=chunk_size)
+
+
+def load_coordinates(path, graph, delimiter=None, node_type=None):
+    """
+    Node positions from a DIMACS ``.co`` file (``v id x y``) or a CSV / TSV
+    / whitespace file of ``name x y`` rows.
+
+    Args:
+    path (str): File path.
+    graph (CSRGraph): Graph whose ids the positions are ordered by.
+    delimiter (str): As for iter_edge_list (ignored for .co files).
+    node_type (callable): Converts name fields; defaults to the type of
+        the graph's first node name.
+
+    Returns:
+    ndarray: float64 (num_nodes, 2), NaN for nodes without a position;
+    positions of nodes the graph does not have are ignored.
+    """
+    if node_type is None:
+        node_type = type(graph.names[0]) if graph.num_nodes else str
+    coords = np.full((graph.num_nodes, 2), np.nan)
+    index = graph.index
+    if path.endswith('.co'):
+        with open(path, encoding='ascii') as fh:
+            for line in fh:
+                if line.startswith('v'):
+                    _, name, x, y = line.split()
+                    i = index.get(node_type(name))
+                    if i is not None:
+                        coords[i] = float(x), float(y)
+        return coords
+    if delimiter is None:
+        delimiter = {'.csv': ',', '.tsv': '\t'}.get(os.path.splitext(path)[1].lower())
+    with open(path, newline='', encoding='utf-8') as fh:
+        lines = (line for line in fh if line.strip() and not line.startswith('#'))
+        rows = csv.reader(lines, delimiter=delimiter) if delimiter else (line.split() for line in lines)
+        for row in rows:
+            i = index.get(node_type(row[0].strip()))
+            if i is not None:
+                coords[i] = float(row[1]), float(row[2])
+    return coords
+
+
+def load_graph(path, **kwargs):
+    """Open or load a graph by extension: .kbg (binary), .gr (DIMACS), else an edge list."""
+    if path.endswith('.kbg'):
+        return open_graph(path)
+    if path.endswith('.gr'):
+        return load_dimacs(path, **kwargs)
+    return load_edge_list(path, **kwargs)
+
+
+# -------------------------
+# Target compression
+# -------------------------
+def encode_targets(targets):
+    """
+    Zigzag varint bytes of the target deltas (each target minus the one
+    before it in edge order, the first minus 0). Rows list their neighbors
+    close together on road-like graphs, so most deltas fit in one byte.
+
+    Args:
+    targets (ndarray): Successor ids in CSR order.
+
+    Returns:
+    ndarray: uint8 encoded bytes.
+    """
+    targets = np.asarray(targets, dtype=np.int64)
+    deltas = np.diff(targets, prepend=0)
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+
+    lengths = np.ones(len(zigzag), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += zigzag >= np.uint64(1 << (7 * k))
+    positions = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max(initial=0))):
+        sel = lengths > k
+        byte = (zigzag[sel] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[sel] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[positions[sel] + k] = byte | more
+    return out
+
+
+def decode_targets(data):
+    """
+    Inverse of encode_targets.
+
+    Args:
+    data (buffer): Encoded bytes.
+
+    Returns:
+    ndarray: int32 successor ids.
+    """
+    data = np.frombuffer(data, dtype=np.uint8)
+    last = data < 0x80
+    ends = np.flatnonzero(last)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    # The final byte of each varint carries the top bits; the few
+    # continuation bytes are added to their own varint afterwards.
+    zigzag = (data[ends] & 0x7F).astype(np.int64) << (7 * (ends - starts))
+    continued = np.flatnonzero(~last)
+    if len(continued):
+        group = np.cumsum(last)[continued]  # varints finished before each byte
+        np.add.at(zigzag, group,
+                  (data[continued] & 0x7F).astype(np.int64) << (7 * (continued - starts[group])))
+    deltas = (zigzag >> 1) ^ -(zigzag & 1)
+    return np.cumsum(deltas).astype(np.int32)
+
+
+# -------------------------
+# Binary format
+# -------------------------
+def save_graph(graph, path, coords=None, heuristic=None, compress=True):
+    """
+    Write a graph in the binary format (atomically, via a temporary file).
+
+    Args:
+    graph (dict or CSRGraph): Graph in any supported format.
+    path (str): Output file, conventionally ``*.kbg``.
+    coords (sequence): Optional (x, y) per node id.
+    heuristic (dict): Optional ``{node: value}`` (or an object with
+        ``by_id``) stored as a per-node table.
+    compress (bool): Varint-code the targets (smaller file, open decodes
+        them) or store plain int32 (mapped without a copy).
+    """
+    graph = CSRGraph.from_dict(graph)
+    n = graph.num_nodes
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    float_weights = graph.weight_typecode != 'q'
+    flags = FLOAT_WEIGHTS if float_weights else 0
+    targets = np.frombuffer(graph.targets, dtype=np.int32)
+    if compress:
+        flags |= VARINT_TARGETS
+
+    names = graph.names
+    first = names[0] if n else 0
+    if all(type(name) is int for name in names) and names == list(range(first, first + n)):
+        flags |= NAMES_RANGE
+        name_bytes = struct.pack('<q', first)
+    elif all(isinstance(name, str) and '\n' not in name for name in names):
+        flags |= NAMES_TEXT
+        name_bytes = '\n'.join(names).encode('utf-8')
+    else:
+        flags |= NAMES_PICKLE
+        name_bytes = pickle.dumps(list(names), pickle.HIGHEST_PROTOCOL)
+
+    sections = {
+        'names': name_bytes,
+        'offsets': offsets.tobytes(),
+        'targets': (encode_targets(targets) if compress else targets).tobytes(),
+        'weights': np.asarray(graph.weights, dtype=np.float64 if float_weights else np.int64).tobytes(),
+        'coords': b'' if coords is None else np.asarray(coords, dtype=np.float64).reshape(n, 2).tobytes(),
+        'heuristic': b'' if heuristic is None else np.asarray(graph.node_values(heuristic),
+                                                             dtype=np.float64).tobytes(),
+    }
+
+    table = []
+    position = _HEADER.size
+    for name in SECTIONS:
+        position += -position % 8
+        table += [position, len(sections[name])]
+        position += len(sections[name])
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, n, graph.num_edges, *table))
+        for name in SECTIONS:
+            fh.write(b'\0' * (-fh.tell() % 8))
+            fh.write(sections[name])
+    os.replace(tmp, path)
+
+
+class MappedGraph(CSRGraph):
+    """
+    CSRGraph over a memory-mapped graph file (see open_graph).
+
+    The map is copy-on-write: set_weight changes stay in this process.
+
+    Attributes (besides CSRGraph's):
+    path (str): The file.
+    coords (ndarray or None): (num_nodes, 2) positions, if stored.
+    heuristic (NodeTable or None): Stored per-node table, if any.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path}: not a graph file")
+        magic, version, flags, n, m, *table = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a graph file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+        view = memoryview(self._map)
+        section = {name: view[table[2 * i]:table[2 * i] + table[2 * i + 1]]
+                   for i, name in enumerate(SECTIONS)}
+
+        self.path = path
+        if flags & NAMES_RANGE:
+            first = struct.unpack('<q', section['names'])[0]
+            self.names = list(range(first, first + n))
+            self._first = first
+        else:
+            if flags & NAMES_TEXT:
+                self.names = bytes(section['names']).decode('utf-8').split('\n') if n else []
+            else:
+                self.names = pickle.loads(section['names'])
+            self._first = None
+        self.offsets = section['offsets'].cast('q')
+        if flags & VARINT_TARGETS:
+            self._targets = decode_targets(section['targets'])
+            self.targets = memoryview(self._targets)
+        else:
+            self.targets = section['targets'].cast('i')
+        self.weights = section['weights'].cast('d' if flags & FLOAT_WEIGHTS else 'q')
+        self.version = 0
+        self.coords = (np.frombuffer(section['coords'], dtype=np.float64).reshape(n, 2)
+                       if len(section['coords']) else None)
+        self.heuristic = (NodeTable(self, np.frombuffer(section['heuristic'], dtype=np.float64))
+                          if len(section['heuristic']) else None)
+
+    @property
+    def index(self):
+        """Node name -> id, built on first use (O(1) arithmetic for range names)."""
+        index = self.__dict__.get('_index')
+        if index is None:
+            if self._first is not None:
+                index = _RangeIndex(self._first, len(self.names))
+            else:
+                index = {name: i for i, name in enumerate(self.names)}
+            self._index = index
+        return index
+
+    def __repr__(self):
+        return f"MappedGraph({self.path!r}, num_nodes={self.num_nodes}, num_edges={self.num_edges})"
+
+
+class _RangeIndex(Mapping):
+    """``{first + i: i}`` without storing it."""
+
+    def __init__(self, first, n):
+        self.first = first
+        self.n = n
+
+    def __getitem__(self, name):
+        if type(name) is int and 0 <= name - self.first < self.n:
+            return name - self.first
+        raise KeyError(name)
+
+    def __iter__(self):
+        return iter(range(self.first, self.first + self.n))
+
+    def __len__(self):
+        return self.n
+
+
+class NodeTable:
+    """
+    Stored per-node values, read like a ``{node: h}`` dict.
+
+    Args:
+    graph (CSRGraph): Graph the values belong to.
+    values (ndarray): Value per node id.
+    """
+
+    def __init__(self, graph, values):
+        self.graph = graph
+        self.values = values.tolist()
+
+    def __getitem__(self, node):
+        return self.values[self.graph.index[node]]
+
+    def get(self, node, default=0):
+        i = self.graph.index.get(node)
+        return default if i is None else self.values[i]
+
+    def by_id(self, graph):
+        """Per-id list for a search running on ``graph`` (see CSRGraph.node_values)."""
+        if graph is not self.graph and list(graph.names) != list(self.graph.names):
+            return graph.node_values(dict(zip(self.graph.names, self.values)))
+        return self.values
+
+
+def open_graph(path):
+    """
+    Map a graph file written by save_graph.
+
+    Raises:
+    ValueError: If the file is not a graph file of FORMAT_VERSION.
+    """
+    return MappedGraph(path)
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    if len(sys.argv) >= 3:
+        # python graph_io.py <edges.csv|.tsv|.gr> <out.kbg> [coords.co|.csv]
+        t0 = time.perf_counter()
+        graph = load_graph(sys.argv[1])
+        coords = load_coordinates(sys.argv[3], graph) if len(sys.argv) > 3 else None
+        save_graph(graph, sys.argv[2], coords=coords)
+        print(f"{graph} -> {sys.argv[2]} in {time.perf_counter() - t0:.2f} s")
+        sys.exit(0)
+
+    from graph_generators import heuristic_table, pick_query, road_like_graph
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    graph, coords = road_like_graph(250000, seed=0)
+    print(f"Source graph: {graph}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'roads.csv')
+        with open(text_path, 'w', encoding='utf-8') as fh:
+            fh.write('u,v,w\n')
+            for u in range(graph.num_nodes):
+                for v, w in graph.edges(u):
+                    fh.write(f"{u},{v},{w}\n")
+        with open(os.path.join(directory, 'roads.co'), 'w', encoding='ascii') as fh:
+            for v, (x, y) in enumerate(coords):
+                fh.write(f"v {v} {x!r} {y!r}\n")
+
+        t0 = time.perf_counter()
+        loaded = load_edge_list(text_path, node_type=int, skip_header=True)
+        loaded_coords = load_coordinates(os.path.join(directory, 'roads.co'), loaded)
+        ingest_s = time.perf_counter() - t0
+
+        print(f"CSV ingest: {os.path.getsize(text_path) / 1e6:6.1f} MB in {ingest_s:6.2f} s")
+        for compress in (False, True):
+            binary_path = os.path.join(directory, f'roads-{compress}.kbg')
+            save_graph(loaded, binary_path, coords=loaded_coords, compress=compress)
+            t0 = time.perf_counter()
+            mapped = open_graph(binary_path)
+            open_ms = (time.perf_counter() - t0) * 1000
+            label = "varint targets" if compress else "int32 targets "
+            print(f"Binary, {label}: {os.path.getsize(binary_path) / 1e6:6.1f} MB "
+                  f"(coords included), opened in {open_ms:6.1f} ms")
+        print(f"  {mapped}")
+
+        for q in range(5):
+            start, goal = pick_query(mapped, seed=q)
+            h = heuristic_table(mapped, mapped.coords, goal)
+            cost = informed.a_star(mapped, h, start, goal)[1]
+            assert cost == informed.a_star(graph, heuristic_table(graph, coords, goal), start, goal)[1]
+            print(f"  a_star {start} -> {goal} on the mapped graph: cost {cost}")
+        del mapped
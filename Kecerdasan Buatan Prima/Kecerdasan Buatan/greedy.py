@@ -1,6 +1,8 @@
 import heapq
 
-def greedy_search(graph, heuristics, start, goal):
+from search_trace import POP, SKIP, ENQUEUE, GOAL, EXHAUSTED
+
+def greedy_search(graph, heuristics, start, goal, tracer=None):
     """
     Greedy Search implementation with simulation.
 
@@ -9,6 +11,8 @@ def greedy_search(graph, heuristics, start, goal):
     heuristics (dict): Heuristic values for each node.
     start: Starting node.
     goal: Goal node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list or None: Path from start to goal if found, else None.
@@ -20,36 +24,37 @@ def greedy_search(graph, heuristics, start, goal):
     visited = set()
     parent = {start: None}
 
-    print(f"Starting Greedy Search from {start} to {goal}")
-    print(f"Heuristics: {heuristics}")
-    print(f"Initial priority queue: {priority_queue}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("greedy", start=start, goal=goal, heuristics=heuristics)
+        emit = tracer.emit
 
     while priority_queue:
         current_heuristic, current = heapq.heappop(priority_queue)
-        print(f"Popped: {current} (heuristic: {current_heuristic})")
 
         if current in visited:
-            print(f"Already visited {current}, skipping")
+            if emit:
+                emit(SKIP, current, current_heuristic)
             continue
 
         visited.add(current)
-        print(f"Visiting: {current}")
+        if emit:
+            emit(POP, current, current_heuristic)
 
         if current == goal:
-            print(f"Goal {goal} reached!")
+            if emit:
+                emit(GOAL, current)
             return reconstruct_path(parent, goal)
 
         for neighbor in graph.get(current, []):
             if neighbor not in visited:
                 heapq.heappush(priority_queue, (heuristics[neighbor], neighbor))
                 parent[neighbor] = current
-                print(f"Pushed neighbor: {neighbor} (heuristic: {heuristics[neighbor]})")
+                if emit:
+                    emit(ENQUEUE, neighbor, heuristics[neighbor])
 
-        print(f"Priority queue now: {priority_queue}")
-        print("---")
-
-    print("No path found")
+    if emit:
+        emit(EXHAUSTED)
     return None
 
 def reconstruct_path(parent, goal):
@@ -63,6 +68,10 @@ def reconstruct_path(parent, goal):
 
 # Example usage
 if __name__ == "__main__":
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B, C; B -> D; C -> E; D -> E
     graph = {
         'A': ['B', 'C'],
@@ -72,21 +81,25 @@ if __name__ == "__main__":
         'E': []
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
         print(f"{node}: {neighbors}")
     print()
 
-    path = greedy_search(graph, heuristics, 'A', 'E')
+    tracer = SearchTracer()
+    path = greedy_search(graph, heuristics, 'A', 'E', tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
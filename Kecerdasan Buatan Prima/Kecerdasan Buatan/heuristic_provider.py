@@ -0,0 +1,232 @@
+"""
+Heuristics computed from node coordinates, for any goal.
+
+    provider = CoordinateHeuristics(GRAPH, COORDS)
+    a_star(GRAPH, provider.heuristic('Craiova'), 'Arad', 'Craiova')
+
+Given a position per node, the distance from every node to a goal is one
+vectorized NumPy expression over the whole coordinate array, so a table
+for a new goal costs a few milliseconds even on a million nodes instead of
+a Python loop per node. Tables are kept per goal in an LRU cache of
+``cache_size`` entries; repeated goals (a depot, a popular destination)
+are answered without recomputing.
+
+A table reads like the ``H`` dict of Informed-Search.py (``h[node]``,
+``h.get(node, 0)``) and has ``by_id(graph)`` for the CSR fast path, so it
+goes wherever a heuristic dict or a landmarks.LandmarkHeuristic does.
+
+Metrics:
+- euclidean: straight-line distance between planar (x, y) positions;
+- manhattan: |dx| + |dy|, exact for 4-connected unit grids;
+- octile: max(|dx|, |dy|) + (sqrt(2) - 1) * min(|dx|, |dy|), exact for
+  8-connected grids with diagonal cost sqrt(2);
+- haversine: great-circle distance between (lat, lon) positions in
+  degrees, in the unit of ``radius`` (kilometres by default).
+
+``scale`` multiplies every distance, e.g. 1 / max_speed to turn distances
+into lower bounds on travel time. The result is admissible as long as no
+edge is cheaper than ``scale`` times the distance between its ends, and
+then consistent as well. Nodes without a position (missing from a coords
+dict, or NaN as in graph_io.load_coordinates) get 0.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+METRICS = ('euclidean', 'manhattan', 'octile', 'haversine')
+EARTH_RADIUS_KM = 6371.0088
+
+
+class CoordinateHeuristics:
+    """
+    Per-goal distance tables from node positions, LRU cached.
+
+    Args:
+    graph (dict or CSRGraph): Graph the positions belong to; only used for
+        its node names, and may be None when coords is a dict.
+    coords (dict, sequence or ndarray): ``{node: (x, y)}``, or positions
+        ordered by node id of a CSRGraph (e.g. from graph_generators or
+        graph_io). (lat, lon) in degrees for the haversine metric.
+    metric (str): One of METRICS.
+    scale (int or float): Factor applied to every distance.
+    cache_size (int): Goals whose tables are kept.
+    radius (float): Sphere radius for haversine.
+    """
+
+    def __init__(self, graph, coords, metric='euclidean', scale=1, cache_size=32,
+                 radius=EARTH_RADIUS_KM):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        self.metric = metric
+        self.scale = scale
+        self.cache_size = cache_size
+        self.radius = radius
+        self.tables = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        if graph is not None and hasattr(graph, 'names'):
+            self.names, self.index = graph.names, graph.index
+            if isinstance(coords, Mapping):
+                coords = [coords.get(name, (np.nan, np.nan)) for name in self.names]
+        elif isinstance(coords, Mapping):
+            self.names = list(coords)
+            if graph is not None:
+                self.names += [node for node in graph if node not in coords]
+            self.index = {name: i for i, name in enumerate(self.names)}
+            coords = [coords.get(name, (np.nan, np.nan)) for name in self.names]
+        else:
+            raise ValueError("Positions ordered by id need a CSRGraph; pass a {node: (x, y)} dict otherwise")
+
+        self.xy = np.asarray(coords)
+        if self.xy.dtype.kind not in 'iu':
+            self.xy = self.xy.astype(np.float64)
+        if metric == 'haversine':
+            # Kept in radians, with the cosine of the latitude precomputed
+            self.lat = np.radians(self.xy[:, 0])
+            self.lon = np.radians(self.xy[:, 1])
+            self.cos_lat = np.cos(self.lat)
+
+    def heuristic(self, goal):
+        """Distances to goal as a GoalHeuristic (cached)."""
+        table = self.tables.get(goal)
+        if table is not None:
+            self.tables.move_to_end(goal)
+            self.stats['hits'] += 1
+            return table
+        self.stats['misses'] += 1
+        table = GoalHeuristic(self, goal, self.distances(goal))
+        self.tables[goal] = table
+        if len(self.tables) > self.cache_size:
+            self.tables.popitem(last=False)
+            self.stats['evictions'] += 1
+        return table
+
+    def distances(self, goal, nodes=None):
+        """
+        Distances to goal as an ndarray (uncached).
+
+        Args:
+        goal: Goal node.
+        nodes (ndarray): Node ids to compute, default all of them.
+        """
+        g = self.index[goal]
+        rows = slice(None) if nodes is None else nodes
+        if self.metric == 'haversine':
+            lat, lon = self.lat[rows], self.lon[rows]
+            a = (np.sin((lat - self.lat[g]) / 2) ** 2
+                 + self.cos_lat[rows] * self.cos_lat[g] * np.sin((lon - self.lon[g]) / 2) ** 2)
+            d = (2 * self.radius) * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        else:
+            delta = np.abs(self.xy[rows] - self.xy[g])
+            dx, dy = delta[..., 0], delta[..., 1]
+            if self.metric == 'manhattan':
+                d = dx + dy
+            elif self.metric == 'octile':
+                d = np.maximum(dx, dy) + (np.sqrt(2) - 1) * np.minimum(dx, dy)
+            else:
+                d = np.hypot(dx, dy)
+        if self.scale != 1:
+            d = d * self.scale
+        if d.dtype.kind == 'f':
+            d = np.nan_to_num(d, nan=0.0)
+        return d
+
+    def distance(self, a, b):
+        """Heuristic distance between two nodes (the ``heuristic(a, b)`` D* Lite takes)."""
+        return self.distances(b, np.array([self.index[a]])).item()
+
+    def clear(self):
+        self.tables.clear()
+
+    def __len__(self):
+        return len(self.tables)
+
+    def __repr__(self):
+        return (f"CoordinateHeuristics(nodes={len(self.names)}, metric={self.metric!r}, "
+                f"cached={len(self.tables)}/{self.cache_size}, stats={self.stats})")
+
+
+class GoalHeuristic:
+    """
+    Distances to one goal, read like a ``{node: h}`` dict.
+
+    Args:
+    provider (CoordinateHeuristics): Provider the table came from.
+    goal: Goal node.
+    values (ndarray): Distance per node id.
+    """
+
+    def __init__(self, provider, goal, values):
+        self.names = provider.names
+        self.index = provider.index
+        self.goal = goal
+        self.values = values.tolist()
+
+    def __getitem__(self, node):
+        return self.values[self.index[node]]
+
+    def get(self, node, default=0):
+        i = self.index.get(node)
+        return default if i is None else self.values[i]
+
+    def by_id(self, graph):
+        """Per-id list for a search running on ``graph`` (see CSRGraph.node_values)."""
+        if graph.names is not self.names and list(graph.names) != list(self.names):
+            return graph.node_values(dict(zip(self.names, self.values)))
+        return self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        # Small tables print like the dict they stand in for (e.g. in traces)
+        if len(self.values) <= 32:
+            return repr(dict(zip(self.names, self.values)))
+        return f"GoalHeuristic(goal={self.goal!r}, nodes={len(self.values)})"
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from graph_generators import grid_graph, heuristic_table, pick_query, road_like_graph
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+
+    provider = CoordinateHeuristics(informed.GRAPH, informed.COORDS)
+    print(provider)
+    for goal in ("Bucharest", "Craiova", "Neamt"):
+        h = provider.heuristic(goal)
+        path, cost, expanded, _ = informed.a_star(informed.GRAPH, h, "Arad", goal)
+        _, _, blind, _ = informed.a_star(informed.GRAPH, {}, "Arad", goal)
+        print(f"  Arad -> {goal}: cost {cost}, expanded {expanded} (h = 0: {blind}), h(Arad) = {h['Arad']:.0f}")
+    print()
+
+    for name, generate, metric in (("road", road_like_graph, "euclidean"),
+                                   ("grid", grid_graph, "manhattan")):
+        graph, coords = generate(200000, seed=0)
+        start, goal = pick_query(graph, seed=0)
+        provider = CoordinateHeuristics(graph, coords, metric=metric)
+
+        t0 = time.perf_counter()
+        table = heuristic_table(graph, coords, goal, metric)
+        dict_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        h = provider.heuristic(goal)
+        vector_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        provider.heuristic(goal)
+        cached_ms = (time.perf_counter() - t0) * 1000
+        assert all(abs(h[node] - value) < 1e-9 for node, value in table.items())
+
+        _, cost, expanded, ms = informed.a_star(graph, h, start, goal)
+        _, dict_cost, _, dict_search_ms = informed.a_star(graph, table, start, goal)
+        assert cost == dict_cost
+        print(f"{name} {graph} ({metric}), {start} -> {goal}")
+        print(f"  per-node dict table: {dict_ms:7.2f} ms, a_star {dict_search_ms:7.2f} ms")
+        print(f"  vectorized table:    {vector_ms:7.2f} ms, a_star {ms:7.2f} ms "
+              f"(cost {cost}, expanded {expanded})")
+        print(f"  cached table:        {cached_ms:7.3f} ms")
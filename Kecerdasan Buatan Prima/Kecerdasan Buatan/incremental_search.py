@@ -0,0 +1,410 @@
+"""
+Incremental replanning with LPA* and D* Lite (Koenig & Likhachev).
+
+Both keep their g / rhs values and the open list between calls. After a
+few edge costs change, ``replan()`` repairs only the nodes whose distance
+actually changed instead of searching from scratch:
+
+    search = LPAStar(GRAPH, 'Arad', 'Bucharest', H)
+    path, cost, expanded = search.replan()
+    search.update_edge('Pitesti', 'Bucharest', float('inf'))   # road closed
+    path, cost, expanded = search.replan()
+
+g(s) is the distance the search last committed to, rhs(s) the one-step
+lookahead ``min over predecessors p of g(p) + c(p, s)``. Nodes where the
+two differ are locally inconsistent and sit on the open list, keyed by
+``(min(g, rhs) + h(s), min(g, rhs))``.
+
+DStarLite runs the same engine backwards from the goal, so the g values
+stay valid while the start moves: an agent calls ``move_to(node)`` as it
+drives, reports changed edges with ``update_edge`` and calls ``replan()``.
+The key modifier km keeps old open-list keys valid after a move (keys are
+lower bounds and are lazily raised when popped).
+
+The engines work on their own copy of the graph (dict-of-dicts
+``{u: {v: w}}``, adjacency lists of ``(v, w)``, or CSRGraph); changes go
+through ``update_edge``. A weight of inf (or None) removes the edge and a
+new (u, v) pair adds one. The heuristics must stay consistent for the
+changed costs: a lower bound computed on the original weights (e.g.
+straight-line distances or landmarks) stays valid as long as weights only
+grow.
+
+Edge weights must be strictly positive: with zero-cost edges a node's key
+can tie the target's and stop the search early with a wrong cost, and
+the predecessor walk can circle a zero-cost cycle. ``__init__`` and
+``update_edge`` raise ValueError for weights <= 0.
+"""
+
+import heapq
+
+from csr_graph import CSRGraph
+
+
+def _check_weight(u, v, w):
+    if not w > 0:
+        raise ValueError(f"edge {u!r} -> {v!r} has weight {w!r}; LPA* / D* Lite need weights > 0")
+
+
+class LPAStar:
+    """
+    Lifelong Planning A*: repeated start -> goal searches on a changing graph.
+
+    Args:
+    graph (dict or CSRGraph): Weighted graph, copied.
+    start: Start node.
+    goal: Goal node.
+    h (dict): Consistent heuristic to goal, ``h.get(node, 0)`` like ``H``
+        or a landmarks heuristic; zero when None.
+    """
+
+    def __init__(self, graph, start, goal, h=None):
+        if isinstance(graph, CSRGraph):
+            self._id = graph.id_of
+            self._name = graph.names.__getitem__
+            rows = ((u, graph.edges(u)) for u in range(graph.num_nodes))
+        else:
+            self._id = self._name = lambda node: node
+            rows = ((u, row.items() if isinstance(row, dict) else row) for u, row in graph.items())
+        self.succ, self.pred = {}, {}
+        for u, row in rows:
+            self.succ.setdefault(u, {})
+            for v, w in row:
+                _check_weight(self._name(u), self._name(v), w)
+                self.succ[u][v] = w
+                self.pred.setdefault(v, {})[u] = w
+        self.start, self.goal = self._id(start), self._id(goal)
+        self.g, self.rhs = {}, {}
+        self.heap = []
+        self.open = {}  # node -> current key (entries in heap with another key are stale)
+        self.km = 0
+        self.stats = {'expanded': 0, 'replans': 0, 'edge_updates': 0}
+        self._bind_heuristic(h)
+        self.rhs[self.source] = 0
+        self._update_vertex(self.source)
+
+    # Search orientation: g grows from source, the searched path ends at target
+    @property
+    def source(self):
+        return self.start
+
+    @property
+    def target(self):
+        return self.goal
+
+    def _bind_heuristic(self, h):
+        if h is None:
+            self.h = lambda node: 0
+        else:
+            name = self._name
+            self.h = lambda node: h.get(name(node), 0)
+
+    def _search_edge(self, u, v):
+        """Graph edge u -> v as a search-direction edge."""
+        return u, v
+
+    def _out(self, node):
+        """Search-direction successors ``{s: c}`` of node."""
+        return self.succ.get(node, {})
+
+    def _in(self, node):
+        """Search-direction predecessors ``{p: c}`` of node."""
+        return self.pred.get(node, {})
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def update_edge(self, u, v, new_weight):
+        """
+        Set the cost of edge ``u -> v`` (node names); inf or None removes it.
+        Raises ValueError for a weight <= 0.
+
+        Only one rhs value is repaired here; the change propagates on
+        replan().
+        """
+        u, v = self._id(u), self._id(v)
+        if new_weight is None:
+            new_weight = float('inf')
+        _check_weight(self._name(u), self._name(v), new_weight)
+        self.stats['edge_updates'] += 1
+        old_weight = self.succ.get(u, {}).get(v, float('inf'))
+        if new_weight == float('inf'):
+            self.succ.get(u, {}).pop(v, None)
+            self.pred.get(v, {}).pop(u, None)
+        else:
+            self.succ.setdefault(u, {})[v] = new_weight
+            self.pred.setdefault(v, {})[u] = new_weight
+        a, b = self._search_edge(u, v)
+        if b == self.source:
+            return
+        inf = float('inf')
+        if new_weight < old_weight:
+            via = self.g.get(a, inf) + new_weight
+            if via < self.rhs.get(b, inf):
+                self.rhs[b] = via
+        elif self.rhs.get(b, inf) == self.g.get(a, inf) + old_weight:
+            self.rhs[b] = self._lookahead(b)
+        self._update_vertex(b)
+
+    def replan(self):
+        """
+        Bring the shortest path up to date.
+
+        Returns:
+        list or None: Path from start to goal, None when unreachable.
+        int or float: Path cost (inf when unreachable).
+        int: Nodes expanded by this call.
+        """
+        before = self.stats['expanded']
+        self._compute_shortest_path()
+        self.stats['replans'] += 1
+        cost = self.g.get(self.target, float('inf'))
+        path = None if cost == float('inf') else self._extract_path()
+        return path, cost, self.stats['expanded'] - before
+
+    def distance(self, node):
+        """Committed g of a node (distance from start; to goal for DStarLite)."""
+        return self.g.get(self._id(node), float('inf'))
+
+    # -------------------------
+    # Engine
+    # -------------------------
+    def _key(self, node):
+        inf = float('inf')
+        m = min(self.g.get(node, inf), self.rhs.get(node, inf))
+        return (m + self.h(node) + self.km, m)
+
+    def _lookahead(self, node):
+        """min over search-direction predecessors p of g(p) + c(p, node)."""
+        g, inf = self.g, float('inf')
+        return min((g.get(p, inf) + c for p, c in self._in(node).items()), default=inf)
+
+    def _update_vertex(self, node):
+        inf = float('inf')
+        if self.g.get(node, inf) != self.rhs.get(node, inf):
+            key = self._key(node)
+            if self.open.get(node) != key:
+                self.open[node] = key
+                heapq.heappush(self.heap, (key[0], key[1], node))
+        else:
+            self.open.pop(node, None)
+
+    def _top(self):
+        """Smallest valid open entry ``(k1, k2, node)``, dropping stale ones; None when empty."""
+        heap, open_keys = self.heap, self.open
+        while heap:
+            k1, k2, node = heap[0]
+            if open_keys.get(node) == (k1, k2):
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _compute_shortest_path(self):
+        inf = float('inf')
+        g, rhs, target = self.g, self.rhs, self.target
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            k_old = top[:2]
+            if k_old >= self._key(target) and rhs.get(target, inf) == g.get(target, inf):
+                break
+            node = top[2]
+            k_new = self._key(node)
+            if k_old < k_new:
+                # Key from before a start move (D* Lite): reinsert with the current one
+                self.open[node] = k_new
+                heapq.heappush(self.heap, (k_new[0], k_new[1], node))
+                continue
+            heapq.heappop(self.heap)
+            del self.open[node]
+            self.stats['expanded'] += 1
+            g_node, rhs_node = g.get(node, inf), rhs.get(node, inf)
+            if g_node > rhs_node:
+                # Overconsistent: commit the lower distance and pass it on
+                g[node] = rhs_node
+                for s, c in self._out(node).items():
+                    if s != self.source and rhs_node + c < rhs.get(s, inf):
+                        rhs[s] = rhs_node + c
+                        self._update_vertex(s)
+            else:
+                # Underconsistent: forget g and re-derive what depended on it
+                g[node] = inf
+                for s, c in self._out(node).items():
+                    if s != self.source and rhs.get(s, inf) == g_node + c:
+                        rhs[s] = self._lookahead(s)
+                    self._update_vertex(s)
+                self._update_vertex(node)
+
+    def _extract_path(self):
+        """Walk from target to source along the predecessors that realize g."""
+        inf = float('inf')
+        g = self.g
+        node = self.target
+        path = [node]
+        seen = {node}
+        while node != self.source:
+            node = min(self._in(node).items(), key=lambda pc: g.get(pc[0], inf) + pc[1])[0]
+            if node in seen:
+                # Cannot happen with positive weights and consistent g values
+                raise RuntimeError(f"predecessor walk revisits {self._name(node)!r}")
+            seen.add(node)
+            path.append(node)
+        path.reverse()
+        return [self._name(node) for node in path]
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(start={self._name(self.start)!r}, "
+                f"goal={self._name(self.goal)!r}, stats={self.stats})")
+
+
+class DStarLite(LPAStar):
+    """
+    D* Lite: LPA* from the goal backwards, for a start that moves.
+
+    Args:
+    graph (dict or CSRGraph): Weighted graph, copied.
+    start: Current position of the agent.
+    goal: Goal node.
+    heuristic (callable): ``heuristic(a, b)``, a consistent lower bound on
+        d(a, b) for node names (e.g. straight-line distance); zero when None.
+    """
+
+    def __init__(self, graph, start, goal, heuristic=None):
+        self.heuristic = heuristic
+        super().__init__(graph, start, goal)
+
+    @property
+    def source(self):
+        return self.goal
+
+    @property
+    def target(self):
+        return self.start
+
+    def _bind_heuristic(self, h):
+        heuristic, name = self.heuristic, self._name
+        if heuristic is None:
+            self.h = lambda node: 0
+        else:
+            self.h = lambda node: heuristic(name(self.start), name(node))
+
+    def _out(self, node):
+        return self.pred.get(node, {})
+
+    def _in(self, node):
+        return self.succ.get(node, {})
+
+    def _search_edge(self, u, v):
+        # Searching backwards, the edge runs v -> u
+        return v, u
+
+    def move_to(self, node):
+        """
+        Move the start to ``node`` (usually the next node of the last path).
+
+        Old keys were computed with h from the previous start; raising km
+        by h(previous, new) keeps them lower bounds, so nothing is re-keyed
+        here.
+        """
+        node = self._id(node)
+        if node == self.start:
+            return
+        if self.heuristic is not None:
+            self.km += self.heuristic(self._name(self.start), self._name(node))
+        self.start = node
+
+    def _extract_path(self):
+        # g runs from the goal, so walking from the start gives the path in order
+        path = super()._extract_path()
+        path.reverse()
+        return path
+
+
+# Example usage
+if __name__ == "__main__":
+    import math
+    import random
+    import time
+
+    from graph_generators import pick_query, road_like_graph
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    GRAPH, H = informed.GRAPH, informed.H
+
+    search = LPAStar(GRAPH, 'Arad', 'Bucharest', H)
+    path, cost, expanded = search.replan()
+    print(f"LPA* Arad -> Bucharest: {path} cost {cost}, expanded {expanded}")
+    for u, v in (('Pitesti', 'Bucharest'), ('Bucharest', 'Pitesti')):
+        search.update_edge(u, v, float('inf'))
+    path, cost, expanded = search.replan()
+    print(f"Pitesti - Bucharest closed: {path} cost {cost}, expanded {expanded}")
+    for u, v in (('Pitesti', 'Bucharest'), ('Bucharest', 'Pitesti')):
+        search.update_edge(u, v, 101)
+    path, cost, expanded = search.replan()
+    print(f"Reopened: {path} cost {cost}, expanded {expanded}\n")
+
+    # Traffic feed: batches of weight increases on a road network, LPA*
+    # replans against A* from scratch on the same (mirrored) weights.
+    graph, coords = road_like_graph(20000, seed=0)
+    start, goal = pick_query(graph, seed=1)
+    h = {v: math.dist(coords[v], coords[goal]) for v in range(graph.num_nodes)}
+    edges = [(u, v, w) for u in range(graph.num_nodes) for v, w in graph.edges(u) if u < v]
+    base = {(u, v): w for u, v, w in edges}
+    rng = random.Random(0)
+
+    search = LPAStar(graph, start, goal, h)
+    t0 = time.perf_counter()
+    _, cost, expanded = search.replan()
+    print(f"{graph}: initial LPA* cost {cost}, expanded {expanded}, "
+          f"{(time.perf_counter() - t0) * 1000:.1f} ms")
+    batches, batch_size = 20, 200
+    lpa_expanded = astar_expanded = 0
+    lpa_s = astar_s = 0.0
+    for _ in range(batches):
+        for u, v, w in rng.sample(edges, batch_size):
+            new_weight = base[(u, v)] * rng.choice((1, 1, 2, 3))
+            graph.set_weight(u, v, new_weight)
+            graph.set_weight(v, u, new_weight)
+            search.update_edge(u, v, new_weight)
+            search.update_edge(v, u, new_weight)
+        t0 = time.perf_counter()
+        _, cost, expanded = search.replan()
+        lpa_s += time.perf_counter() - t0
+        lpa_expanded += expanded
+        t0 = time.perf_counter()
+        _, astar_cost, expanded, _ = informed.a_star(graph, h, start, goal)
+        astar_s += time.perf_counter() - t0
+        astar_expanded += expanded
+        assert abs(cost - astar_cost) < 1e-9, (cost, astar_cost)
+    print(f"{batches} batches of {batch_size} changed roads, per replan:")
+    print(f"  LPA* replan:      expanded {lpa_expanded / batches:8.1f}, {lpa_s / batches * 1000:7.2f} ms")
+    print(f"  A* from scratch:  expanded {astar_expanded / batches:8.1f}, {astar_s / batches * 1000:7.2f} ms")
+
+    # D* Lite: an agent drives toward the goal while roads around it change.
+    def straight_line(a, b):
+        return math.dist(coords[a], coords[b])
+
+    search = DStarLite(graph, start, goal, straight_line)
+    path, cost, expanded = search.replan()
+    position, steps, replans, total = start, 0, 0, expanded
+    while position != goal:
+        position = path[1]
+        search.move_to(position)
+        steps += 1
+        if steps % 10 == 0:
+            for u, v, w in rng.sample(edges, batch_size):
+                new_weight = base[(u, v)] * rng.choice((1, 2, 3))
+                graph.set_weight(u, v, new_weight)
+                graph.set_weight(v, u, new_weight)
+                search.update_edge(u, v, new_weight)
+                search.update_edge(v, u, new_weight)
+            path, cost, expanded = search.replan()
+            total += expanded
+            replans += 1
+            check = informed.a_star(graph, {v: straight_line(v, goal) for v in range(graph.num_nodes)},
+                                    position, goal)[1]
+            assert abs(cost - check) < 1e-9, (cost, check)
+        else:
+            path = path[1:]
+    print(f"D* Lite agent: {steps} moves, {replans} replans, {total} nodes expanded in total")
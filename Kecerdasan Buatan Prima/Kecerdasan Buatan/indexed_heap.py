@@ -0,0 +1,335 @@
+"""
+Open-list backends for the A* family.
+
+All backends share one small interface so the searches can swap them:
+
+    push(entry)   insert entry, or update the entry of the same node
+    pop()         remove and return the smallest entry
+    peek()        smallest entry without removing it
+    len(q)        number of entries held
+    entries()     the held entries, in internal order (for trace snapshots)
+    stats()       counters: pushes, decrease_keys, pops, stale_pops, max_size
+
+An entry is a tuple whose last element is the node, e.g. ``(f, g, node)``;
+entries compare as tuples, so ties break exactly like the plain heapq code.
+
+LazyHeap is the previous behaviour: every improvement pushes a duplicate,
+and the search discards stale entries when they come out (it bumps
+``stale_pops`` when it does). IndexedHeap and PairingHeap hold one entry
+per node and lower it in place (decrease-key), so nothing goes stale and
+the heap never holds more entries than open nodes.
+"""
+
+import heapq
+
+
+class LazyHeap:
+    """heapq list with duplicate entries (lazy deletion)."""
+
+    def __init__(self):
+        self.heap = []
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.max_size = 0
+
+    def push(self, entry):
+        heapq.heappush(self.heap, entry)
+        self.pushes += 1
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+    def peek(self):
+        return self.heap[0]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def entries(self):
+        return self.heap
+
+    def stats(self):
+        return {
+            'open_list': 'lazy', 'pushes': self.pushes, 'decrease_keys': 0,
+            'pops': self.pops, 'stale_pops': self.stale_pops, 'max_size': self.max_size,
+        }
+
+
+class IndexedHeap(LazyHeap):
+    """
+    Binary heap with a node -> position map.
+
+    Pushing an entry for a node already in the heap replaces its entry and
+    sifts it up (decrease-key) or down (increase-key).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pos = {}
+        self.decrease_keys = 0
+
+    def push(self, entry):
+        heap, node = self.heap, entry[-1]
+        i = self.pos.get(node)
+        if i is None:
+            heap.append(entry)
+            self.pushes += 1
+            if len(heap) > self.max_size:
+                self.max_size = len(heap)
+            self._sift_up(len(heap) - 1)
+        elif entry < heap[i]:
+            heap[i] = entry
+            self.decrease_keys += 1
+            self._sift_up(i)
+        else:
+            heap[i] = entry
+            self._sift_down(i)
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        self.pops += 1
+        top = heap[0]
+        del pos[top[-1]]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            pos[last[-1]] = 0
+            self._sift_down(0)
+        return top
+
+    def __contains__(self, node):
+        return node in self.pos
+
+    def _sift_up(self, i):
+        heap, pos = self.heap, self.pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            above = heap[parent]
+            if not entry < above:
+                break
+            heap[i] = above
+            pos[above[-1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[-1]] = i
+
+    def _sift_down(self, i):
+        heap, pos = self.heap, self.pos
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            below = heap[child]
+            if not below < entry:
+                break
+            heap[i] = below
+            pos[below[-1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[-1]] = i
+
+    def stats(self):
+        stats = super().stats()
+        stats.update(open_list='indexed', decrease_keys=self.decrease_keys)
+        return stats
+
+
+class _PairNode:
+    __slots__ = ('entry', 'child', 'sibling', 'prev')
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.child = None
+        self.sibling = None
+        self.prev = None  # parent if leftmost child, else left sibling
+
+
+class PairingHeap(IndexedHeap):
+    """
+    Pairing heap with a node -> handle map.
+
+    Decrease-key cuts the node's subtree and melds it with the root in
+    O(1); pop does the usual two-pass merge of the root's children.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.root = None
+        self.size = 0
+
+    def push(self, entry):
+        node = entry[-1]
+        handle = self.pos.get(node)
+        if handle is None:
+            handle = self.pos[node] = _PairNode(entry)
+            self.root = self._meld(self.root, handle)
+            self.size += 1
+            self.pushes += 1
+            if self.size > self.max_size:
+                self.max_size = self.size
+            return
+        if handle is self.root:
+            if entry < handle.entry:
+                handle.entry = entry
+                self.decrease_keys += 1
+                return
+            # Key increase at the root: take it out and reinsert it
+            self.root = self._merge_pairs(handle.child)
+        elif entry < handle.entry:
+            handle.entry = entry
+            self.decrease_keys += 1
+            self._cut(handle)
+            self.root = self._meld(self.root, handle)
+            return
+        else:
+            self._cut(handle)
+            self.root = self._meld(self.root, self._merge_pairs(handle.child))
+        handle.entry = entry
+        handle.child = None
+        self.root = self._meld(self.root, handle)
+
+    def pop(self):
+        root = self.root
+        self.pops += 1
+        self.size -= 1
+        del self.pos[root.entry[-1]]
+        self.root = self._merge_pairs(root.child)
+        return root.entry
+
+    def peek(self):
+        return self.root.entry
+
+    def __len__(self):
+        return self.size
+
+    def entries(self):
+        out = []
+        stack = [self.root] if self.root else []
+        while stack:
+            handle = stack.pop()
+            out.append(handle.entry)
+            if handle.sibling:
+                stack.append(handle.sibling)
+            if handle.child:
+                stack.append(handle.child)
+        return out
+
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.entry < a.entry:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child:
+            a.child.prev = b
+        a.child = b
+        a.sibling = a.prev = None
+        return a
+
+    @staticmethod
+    def _cut(handle):
+        prev = handle.prev
+        if prev.child is handle:
+            prev.child = handle.sibling
+        else:
+            prev.sibling = handle.sibling
+        if handle.sibling:
+            handle.sibling.prev = prev
+        handle.sibling = handle.prev = None
+
+    def _merge_pairs(self, first):
+        if first is None:
+            return None
+        first.prev = None
+        # First pass: meld children pairwise left to right
+        pairs = []
+        while first:
+            second = first.sibling
+            if second is None:
+                first.sibling = None
+                pairs.append(first)
+                break
+            rest = second.sibling
+            first.sibling = second.sibling = second.prev = None
+            pairs.append(self._meld(first, second))
+            first = rest
+        # Second pass: meld the results right to left
+        root = pairs.pop()
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+    def stats(self):
+        stats = super().stats()
+        stats['open_list'] = 'pairing'
+        return stats
+
+
+OPEN_LISTS = {
+    'lazy': LazyHeap,
+    'indexed': IndexedHeap,
+    'pairing': PairingHeap,
+}
+
+
+def make_open_list(kind='lazy'):
+    """
+    Create an empty open list.
+
+    Args:
+    kind (str or type): 'lazy', 'indexed', 'pairing', or a class with the
+        same interface.
+
+    Returns:
+    An empty open list.
+    """
+    if not isinstance(kind, str):
+        return kind()
+    if kind not in OPEN_LISTS:
+        raise ValueError(f"Unknown open list {kind!r}; expected one of {sorted(OPEN_LISTS)}")
+    return OPEN_LISTS[kind]()
+
+
+# Example usage
+if __name__ == "__main__":
+    import importlib.util
+    import os
+    import time
+
+    from graph_generators import GENERATORS, heuristic_table, pick_query
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location(
+        "informed_search", os.path.join(here, "Informed-Search.py"))
+    informed = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(informed)
+
+    print(f"{'graph':10s} {'algorithm':21s} {'open list':9s} {'expanded':>8s} {'pushes':>7s}"
+          f" {'dec-key':>7s} {'stale':>6s} {'max size':>8s} {'ms':>8s}")
+    for family in ("geometric", "road", "scale_free"):
+        graph, coords = GENERATORS[family](20000, seed=3)
+        start, goal = pick_query(graph, seed=3)
+        h = heuristic_table(graph, coords, goal)
+        for algorithm in ("a_star", "weighted_a_star", "bidirectional_a_star"):
+            search = getattr(informed, algorithm)
+            for kind in OPEN_LISTS:
+                stats = {}
+                t0 = time.perf_counter()
+                path, cost, expanded, _ = search(graph, h, start, goal, open_list=kind, stats=stats)
+                ms = (time.perf_counter() - t0) * 1000
+                print(f"{family:10s} {algorithm:21s} {kind:9s} {expanded:8d} {stats['pushes']:7d}"
+                      f" {stats['decrease_keys']:7d} {stats['stale_pops']:6d}"
+                      f" {stats['max_size']:8d} {ms:8.1f}")
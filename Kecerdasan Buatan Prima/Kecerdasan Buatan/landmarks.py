@@ -0,0 +1,250 @@
+"""
+ALT (A*, Landmarks, Triangle inequality) heuristics for arbitrary goals.
+
+A handful of landmark nodes L are chosen once, and exact distances from and
+to every landmark are stored with dijkstra. For any goal t the triangle
+inequality then gives an admissible, consistent lower bound on d(v, t):
+
+    d(v, t) >= d(L, t) - d(L, v)     (distances from L)
+    d(v, t) >= d(v, L) - d(t, L)     (distances to L)
+
+and h(v) is the largest of these bounds over all landmarks (at least 0).
+
+    landmarks = Landmarks.build(GRAPH, count=4)
+    h = landmarks.heuristic('Craiova')
+    a_star(GRAPH, h, 'Arad', 'Craiova')
+
+The heuristic object answers ``h[node]`` / ``h.get(node, default)`` like
+the ``H`` dict, so a_star, weighted_a_star, ida_star and
+bidirectional_a_star take it unchanged. On a CSRGraph, ``by_id`` hands the
+searches the whole per-id table at once (one vectorized pass per goal).
+
+Landmark selection:
+- 'farthest': each new landmark is the node farthest from the ones chosen
+  so far.
+- 'avoid' (Goldberg & Werneck): grow a shortest-path tree from a random
+  root, weight every node by how badly the current landmarks bound its
+  distance from the root, and put the next landmark at a leaf of the
+  worst-covered subtree.
+"""
+
+import random
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra
+
+
+class Landmarks:
+    """
+    Landmark distance tables of one graph.
+
+    Args:
+    graph (CSRGraph): The graph the tables belong to.
+    landmarks (list): Landmark node ids.
+    from_landmark (ndarray): (L, n) distances d(L, v), inf when unreachable.
+    to_landmark (ndarray): (L, n) distances d(v, L), inf when unreachable.
+    """
+
+    def __init__(self, graph, landmarks, from_landmark, to_landmark):
+        self.graph = graph
+        self.landmarks = list(landmarks)
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    @property
+    def names(self):
+        """Landmark node names."""
+        return [self.graph.names[i] for i in self.landmarks]
+
+    @classmethod
+    def build(cls, graph, count=8, method='avoid', seed=0):
+        """
+        Select landmarks and compute their distance tables.
+
+        Args:
+        graph (dict or CSRGraph): Weighted graph.
+        count (int): Number of landmarks.
+        method (str): 'avoid' or 'farthest'.
+        seed (int): Seed for the random roots.
+
+        Returns:
+        Landmarks: The tables.
+        """
+        if method not in ('avoid', 'farthest'):
+            raise ValueError(f"Unknown method {method!r}; expected 'avoid' or 'farthest'")
+        graph = CSRGraph.from_dict(graph)
+        reverse = graph.reverse()
+        rng = random.Random(seed)
+        n = graph.num_nodes
+        count = min(count, n)
+        landmarks = cls(graph, [], np.empty((0, n)), np.empty((0, n)))
+
+        while len(landmarks.landmarks) < count:
+            if method == 'farthest' or not landmarks.landmarks:
+                chosen = landmarks._farthest(rng)
+            else:
+                chosen = landmarks._avoid(rng)
+            if chosen is None:
+                break
+            forward, _ = _distances(graph, chosen)
+            backward, _ = _distances(reverse, chosen)
+            landmarks.landmarks.append(chosen)
+            landmarks.from_landmark = np.vstack([landmarks.from_landmark, forward])
+            landmarks.to_landmark = np.vstack([landmarks.to_landmark, backward])
+        return landmarks
+
+    # -------------------------
+    # Selection
+    # -------------------------
+    def _farthest(self, rng):
+        """Node farthest (by the smallest landmark distance) from the chosen set."""
+        if not self.landmarks:
+            root = rng.randrange(self.graph.num_nodes)
+            distance = _distances(self.graph, root)[0]
+        else:
+            distance = np.minimum(self.from_landmark, self.to_landmark).min(axis=0)
+        distance = np.where(np.isfinite(distance), distance, -1)
+        distance[self.landmarks] = -1
+        best = int(np.argmax(distance))
+        return best if distance[best] > 0 else None
+
+    def _avoid(self, rng):
+        """Leaf of the shortest-path-tree subtree the landmarks cover worst."""
+        n = self.graph.num_nodes
+        root = rng.randrange(n)
+        dist, previous = _distances(self.graph, root)
+        reached = np.isfinite(dist)
+
+        # weight(v) = d(root, v) - lower bound from the current landmarks
+        bound = self._bounds(root, source=True)
+        weight = np.where(reached, dist - np.where(np.isfinite(bound), bound, 0), 0)
+
+        children = [[] for _ in range(n)]
+        for v in np.flatnonzero(reached).tolist():
+            p = previous[v]
+            if p >= 0:
+                children[p].append(v)
+
+        # Subtree sizes, children before parents (decreasing distance)
+        is_landmark = np.zeros(n, dtype=bool)
+        is_landmark[self.landmarks] = True
+        size = weight.copy()
+        has_landmark = is_landmark.copy()
+        for v in np.argsort(-dist, kind='stable').tolist():
+            if not reached[v]:
+                continue
+            for c in children[v]:
+                size[v] += size[c]
+                has_landmark[v] |= has_landmark[c]
+        size[has_landmark | ~reached] = 0
+
+        node = int(np.argmax(size))
+        if size[node] <= 0:
+            return self._farthest(rng)
+        while children[node]:
+            node = max(children[node], key=size.__getitem__)
+        return node
+
+    def _bounds(self, node, source):
+        """
+        Landmark lower bounds on d(node, v) (source=True) or d(v, node)
+        (source=False) for every v.
+        """
+        F, T = self.from_landmark, self.to_landmark
+        with np.errstate(invalid='ignore'):
+            if source:
+                terms = np.concatenate([F - F[:, node, None], T[:, node, None] - T])
+            else:
+                terms = np.concatenate([F[:, node, None] - F, T - T[:, node, None]])
+        terms = np.where(np.isnan(terms), 0, terms)
+        return np.maximum(terms.max(axis=0, initial=0), 0)
+
+    # -------------------------
+    # Heuristic
+    # -------------------------
+    def heuristic(self, goal):
+        """
+        Return the ALT heuristic towards ``goal``.
+
+        Args:
+        goal: Goal node name.
+
+        Returns:
+        LandmarkHeuristic: ``h[node]`` lower bound on d(node, goal).
+        """
+        return LandmarkHeuristic(self.graph, self._bounds(self.graph.id_of(goal), source=False))
+
+    def source_heuristic(self, start):
+        """
+        Return ALT lower bounds on d(start, node), e.g. the ``h_back`` of
+        Informed-Search.bidirectional_a_star.
+        """
+        return LandmarkHeuristic(self.graph, self._bounds(self.graph.id_of(start), source=True))
+
+    def __repr__(self):
+        return f"Landmarks(count={len(self.landmarks)}, landmarks={self.names})"
+
+
+class LandmarkHeuristic:
+    """
+    ALT lower bounds to one goal, read like a ``{node: h}`` dict.
+
+    Args:
+    graph (CSRGraph): Graph the bounds belong to.
+    values (ndarray): Lower bound per node id.
+    """
+
+    def __init__(self, graph, values):
+        self.graph = graph
+        self.values = values.tolist()
+
+    def __getitem__(self, node):
+        return self.values[self.graph.index[node]]
+
+    def get(self, node, default=0):
+        i = self.graph.index.get(node)
+        return default if i is None else self.values[i]
+
+    def by_id(self, graph):
+        """Per-id list for a search running on ``graph`` (see CSRGraph.node_values)."""
+        if graph.names != self.graph.names:
+            return graph.node_values(dict(zip(self.graph.names, self.values)))
+        return self.values
+
+
+def _distances(graph, source):
+    """Distances (ndarray) and predecessor ids (list, -1 for none) from source id."""
+    distances, previous = dijkstra(graph, graph.names[source])
+    index = graph.index
+    return (np.fromiter(distances.values(), dtype=np.float64, count=graph.num_nodes),
+            [-1 if p is None else index[p] for p in previous.values()])
+
+
+# Example usage
+if __name__ == "__main__":
+    from graph_generators import pick_query, road_like_graph
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+
+    landmarks = Landmarks.build(informed.GRAPH, count=4)
+    print(landmarks)
+    for goal in ("Bucharest", "Craiova", "Neamt"):
+        h = landmarks.heuristic(goal)
+        path, cost, expanded, _ = informed.a_star(informed.GRAPH, h, "Arad", goal)
+        _, _, blind, _ = informed.a_star(informed.GRAPH, {}, "Arad", goal)
+        print(f"Arad -> {goal}: {path} cost {cost}, expanded {expanded} (h=0: {blind})")
+
+    graph, _ = road_like_graph(20000, seed=1)
+    for method in ("farthest", "avoid"):
+        landmarks = Landmarks.build(graph, count=8, method=method)
+        totals = {'alt': 0, 'zero': 0}
+        for q in range(20):
+            start, goal = pick_query(graph, seed=q)
+            h = landmarks.heuristic(goal)
+            totals['alt'] += informed.a_star(graph, h, start, goal)[2]
+            totals['zero'] += informed.a_star(graph, {}, start, goal)[2]
+        print(f"\nRoad-like {graph}, 8 {method} landmarks, 20 queries:")
+        print(f"  expanded with ALT: {totals['alt'] / 20:.0f}, with h=0: {totals['zero'] / 20:.0f}")
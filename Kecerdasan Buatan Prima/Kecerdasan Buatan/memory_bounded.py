@@ -1,4 +1,7 @@
-def ida_star(graph, weights, heuristics, start, goal):
+from search_trace import POP, GOAL, CUTOFF, BOUND, EXHAUSTED
+
+def ida_star(graph, weights, heuristics, start, goal, tracer=None, transposition_size=0,
+             stats=None):
     """
     IDA* (Iterative Deepening A*) implementation with simulation (Memory Bounded Search).
 
@@ -8,36 +11,61 @@ def ida_star(graph, weights, heuristics, start, goal):
     heuristics (dict): Heuristic values for each node.
     start: Starting node.
     goal: Goal node.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+    transposition_size (int): Nodes kept in a per-iteration transposition
+        table (0 disables it). A node reached again with no better g is not
+        searched again; its backed-up f is returned instead.
+    stats (dict): Optional; ``stats['iterations']`` gets the bound,
+        expanded, re-expanded and pruned counts of every iteration.
 
     Returns:
     list or None: Path from start to goal if found, else None.
     """
     def search(path, g, bound):
         current = path[-1]
+        entry = table.get(current)
+        if entry is not None and entry[0] <= g:
+            if counts is not None:
+                counts['pruned'] += 1
+            return g + entry[1] - entry[0]
         f = g + heuristics[current]
-        print(f"  Expanding: {current} (g: {g}, h: {heuristics[current]}, f: {f})")
+        if emit:
+            emit(POP, current, g, f)
 
         if f > bound:
-            print(f"  f > bound ({bound}), cutoff")
+            if emit:
+                emit(CUTOFF, current, bound)
             return f
 
         if current == goal:
-            print(f"  Goal {goal} reached!")
+            if emit:
+                emit(GOAL, current)
             return 'FOUND'
 
+        if counts is not None:
+            counts['expanded'] += 1
+            if current in expanded:
+                counts['reexpanded'] += 1
+            expanded.add(current)
         min_bound = float('inf')
         for neighbor in graph.get(current, []):
-            if neighbor not in path:
+            # on_path mirrors path, so the cycle check is O(1)
+            if neighbor not in on_path:
                 edge_weight = weights.get((current, neighbor), 1)
                 new_g = g + edge_weight
                 path.append(neighbor)
+                on_path.add(neighbor)
                 result = search(path, new_g, bound)
                 if result == 'FOUND':
                     return 'FOUND'
                 if result < min_bound:
                     min_bound = result
                 path.pop()
+                on_path.discard(neighbor)
 
+        if transposition_size and (entry is not None or len(table) < transposition_size):
+            table[current] = (g, min_bound)
         return min_bound
 
     if start == goal:
@@ -45,26 +73,43 @@ def ida_star(graph, weights, heuristics, start, goal):
 
     bound = heuristics[start]
     path = [start]
+    on_path = {start}
+    # node -> (best g, backed-up f); cleared every iteration, since values
+    # found under one path's cycle check are not lower bounds for the next
+    table = {}
+    counts = None
+    expanded = set()
+    if stats is not None:
+        stats['iterations'] = []
 
-    print(f"Starting IDA* from {start} to {goal}")
-    print(f"Heuristics: {heuristics}")
-    print(f"Initial bound: {bound}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("ida_star", start=start, goal=goal, heuristics=heuristics)
+        emit = tracer.emit
 
     while True:
-        print(f"Iteration with bound: {bound}")
+        if emit:
+            emit(BOUND, None, bound)
+        table.clear()
+        if stats is not None:
+            counts = {'bound': bound, 'expanded': 0, 'reexpanded': 0, 'pruned': 0}
+            stats['iterations'].append(counts)
+            expanded.clear()
         result = search(path, 0, bound)
         if result == 'FOUND':
             return path
         if result == float('inf'):
-            print("No path found")
+            if emit:
+                emit(EXHAUSTED)
             return None
         bound = result
-        print(f"New bound: {bound}")
-        print("---")
 
 # Example usage
 if __name__ == "__main__":
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B(1), C(4); B -> D(2); C -> E(3); D -> E(1)
     graph = {
         'A': ['B', 'C'],
@@ -83,14 +128,16 @@ if __name__ == "__main__":
         ('D', 'E'): 1
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
@@ -100,7 +147,9 @@ if __name__ == "__main__":
         print(f"{edge}: {weight}")
     print()
 
-    path = ida_star(graph, weights, heuristics, 'A', 'E')
+    tracer = SearchTracer()
+    path = ida_star(graph, weights, heuristics, 'A', 'E', tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
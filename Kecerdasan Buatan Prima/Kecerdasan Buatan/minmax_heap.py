@@ -0,0 +1,186 @@
+"""
+Indexed min-max heap (Atkinson et al.): O(1) access to both the smallest
+and the largest entry and O(log n) insert, update and removal at either
+end or anywhere in the middle.
+
+Levels alternate: even levels (the root included) hold entries no larger
+than anything below them, odd levels entries no smaller than anything
+below them. As in indexed_heap, an entry is a tuple whose last element is
+the item, and a position map lets the holder of an item change or remove
+its entry in place:
+
+    push(entry)    insert entry, or replace the entry of the same item
+    pop_min()      remove and return the smallest entry
+    pop_max()      remove and return the largest entry
+    peek_min()     smallest entry
+    peek_max()     largest entry
+    remove(item)   remove the entry of item and return it
+
+Used by sma_star in Informed-Search.py, which expands its best leaf and
+forgets its worst leaf.
+"""
+
+
+class MinMaxHeap:
+    """Double-ended priority queue with an item -> position map."""
+
+    def __init__(self):
+        self.heap = []
+        self.pos = {}
+        self.pushes = 0
+        self.pops = 0
+        self.max_size = 0
+
+    def push(self, entry):
+        heap, item = self.heap, entry[-1]
+        i = self.pos.get(item)
+        if i is None:
+            i = len(heap)
+            heap.append(entry)
+            self.pos[item] = i
+            self.pushes += 1
+            if len(heap) > self.max_size:
+                self.max_size = len(heap)
+        else:
+            heap[i] = entry
+        self._fix(i)
+
+    def peek_min(self):
+        return self.heap[0]
+
+    def peek_max(self):
+        return self.heap[self._max_index()]
+
+    def pop_min(self):
+        return self._remove_at(0)
+
+    def pop_max(self):
+        return self._remove_at(self._max_index())
+
+    def remove(self, item):
+        return self._remove_at(self.pos[item])
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def __len__(self):
+        return len(self.heap)
+
+    def entries(self):
+        return self.heap
+
+    def stats(self):
+        return {'pushes': self.pushes, 'pops': self.pops, 'max_size': self.max_size}
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _max_index(self):
+        heap = self.heap
+        if len(heap) < 3:
+            return len(heap) - 1
+        return 1 if heap[2] < heap[1] else 2
+
+    def _remove_at(self, i):
+        heap, pos = self.heap, self.pos
+        self.pops += 1
+        entry = heap[i]
+        del pos[entry[-1]]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            pos[last[-1]] = i
+            self._fix(i)
+        return entry
+
+    def _set(self, i, entry):
+        self.heap[i] = entry
+        self.pos[entry[-1]] = i
+
+    def _fix(self, i):
+        """Restore the heap after the entry at i changed to any value."""
+        heap = self.heap
+        on_min = _is_min_level(i)
+        if i > 0:
+            parent = (i - 1) >> 1
+            if (heap[parent] < heap[i]) if on_min else (heap[i] < heap[parent]):
+                # Belongs on the parent's side: swap, then the parent's old
+                # entry goes down from i and the new one climbs.
+                moved = heap[parent]
+                self._set(parent, heap[i])
+                self._set(i, moved)
+                self._push_down(i, on_min)
+                self._push_up(parent, not on_min)
+                return
+        if self._push_up(i, on_min) == i:
+            self._push_down(i, on_min)
+
+    def _push_up(self, i, on_min):
+        """Climb by grandparents on one kind of level; return the final index."""
+        heap = self.heap
+        entry = heap[i]
+        while i > 2:
+            grandparent = (((i - 1) >> 1) - 1) >> 1
+            above = heap[grandparent]
+            if not ((entry < above) if on_min else (above < entry)):
+                break
+            self._set(i, above)
+            i = grandparent
+        self._set(i, entry)
+        return i
+
+    def _push_down(self, i, on_min):
+        heap, pos = self.heap, self.pos
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            first_child = 2 * i + 1
+            if first_child >= size:
+                break
+            # Extreme entry among children and grandchildren (increasing indices)
+            m = first_child
+            best = heap[m]
+            for c in (first_child + 1, 4 * i + 3, 4 * i + 4, 4 * i + 5, 4 * i + 6):
+                if c >= size:
+                    break
+                if (heap[c] < best) if on_min else (best < heap[c]):
+                    m, best = c, heap[c]
+            if not ((best < entry) if on_min else (entry < best)):
+                break
+            heap[i] = best
+            pos[best[-1]] = i
+            if m <= first_child + 1:
+                i = m
+                break
+            # Moved two levels down: keep the entry on the right side of
+            # the level in between.
+            parent = (m - 1) >> 1
+            above = heap[parent]
+            if (above < entry) if on_min else (entry < above):
+                heap[parent] = entry
+                pos[entry[-1]] = parent
+                entry = above
+            i = m
+        heap[i] = entry
+        pos[entry[-1]] = i
+
+
+def _is_min_level(i):
+    return not ((i + 1).bit_length() - 1) & 1
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(0)
+    heap = MinMaxHeap()
+    for item in range(10):
+        heap.push((rng.randrange(100), item))
+    print(f"entries: {sorted(heap.entries())}")
+    heap.push((-1, 7))
+    heap.remove(3)
+    print(f"after lowering item 7 and removing item 3: min {heap.peek_min()}, max {heap.peek_max()}")
+    low = [heap.pop_min() for _ in range(3)]
+    high = [heap.pop_max() for _ in range(3)]
+    print(f"three smallest {low}, three largest {high}, left {sorted(heap.entries())}")
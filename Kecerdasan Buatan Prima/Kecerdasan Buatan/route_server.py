@@ -0,0 +1,445 @@
+"""
+Local asyncio HTTP server for route queries.
+
+    python route_server.py --port 8080
+    curl 'http://127.0.0.1:8080/route?algorithm=a_star&start=Arad&goal=Bucharest'
+    curl 'http://127.0.0.1:8080/stats'
+
+The graph is loaded once at startup, published to a process pool through
+batch_query.SharedGraph, and searched by a_star, ucs, greedy_best_first or
+bidirectional_a_star. Informed searches use ALT landmark heuristics
+(landmarks.Landmarks) built at startup, so any goal gets an admissible h.
+
+Concurrent requests are coalesced: a batcher task takes up to
+``max_batch`` requests (or whatever arrived within ``batch_window``
+seconds) and sends them to a worker as one task. Backpressure comes from
+two bounds: at most ``2 * workers`` batches are in flight, and while the
+pool is saturated requests wait in a queue of ``queue_size``; once that is
+full new requests are answered 503 immediately instead of piling up.
+
+``/stats`` reports request and batch counters plus latency percentiles
+(enqueue to result, over the last ``latency_window`` requests).
+
+``python route_server.py --demo`` starts a server on an ephemeral local
+port and drives it with the client functions below.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from batch_query import SharedGraph, attach, search_runner
+from csr_graph import CSRGraph
+
+SERVED = ('a_star', 'ucs', 'greedy_best_first', 'bidirectional_a_star')
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class Overloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+class LatencyRecorder:
+    """
+    Latencies of the most recent requests.
+
+    Args:
+    window (int): Number of samples kept.
+    """
+
+    def __init__(self, window=10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, points=(50, 90, 99)):
+        """Nearest-rank percentiles in milliseconds (None when empty)."""
+        ordered = sorted(self.samples)
+        result = {'count': self.count}
+        for p in points:
+            rank = max(0, -(-p * len(ordered) // 100) - 1)
+            result[f'p{p}_ms'] = round(ordered[rank] * 1000, 3) if ordered else None
+        result['max_ms'] = round(ordered[-1] * 1000, 3) if ordered else None
+        return result
+
+
+# -------------------------
+# Worker side
+# -------------------------
+_worker = {}
+
+
+def _init_worker(descriptor, h):
+    graph, blocks = attach(descriptor)
+    runners = {name: search_runner(name, graph, h) for name in SERVED}
+    _worker.update(graph=graph, blocks=blocks, runners=runners)
+
+
+def _run_batch(jobs):
+    """Answer ``(algorithm, start, goal)`` jobs; one failure does not fail the batch."""
+    runners = _worker['runners']
+    results = []
+    for algorithm, start, goal in jobs:
+        try:
+            results.append((True, runners[algorithm](start, goal)[:3]))
+        except Exception as exc:
+            results.append((False, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+# -------------------------
+# Server
+# -------------------------
+class RouteServer:
+    """
+    Micro-batching route server.
+
+    Args:
+    graph (dict or CSRGraph): Graph to serve.
+    h (dict or object): Heuristic for informed searches; an object with
+        ``heuristic(goal)`` (e.g. landmarks.Landmarks) gives a per-goal one.
+    workers (int): Process pool size, default os.cpu_count().
+    max_batch (int): Most requests per dispatched batch.
+    batch_window (float): Seconds the batcher waits to fill a batch.
+    queue_size (int): Requests that may wait for a batch before 503s.
+    latency_window (int): Requests kept for the latency percentiles.
+    """
+
+    def __init__(self, graph, h=None, workers=None, max_batch=64, batch_window=0.002,
+                 queue_size=1024, latency_window=10000):
+        self.graph = CSRGraph.from_dict(graph)
+        self.h = h
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.queue_size = queue_size
+        self.latency = LatencyRecorder(latency_window)
+        self.stats = {'requests': 0, 'rejected': 0, 'errors': 0, 'batches': 0, 'batched': 0}
+        self.shared = None
+        self.pool = None
+        self.server = None
+        self.queue = None
+        self.batcher = None
+        self.in_flight = None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Start the pool, the batcher and the listener; return the bound port."""
+        self.shared = SharedGraph(self.graph)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                        initargs=(self.shared.descriptor, self.h))
+        self.queue = asyncio.Queue(self.queue_size)
+        self.in_flight = asyncio.Semaphore(2 * self.workers)
+        self.batcher = asyncio.create_task(self._batch_loop())
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.batcher.cancel()
+        self.pool.shutdown(cancel_futures=True)
+        self.shared.close()
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def resolve(self, name):
+        """Map a query-string node name to a graph node (ids of generated graphs are ints)."""
+        if name in self.graph.index:
+            return name
+        try:
+            if int(name) in self.graph.index:
+                return int(name)
+        except ValueError:
+            pass
+        raise KeyError(f"unknown node {name!r}")
+
+    async def submit(self, algorithm, start, goal):
+        """
+        Queue one query and wait for its batch.
+
+        Returns:
+        tuple: ``(path, cost, expanded)``.
+
+        Raises:
+        Overloaded: The request queue is full.
+        RuntimeError: The search or its worker failed (queries are
+            validated before they are submitted, so this is a server error).
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(((algorithm, start, goal), future))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise Overloaded from None
+        t0 = time.perf_counter()
+        ok, result = await future
+        self.latency.add(time.perf_counter() - t0)
+        if not ok:
+            self.stats['errors'] += 1
+            raise RuntimeError(result)
+        return result
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Blocks while the pool is saturated, so the queue fills up and
+            # new requests are turned away instead of waiting unboundedly.
+            await self.in_flight.acquire()
+            self.stats['batches'] += 1
+            self.stats['batched'] += len(batch)
+            asyncio.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, _run_batch, [job for job, _ in batch])
+        except Exception as exc:
+            results = [(False, f"{type(exc).__name__}: {exc}")] * len(batch)
+        finally:
+            self.in_flight.release()
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def snapshot(self):
+        """Counters, queue depth and latency percentiles."""
+        batches = self.stats['batches']
+        return {
+            **self.stats,
+            'mean_batch': round(self.stats['batched'] / batches, 2) if batches else None,
+            'queued': self.queue.qsize(),
+            'workers': self.workers,
+            'latency': self.latency.percentiles(),
+        }
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    async def _handle(self, reader, writer):
+        try:
+            status, body = await self._respond(reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            status, body = 400, {'error': 'malformed request'}
+        payload = json.dumps(body).encode()
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n").encode()
+        try:
+            writer.write(head + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').split()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        if len(request_line) != 3:
+            raise ValueError(request_line)
+        method, target, _ = request_line
+        if method != 'GET':
+            return 405, {'error': 'only GET is supported'}
+        url = urlsplit(target)
+        if url.path == '/stats':
+            return 200, self.snapshot()
+        if url.path != '/route':
+            return 404, {'error': f'no route {url.path}'}
+
+        self.stats['requests'] += 1
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        algorithm = params.get('algorithm', 'a_star')
+        if algorithm not in SERVED:
+            return 400, {'error': f'unknown algorithm {algorithm!r}; expected one of {SERVED}'}
+        try:
+            start = self.resolve(params['start'])
+            goal = self.resolve(params['goal'])
+        except KeyError as exc:
+            return 400, {'error': f'missing or unknown node: {exc}'}
+        try:
+            path, cost, expanded = await self.submit(algorithm, start, goal)
+        except Overloaded:
+            return 503, {'error': 'server overloaded, retry later'}
+        except RuntimeError as exc:
+            return 500, {'error': str(exc)}
+        if cost is None or cost == float('inf'):
+            cost = None
+        return 200, {'algorithm': algorithm, 'start': start, 'goal': goal,
+                     'path': path, 'cost': cost, 'expanded': expanded}
+
+
+# -------------------------
+# Local client
+# -------------------------
+async def fetch(host, port, target):
+    """GET ``target`` and return ``(status, decoded JSON body)``."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+
+async def route(host, port, algorithm, start, goal):
+    """Query ``/route``; returns ``(status, body)``."""
+    query = urlencode({'algorithm': algorithm, 'start': start, 'goal': goal})
+    return await fetch(host, port, f"/route?{query}")
+
+
+async def load_test(host, port, queries, concurrency=64):
+    """
+    Send ``(algorithm, start, goal)`` queries with at most ``concurrency``
+    outstanding.
+
+    Returns:
+    list: ``(status, body)`` per query, in input order.
+    list: Client-side latencies in seconds.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query):
+        async with limit:
+            t0 = time.perf_counter()
+            result = await route(host, port, *query)
+            latencies.append(time.perf_counter() - t0)
+            return result
+
+    return await asyncio.gather(*(one(q) for q in queries)), latencies
+
+
+def load_graph(name, nodes=10000, seed=0):
+    """
+    Graph and landmark heuristics for ``--graph``: 'romania', a generator
+    family, or a graph file (.kbg, .gr, .csv, .tsv; see graph_io).
+    """
+    from landmarks import Landmarks
+
+    if name == 'romania':
+        from path_memory_benchmark import load_script
+        graph = load_script('Informed-Search.py').GRAPH
+    elif os.path.splitext(name)[1] in ('.kbg', '.gr', '.csv', '.tsv'):
+        from graph_io import load_graph as load_graph_file
+        graph = load_graph_file(name)
+    else:
+        from graph_generators import GENERATORS
+        graph, _ = GENERATORS[name](nodes, seed=seed)
+    return graph, Landmarks.build(graph, count=4 if name == 'romania' else 8)
+
+
+async def demo(args):
+    from graph_generators import pick_query
+
+    graph, h = load_graph(args.graph, args.nodes, args.seed)
+    server = RouteServer(graph, h, workers=args.workers, max_batch=args.max_batch,
+                         batch_window=args.batch_window_ms / 1000, queue_size=args.queue_size)
+    port = await server.start(args.host, 0)
+    print(f"Serving {server.graph} on {args.host}:{port} with {server.workers} workers")
+    try:
+        status, body = await route(args.host, port, 'a_star', *server.graph.names[:2])
+        print(f"Single query: {status} {body}")
+
+        queries = [(SERVED[q % len(SERVED)],) + pick_query(server.graph, seed=q)
+                   for q in range(args.queries)]
+        t0 = time.perf_counter()
+        results, latencies = await load_test(args.host, port, queries, args.concurrency)
+        elapsed = time.perf_counter() - t0
+        statuses = [status for status, _ in results]
+        print(f"\n{len(queries)} queries, concurrency {args.concurrency}: {elapsed:.2f} s, "
+              f"{len(queries) / elapsed:.0f} queries/s")
+        print(f"  status codes: { {s: statuses.count(s) for s in sorted(set(statuses))} }")
+        client = LatencyRecorder()
+        for seconds in latencies:
+            client.add(seconds)
+        print(f"  client latency: {client.percentiles()}")
+        print(f"  server stats:   {(await fetch(args.host, port, '/stats'))[1]}")
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--graph", default="romania", help="'romania', a graph_generators family or a graph file")
+    parser.add_argument("--nodes", type=int, default=10000, help="size of a generated graph")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--demo", action="store_true", help="run a local load test and exit")
+    parser.add_argument("--queries", type=int, default=2000, help="demo queries")
+    parser.add_argument("--concurrency", type=int, default=64, help="demo client concurrency")
+    args = parser.parse_args(argv)
+
+    if args.demo:
+        asyncio.run(demo(args))
+        return
+
+    async def serve():
+        graph, h = load_graph(args.graph, args.nodes, args.seed)
+        server = RouteServer(graph, h, workers=args.workers, max_batch=args.max_batch,
+                             batch_window=args.batch_window_ms / 1000, queue_size=args.queue_size)
+        port = await server.start(args.host, args.port)
+        print(f"Serving {server.graph} on http://{args.host}:{port}", file=sys.stderr)
+        # SIGTERM stops serving like Ctrl-C does, so close() still unlinks
+        # the shared graph blocks (add_signal_handler is Unix only)
+        serving = asyncio.ensure_future(server.server.serve_forever())
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+        except NotImplementedError:
+            pass
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
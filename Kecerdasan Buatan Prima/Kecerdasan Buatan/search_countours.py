@@ -1,15 +1,34 @@
-from collections import deque
+import heapq
 
-def beam_search(graph, heuristics, start, goal, beam_width=2):
+from search_trace import POP, ENQUEUE, GOAL, CUTOFF, BACKTRACK, LEVEL, EXHAUSTED
+
+def select_beam(candidates, beam_width):
+    """
+    The beam_width smallest candidates, in order.
+
+    heapq.nsmallest keeps a heap of beam_width entries while it scans, so a
+    level costs O(n log beam_width) instead of sorting all n candidates.
+    Ties are broken exactly like ``sorted(candidates)[:beam_width]``.
+    """
+    return heapq.nsmallest(beam_width, candidates)
+
+def beam_search(graph, heuristics, start, goal, beam_width=2, tracer=None):
     """
     Beam Search implementation with simulation (assuming Search Contours as Beam Search).
 
+    Only nodes that make it into a beam are marked visited; a neighbor
+    pruned from one level can still be reached through a later one. The
+    search is incomplete: it gives up when a level has no new nodes (see
+    beam_stack_search for the complete variant).
+
     Args:
     graph (dict): Adjacency list representation of the graph.
     heuristics (dict): Heuristic values for each node.
     start: Starting node.
     goal: Goal node.
     beam_width (int): Number of best candidates to keep at each level.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list or None: Path from start to goal if found, else None.
@@ -20,40 +39,174 @@ def beam_search(graph, heuristics, start, goal, beam_width=2):
     beam = [(heuristics[start], start)]  # (heuristic, node)
     parent = {start: None}
 
-    print(f"Starting Beam Search from {start} to {goal} with beam width {beam_width}")
-    print(f"Heuristics: {heuristics}")
-    print(f"Initial beam: {beam}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("beam", start=start, goal=goal, heuristics=heuristics,
+                     beam_width=beam_width)
+        emit = tracer.emit
 
     while beam:
-        print(f"Current beam: {beam}")
-        next_beam = []
+        candidates = {}  # node -> parent, for this level only
 
         for h, current in beam:
-            print(f"Expanding: {current} (h: {h})")
+            if emit:
+                emit(POP, current, h)
 
             if current == goal:
-                print(f"Goal {goal} reached!")
+                if emit:
+                    emit(GOAL, current)
                 return reconstruct_path(parent, goal)
 
             for neighbor in graph.get(current, []):
-                if neighbor not in parent:  # Avoid revisiting
-                    parent[neighbor] = current
-                    next_beam.append((heuristics[neighbor], neighbor))
-                    print(f"Added neighbor: {neighbor} (h: {heuristics[neighbor]})")
-
-        # Sort by heuristic and select top beam_width
-        next_beam.sort()
-        beam = next_beam[:beam_width]
-        print(f"Next beam (top {beam_width}): {beam}")
-        print("---")
-
-        if not beam:
-            break
+                if neighbor not in parent and neighbor not in candidates:  # Avoid revisiting
+                    candidates[neighbor] = current
+                    if emit:
+                        emit(ENQUEUE, neighbor, heuristics[neighbor])
+
+        # Select the top beam_width by heuristic; only they become visited
+        beam = select_beam(((heuristics[node], node) for node in candidates), beam_width)
+        for _, node in beam:
+            parent[node] = candidates[node]
+        if emit:
+            emit(LEVEL, None, len(beam))
 
-    print("No path found")
+    if emit:
+        emit(EXHAUSTED)
     return None
 
+def beam_stack_search(graph, heuristics, start, goal, beam_width=2, weights=None,
+                      upper_bound=float('inf'), tracer=None, stats=None):
+    """
+    Beam-stack search (Zhou & Hansen): complete, optimal beam search.
+
+    The search goes layer by layer like beam search, ranking nodes by
+    f = g + h, and keeps at most beam_width nodes per layer. For every
+    layer a beam stack records the slice [low, high) of (f, node) keys
+    admitted so far. When a layer runs dry, the search backtracks to the
+    deepest layer with pruned nodes left (key >= high, f below the best
+    cost found) and regenerates it from the next slice. Nodes with
+    f >= best cost are never kept, so once the stack empties the best
+    path found is optimal for an admissible heuristic. Only the current
+    layers are stored: memory stays within beam_width x depth nodes.
+
+    Args:
+    graph (dict): Adjacency list representation of the graph.
+    heuristics (dict): Admissible heuristic values for each node.
+    start: Starting node.
+    goal: Goal node.
+    beam_width (int): Number of nodes kept per layer.
+    weights (dict): Weights for edges, e.g., {(u,v): weight}; 1 when missing.
+    upper_bound: Known cost of some path (prunes from the start).
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+    stats (dict): When given, filled with 'expanded', 'max_stored',
+        'backtracks' and 'solutions' ((cost, expanded) per improvement).
+
+    Returns:
+    list or None: Cheapest path from start to goal if found, else None.
+    """
+    if weights is None:
+        weights = {}
+    inf = float('inf')
+
+    emit = None
+    if tracer is not None:
+        tracer.begin("beam_stack", start=start, goal=goal, heuristics=heuristics,
+                     beam_width=beam_width)
+        emit = tracer.emit
+
+    if start == goal:
+        return [start]
+
+    best_cost, best_path = upper_bound, None
+    layers = [{start: (0, None)}]  # per depth: node -> (g, parent in the layer above)
+    stack = []  # per depth: [low, high) keys admitted into the next layer; None = open end
+    stored = {start: [0]}  # node -> g of its copies in the current layers (decreasing)
+    expanded = backtracks = 0
+    solutions = []
+    max_stored = 1
+
+    while layers:
+        depth = len(layers) - 1
+        if len(stack) == depth:
+            stack.append([None, None])
+        low = stack[depth][0]
+
+        # Successors of the deepest layer inside the current slice
+        successors = {}
+        for node, (g, _) in layers[depth].items():
+            expanded += 1
+            if emit:
+                emit(POP, node, g + heuristics[node], depth)
+            for neighbor in graph.get(node, []):
+                ng = g + weights.get((node, neighbor), 1)
+                f = ng + heuristics[neighbor]
+                if f >= best_cost or (low is not None and (f, neighbor) < low):
+                    continue
+                copies = stored.get(neighbor)
+                if copies and copies[-1] <= ng:
+                    continue  # An equal or better copy is already in a layer
+                if neighbor in successors and successors[neighbor][0] <= ng:
+                    continue
+                if neighbor == goal:
+                    best_cost = ng
+                    path = [goal, node]
+                    for d in range(depth, 0, -1):
+                        path.append(layers[d][path[-1]][1])
+                    best_path = path[::-1]
+                    solutions.append((ng, expanded))
+                    if emit:
+                        emit(GOAL, goal, ng)
+                    continue
+                successors[neighbor] = (ng, node)
+
+        keys = [(g + heuristics[node], node) for node, (g, _) in successors.items()
+                if g + heuristics[node] < best_cost]
+        kept = select_beam(keys, beam_width + 1)
+        if len(kept) > beam_width:
+            stack[depth][1] = kept.pop()  # Smallest pruned key
+            if emit:
+                emit(CUTOFF, None, stack[depth][1][0], depth + 1)
+        else:
+            stack[depth][1] = None
+
+        if kept:
+            layer = {node: successors[node] for _, node in kept}
+            for node, (g, _) in layer.items():
+                stored.setdefault(node, []).append(g)
+            layers.append(layer)
+            max_stored = max(max_stored, len(stored))
+            if emit:
+                emit(LEVEL, None, len(layer), depth + 1)
+            continue
+
+        # Backtrack to the deepest layer with a slice left below best_cost.
+        # layers and stack have the same length here: the top stack entry
+        # belongs to the layer that would come next.
+        while stack:
+            high = stack[-1][1]
+            if high is not None and high[0] < best_cost:
+                stack[-1] = [high, None]
+                break
+            stack.pop()
+            for node in layers.pop():
+                copies = stored[node]
+                copies.pop()
+                if not copies:
+                    del stored[node]
+            backtracks += 1
+            if emit:
+                emit(BACKTRACK, None, len(layers))
+        else:
+            break
+
+    if stats is not None:
+        stats.update(expanded=expanded, max_stored=max_stored, backtracks=backtracks,
+                     solutions=solutions)
+    if emit and best_path is None:
+        emit(EXHAUSTED)
+    return best_path
+
 def reconstruct_path(parent, goal):
     path = []
     current = goal
@@ -63,8 +216,71 @@ def reconstruct_path(parent, goal):
     path.reverse()
     return path
 
+def compare_with_a_star(n=10000, queries=10, widths=(8, 32, 128), seed=0):
+    """
+    Beam search and beam-stack search against Informed-Search a_star on
+    graph_generators grids (unit costs, Manhattan heuristic).
+
+    Prints per-query averages: nodes expanded, peak nodes stored (A*: the
+    closed and open nodes it holds at the goal), cost of the first beam-stack
+    solution relative to the optimum, and time. Beam-stack costs are
+    asserted equal to A*.
+    """
+    import time
+
+    from graph_generators import grid_graph, pick_query
+    from heuristic_provider import CoordinateHeuristics
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    graph, coords = grid_graph(n, seed=seed)
+    adjacency = {u: [v for v, _ in graph.edges(u)] for u in range(graph.num_nodes)}
+    provider = CoordinateHeuristics(graph, coords, metric="manhattan")
+    rows = {}
+
+    def add(name, **values):
+        row = rows.setdefault(name, {})
+        for key, value in values.items():
+            row[key] = row.get(key, 0) + value
+
+    for q in range(queries):
+        start, goal = pick_query(graph, seed=seed * 100003 + q)
+        heuristics = provider.heuristic(goal)
+        t0 = time.perf_counter()
+        stats = {}
+        _, cost, expanded, _ = informed.a_star(graph, heuristics, start, goal, stats=stats)
+        add("a_star", expanded=expanded, stored=expanded + stats['max_size'], first=1,
+            seconds=time.perf_counter() - t0)
+        for width in widths:
+            t0 = time.perf_counter()
+            path = beam_search(adjacency, heuristics, start, goal, beam_width=width)
+            add(f"beam w={width}", found=path is not None,
+                first=(len(path) - 1) / cost if path else 0, seconds=time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            stats = {}
+            path = beam_stack_search(adjacency, heuristics, start, goal, beam_width=width, stats=stats)
+            assert len(path) - 1 == cost, (start, goal, width)
+            add(f"beam-stack w={width}", expanded=stats['expanded'], stored=stats['max_stored'],
+                first=stats['solutions'][0][0] / cost, seconds=time.perf_counter() - t0)
+
+    print(f"Grid {graph}, {queries} queries, per-query averages:")
+    for name, row in rows.items():
+        if 'found' in row:
+            print(f"  {name:18s} found {row['found']}/{queries}, path/optimal "
+                  f"{row['first'] / max(row['found'], 1):.3f}, {row['seconds'] / queries * 1000:8.2f} ms")
+        else:
+            print(f"  {name:18s} expanded {row['expanded'] / queries:8.1f}, stored "
+                  f"{row['stored'] / queries:8.1f}, first/optimal {row['first'] / queries:.3f}, "
+                  f"{row['seconds'] / queries * 1000:8.2f} ms")
+
 # Example usage
 if __name__ == "__main__":
+    import sys
+
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B, C; B -> D; C -> E; D -> E
     graph = {
         'A': ['B', 'C'],
@@ -74,22 +290,36 @@ if __name__ == "__main__":
         'E': []
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
         print(f"{node}: {neighbors}")
     print()
 
-    path = beam_search(graph, heuristics, 'A', 'E', beam_width=2)
+    tracer = SearchTracer()
+    path = beam_search(graph, heuristics, 'A', 'E', beam_width=2, tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
         print("\nNo path found")
+    print()
+
+    tracer = SearchTracer()
+    path = beam_stack_search(graph, heuristics, 'A', 'E', beam_width=1, tracer=tracer)
+    replay(tracer)
+    print(f"\nBeam-stack path: {path}\n")
+
+    # python search_countours.py --compare also runs the 10k-node grid comparison with A*
+    if "--compare" in sys.argv[1:]:
+        compare_with_a_star()
@@ -0,0 +1,151 @@
+"""
+Compact per-node search state for searches on CSRGraph ids.
+
+The dict versions of the A* family keep ``gscore``, ``parent`` and
+``closed`` as a dict, a dict and a set, which at a million reached nodes
+is a few hundred bytes per node and a fresh set of hash tables per query.
+A SearchState holds the same three things in flat arrays indexed by id:
+
+    g        array of the graph's weight type ('q' or 'd'), 8 bytes/node
+    parent   array('i'), 4 bytes/node, -1 for the root
+    closed   bytearray, 1 byte/node
+    stamp    array('I'), 4 bytes/node
+
+An entry is only valid when ``stamp[v] == generation``. begin() starts a
+query by bumping the generation, which forgets every node in O(1); a
+search stamps a node the first time it reaches it in the query, and sets
+its closed flag back to 0 then:
+
+    state = acquire_state(graph.num_nodes, graph.weight_typecode)
+    gen = state.begin()
+    ...
+    if state.stamp[v] != gen:            # first time v is reached
+        state.stamp[v] = gen
+        state.closed[v] = 0
+        ...
+    release_state(state)
+
+acquire_state() hands out states from a small per-thread pool, so consecutive
+queries (and both sides of a bidirectional search) reuse the same arrays
+and allocate nothing per node. g uses the graph's weight typecode rather
+than always 'd' so integer costs stay ints.
+"""
+
+import threading
+from array import array
+
+MAX_GENERATION = 0xFFFFFFFF
+POOL_SIZE = 4
+
+
+class SearchState:
+    """
+    g / parent / closed arrays for ``size`` node ids, reset by generation.
+
+    Args:
+    size (int): Number of node ids.
+    typecode (str): Array typecode of the g-values ('q' or 'd').
+    """
+
+    __slots__ = ('size', 'typecode', 'g', 'parent', 'closed', 'stamp', 'generation')
+
+    def __init__(self, size, typecode='d'):
+        self.size = size
+        self.typecode = typecode
+        self.g = array(typecode, bytes(8 * size))
+        self.parent = array('i', bytes(4 * size))
+        self.closed = bytearray(size)
+        self.stamp = array('I', bytes(4 * size))
+        self.generation = 0
+
+    def begin(self):
+        """Forget every node (O(1)) and return the new generation stamp."""
+        self.generation += 1
+        if self.generation > MAX_GENERATION:
+            # Once every 2**32 queries: clear the stamps for real
+            self.stamp = array('I', bytes(4 * self.size))
+            self.generation = 1
+        return self.generation
+
+    def seen(self, node):
+        return self.stamp[node] == self.generation
+
+    def path(self, node):
+        """Ids from the root to node, following parent ids."""
+        parent = self.parent
+        path = []
+        while node != -1:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        return (self.g.itemsize * self.size + self.parent.itemsize * self.size + self.size
+                + self.stamp.itemsize * self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return (f"SearchState(size={self.size}, typecode={self.typecode!r}, "
+                f"generation={self.generation}, nbytes={self.nbytes()})")
+
+
+_local = threading.local()
+
+
+def acquire_state(size, typecode='d'):
+    """A SearchState for at least ``size`` ids, from this thread's pool if one fits."""
+    free = getattr(_local, 'free', None)
+    if free:
+        for i, state in enumerate(free):
+            if state.typecode == typecode and state.size >= size:
+                return free.pop(i)
+    return SearchState(size, typecode)
+
+
+def release_state(state):
+    """Return a state to this thread's pool (the smallest is dropped when full)."""
+    free = getattr(_local, 'free', None)
+    if free is None:
+        free = _local.free = []
+    free.append(state)
+    if len(free) > POOL_SIZE:
+        free.remove(min(free, key=len))
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    from graph_generators import pick_query, road_like_graph
+    from heuristic_provider import CoordinateHeuristics
+    from path_memory_benchmark import load_script
+
+    informed = load_script('Informed-Search.py')
+    graph, coords = road_like_graph(200000, seed=0)
+    # Same graph as a dict of dicts: the searches then keep their dict state
+    adjacency = {u: dict(graph.edges(u)) for u in range(graph.num_nodes)}
+    provider = CoordinateHeuristics(graph, coords)
+    queries = [pick_query(graph, seed=seed) for seed in range(5)]
+    print(f"{graph}, a_star per query (heuristic tables built beforehand)")
+
+    for label, search_graph in (("dict state", adjacency), ("array state", graph)):
+        print(f"  {label}:")
+        for start, goal in queries:
+            h = provider.heuristic(goal)
+            t0 = time.perf_counter()
+            _, cost, expanded, _ = informed.a_star(search_graph, h, start, goal)
+            ms = (time.perf_counter() - t0) * 1000
+            tracemalloc.start()
+            informed.a_star(search_graph, h, start, goal)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"    {start:6d} -> {goal:6d}: cost {cost:6.0f}, expanded {expanded:6d}, "
+                  f"{ms:8.2f} ms, peak {peak / 1024:9.1f} KiB ({peak / max(expanded, 1):6.1f} B/expanded)")
+    # Allocated once by the first array-state query, reused by the others
+    state = acquire_state(graph.num_nodes, graph.weight_typecode)
+    print(f"  pooled: {state}")
+    release_state(state)
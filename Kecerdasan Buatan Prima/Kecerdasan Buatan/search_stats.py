@@ -0,0 +1,175 @@
+"""
+Per-run counters shared by every search of Informed-Search.py and
+Unformed-Search.py.
+
+Pass a SearchStats (or any dict) as ``stats``; the search fills it in when
+it returns, so an uninstrumented run pays nothing and an instrumented one
+only pays for counting in locals:
+
+    stats = SearchStats()
+    a_star(GRAPH, H, 'Arad', 'Bucharest', stats=stats)
+    measure(lambda s: a_star(GRAPH, H, 'Arad', 'Bucharest', stats=s), stats)   # + peak_bytes
+    write_stats([stats], 'runs.csv')
+
+Fields (the same meaning for every algorithm):
+
+    algorithm    search function name
+    expanded     nodes whose successors were generated (goal pop included);
+                 a duplicate or outdated queue entry is a stale pop instead
+    generated    successors produced by those expansions (edges looked at)
+    pushes       entries added to the open list / queue / stack
+    stale_pops   entries taken off and dropped unexpanded
+    reopened     nodes reached again by a cheaper (or shallower) path after
+                 they were closed
+    max_open     most open-list entries alive at once (for depth-first
+                 searches: the deepest path)
+    max_closed   most nodes held in the closed / visited bookkeeping
+    elapsed_ns   time.perf_counter_ns() from the call to the return
+    peak_bytes   tracemalloc peak above the starting level (see measure)
+
+Searches add their own keys next to these (open-list counters such as
+``decrease_keys``, IDA*'s per-bound ``iterations``, SMA*'s ``forgotten``).
+"""
+
+import csv
+import io
+import json
+import os
+import time
+import tracemalloc
+
+FIELDS = ('algorithm', 'expanded', 'generated', 'pushes', 'stale_pops', 'reopened',
+          'max_open', 'max_closed', 'elapsed_ns', 'peak_bytes')
+
+
+class SearchStats(dict):
+    """
+    The FIELDS counters of one run, as a dict (extra keys allowed).
+
+    Args:
+    **values: Initial values, e.g. labels such as ``start`` and ``goal``.
+    """
+
+    def __init__(self, **values):
+        super().__init__(dict.fromkeys(FIELDS, 0), algorithm=None)
+        self.update(values)
+
+    @property
+    def elapsed_ms(self):
+        return self['elapsed_ns'] / 1e6
+
+    def to_json(self):
+        return json.dumps(self, default=str)
+
+    def __repr__(self):
+        return f"SearchStats({dict.__repr__(self)})"
+
+
+def elapsed_ms(t0):
+    """Milliseconds since ``t0 = time.perf_counter_ns()``."""
+    return (time.perf_counter_ns() - t0) / 1e6
+
+
+def record(stats, algorithm, t0, expanded, generated, pushes=0, stale_pops=0, reopened=0,
+           max_open=0, max_closed=0, open_lists=(), sequential=False, **extra):
+    """
+    Write one run's counters into ``stats`` (a no-op when stats is None).
+
+    Counters of the open lists (indexed_heap.make_open_list objects) are
+    summed over the lists and stored under their own keys (pushes,
+    decrease_keys, pops, stale_pops, max_size, open_list); their pushes,
+    stale pops and max_size are added to the given pushes, stale_pops and
+    max_open. max_size is summed for lists alive together, and is the
+    largest one when the lists were used one after another (sequential).
+    """
+    if stats is None:
+        return
+    elapsed = time.perf_counter_ns() - t0
+    summed = {}
+    for open_list in open_lists:
+        for key, value in open_list.stats().items():
+            if key == 'open_list':
+                summed[key] = value
+            elif key == 'max_size' and sequential:
+                summed[key] = max(summed.get(key, 0), value)
+            else:
+                summed[key] = summed.get(key, 0) + value
+    if summed:
+        pushes += summed['pushes']
+        stale_pops += summed['stale_pops']
+        max_open += summed['max_size']
+        stats.update(summed)
+    stats.update(algorithm=algorithm, expanded=expanded, generated=generated, pushes=pushes,
+                 stale_pops=stale_pops, reopened=reopened, max_open=max_open,
+                 max_closed=max_closed, elapsed_ns=elapsed, **extra)
+
+
+def measure(run, stats, memory=True):
+    """
+    Call ``run(stats)`` and add its allocation peak as ``stats['peak_bytes']``.
+
+    With memory=True the search runs a second time, as ``run(None)`` under
+    tracemalloc, so the counters and ``elapsed_ns`` of the first run are
+    not inflated by tracing (nor is the peak by the counting). A
+    tracemalloc session that is already running is reused and left running.
+
+    Returns:
+    The result of the first run.
+    """
+    result = run(stats)
+    if memory:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        run(None)
+        _, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+        stats['peak_bytes'] = peak - base
+    return result
+
+
+def columns(rows):
+    """FIELDS first, then every other scalar key of the rows in first-seen order."""
+    names = list(FIELDS)
+    for row in rows:
+        for key, value in row.items():
+            if key not in names and not isinstance(value, (list, tuple, dict)):
+                names.append(key)
+    return names
+
+
+def to_csv(rows):
+    """CSV text of the rows (one per run; nested values are left out)."""
+    rows = list(rows)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=columns(rows), extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def to_json(rows):
+    """JSON array of the rows, nested values included."""
+    return json.dumps(list(rows), indent=2, default=str)
+
+
+def write_stats(rows, path):
+    """Write the rows to ``path`` as CSV (.csv) or JSON (anything else)."""
+    text = to_csv(rows) if os.path.splitext(path)[1].lower() == '.csv' else to_json(rows)
+    with open(path, 'w', newline='') as fh:
+        fh.write(text)
+
+
+def print_table(rows, title=None):
+    """Aligned text table of the FIELDS of each row (named by ``label`` when set)."""
+    if title:
+        print(title)
+    print(f"  {'algorithm':24s} {'expanded':>8s} {'generated':>9s} {'pushes':>7s} {'stale':>6s}"
+          f" {'reopen':>6s} {'max_open':>8s} {'max_closed':>10s} {'ms':>9s} {'peak_kib':>9s}")
+    for row in rows:
+        print(f"  {row.get('label', row['algorithm']):24s} {row['expanded']:8d} {row['generated']:9d}"
+              f" {row['pushes']:7d} {row['stale_pops']:6d} {row['reopened']:6d} {row['max_open']:8d}"
+              f" {row['max_closed']:10d} {row['elapsed_ns'] / 1e6:9.3f} {row['peak_bytes'] / 1024:9.1f}")
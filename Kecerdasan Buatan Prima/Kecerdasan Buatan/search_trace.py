@@ -0,0 +1,91 @@
+import pickle
+from collections import deque
+
+# -------------------------
+# Event kinds
+#   Every event is a tuple (kind, node, a, b, c). The meaning of a/b/c is
+#   per algorithm and documented next to its renderer in trace_replay.py.
+# -------------------------
+POP = 1         # node taken off the open list and expanded
+SKIP = 2        # stale / duplicate entry popped and discarded
+ENQUEUE = 3     # node pushed onto the open list
+GOAL = 4        # goal reached
+CUTOFF = 5      # expansion stopped by a depth or f-bound
+BACKTRACK = 6   # recursive search returns from node
+BOUND = 7       # new iteration with a new bound (IDA*)
+INTERSECT = 8   # forward and backward searches met
+LEVEL = 9       # a layer / beam finished
+EXHAUSTED = 10  # open list ran empty
+
+KIND_NAMES = {
+    POP: "pop", SKIP: "skip", ENQUEUE: "enqueue", GOAL: "goal",
+    CUTOFF: "cutoff", BACKTRACK: "backtrack", BOUND: "bound",
+    INTERSECT: "intersect", LEVEL: "level", EXHAUSTED: "exhausted",
+}
+
+
+class SearchTracer:
+    """
+    Bounded recorder of search events.
+
+    The search functions take ``tracer=None``. When it is None they only pay
+    for an ``if emit:`` test on a local; when a tracer is passed they call
+    ``emit(kind, node, a, b, c)``, which appends one small tuple to a
+    ``deque(maxlen=capacity)``. Once the ring buffer is full the oldest
+    events are dropped, so memory stays bounded on long searches.
+
+    ``begin`` stores per-run metadata (algorithm name, start, goal, and
+    references to tables such as the heuristics) that trace_replay.py needs
+    to reproduce the simulation output.
+
+    Args:
+    capacity (int): Maximum number of events kept.
+    """
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.events = deque(maxlen=capacity)
+        self.total = 0
+        self.algorithm = None
+        self.meta = {}
+
+    def begin(self, algorithm, **meta):
+        self.algorithm = algorithm
+        self.meta = meta
+        self.events.clear()
+        self.total = 0
+
+    def emit(self, kind, node=None, a=None, b=None, c=None):
+        self.total += 1
+        self.events.append((kind, node, a, b, c))
+
+    @property
+    def dropped(self):
+        """Number of events pushed out of the ring buffer."""
+        return self.total - len(self.events)
+
+    def save(self, path):
+        """Write the trace to a file for offline replay (``python trace_replay.py <file>``)."""
+        with open(path, 'wb') as fh:
+            pickle.dump({
+                'algorithm': self.algorithm,
+                'meta': self.meta,
+                'capacity': self.capacity,
+                'total': self.total,
+                'events': list(self.events),
+            }, fh)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as fh:
+            data = pickle.load(fh)
+        tracer = cls(data['capacity'])
+        tracer.algorithm = data['algorithm']
+        tracer.meta = data['meta']
+        tracer.events.extend(data['events'])
+        tracer.total = data['total']
+        return tracer
+
+    def __repr__(self):
+        return (f"SearchTracer(algorithm={self.algorithm!r}, events={len(self.events)}, "
+                f"dropped={self.dropped})")
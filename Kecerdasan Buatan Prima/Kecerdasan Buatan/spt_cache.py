@@ -0,0 +1,145 @@
+"""
+Cache of partially expanded shortest-path trees, keyed by source node.
+
+Queries that share a start node (a depot) and differ only in the goal
+reuse one resumable dijkstra.DijkstraSearch per source:
+
+- goal already settled: answered from the stored tree, no expansion;
+- otherwise the saved frontier is expanded further until the goal is
+  settled, and the larger tree is kept for the next query.
+
+Entries are evicted least-recently-used first once their estimated size
+(DijkstraSearch.nbytes) exceeds ``memory_budget``. Changing a weight makes
+every stored tree stale: CSRGraph.set_weight bumps ``graph.version`` and
+the cache drops everything when it sees a new version. Plain dict graphs
+carry no version, so call ``invalidate()`` after editing one.
+
+    cache = SPTCache(romania_map, memory_budget=1 << 20)
+    path, cost, expanded = cache.query('Arad', 'Bucharest')
+"""
+
+from collections import OrderedDict
+
+from dijkstra import DijkstraSearch
+
+
+class SPTCache:
+    """
+    LRU cache of resumable Dijkstra searches.
+
+    Args:
+    graph (dict or CSRGraph): Weighted graph.
+    memory_budget (int): Approximate bytes the stored searches may use.
+    queue (str): Priority queue engine for new searches (see dijkstra).
+    """
+
+    def __init__(self, graph, memory_budget=64 << 20, queue='auto'):
+        self.graph = graph
+        self.memory_budget = memory_budget
+        self.queue = queue
+        self.searches = OrderedDict()
+        self.sizes = {}
+        self.version = getattr(graph, 'version', None)
+        self.stats = {'hits': 0, 'resumes': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @property
+    def nbytes(self):
+        return sum(self.sizes.values())
+
+    def query(self, start, goal):
+        """
+        Shortest path from start to goal.
+
+        Returns:
+        list or None: Path, None when goal is unreachable.
+        int or float: Path cost (inf when unreachable).
+        int: Nodes expanded by this query (0 on a cache hit).
+        """
+        self._check_version()
+        search = self.searches.get(start)
+        if search is None:
+            search = DijkstraSearch(self.graph, start, self.queue)
+            self.searches[start] = search
+            self.stats['misses'] += 1
+        else:
+            self.searches.move_to_end(start)
+            answered = search.distance(goal) != float('inf') or not search.frontier
+            self.stats['hits' if answered else 'resumes'] += 1
+
+        expanded = search.settle(goal)
+        result = search.path(goal), search.distance(goal), expanded
+        if expanded:
+            self.sizes[start] = search.nbytes()
+            self._evict()
+        return result
+
+    def invalidate(self, start=None):
+        """Drop the tree of ``start``, or every tree when start is None."""
+        if start is None:
+            self.searches.clear()
+            self.sizes.clear()
+        else:
+            self.searches.pop(start, None)
+            self.sizes.pop(start, None)
+        self.stats['invalidations'] += 1
+
+    def _check_version(self):
+        version = getattr(self.graph, 'version', None)
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+
+    def _evict(self):
+        total = self.nbytes
+        while total > self.memory_budget and self.searches:
+            start, _ = self.searches.popitem(last=False)
+            total -= self.sizes.pop(start, 0)
+            self.stats['evictions'] += 1
+
+    def __len__(self):
+        return len(self.searches)
+
+    def __repr__(self):
+        return (f"SPTCache(sources={len(self.searches)}, nbytes={self.nbytes}, "
+                f"budget={self.memory_budget}, stats={self.stats})")
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    import time
+
+    from graph_generators import road_like_graph
+    from path_memory_benchmark import load_script
+
+    unformed = load_script('Unformed-Search.py')
+
+    cache = SPTCache(unformed.romania_map)
+    for goal in ("Sibiu", "Bucharest", "Craiova", "Neamt"):
+        path, cost, expanded = cache.query("Arad", goal)
+        print(f"Arad -> {goal}: {path} cost {cost}, expanded {expanded}")
+    print(cache)
+
+    graph, _ = road_like_graph(10000, seed=0)
+    rng = random.Random(0)
+    depots = [rng.randrange(graph.num_nodes) for _ in range(4)]
+    queries = [(rng.choice(depots), rng.randrange(graph.num_nodes)) for _ in range(100)]
+
+    t0 = time.perf_counter()
+    baseline = [unformed.ucs(s, g, graph=graph) for s, g in queries]
+    ucs_ms = (time.perf_counter() - t0) * 1000
+
+    cache = SPTCache(graph, memory_budget=8 << 20)
+    t0 = time.perf_counter()
+    cached = [cache.query(s, g) for s, g in queries]
+    cache_ms = (time.perf_counter() - t0) * 1000
+    assert [c for _, c, _ in cached] == [c for _, c, _ in baseline]
+
+    print(f"\n{graph}, {len(queries)} queries from {len(depots)} depots:")
+    print(f"  ucs from scratch: {ucs_ms:8.1f} ms, {sum(e for *_, e in baseline)} expanded")
+    print(f"  SPT cache:        {cache_ms:8.1f} ms, {sum(e for *_, e in cached)} expanded")
+    print(f"  {cache}")
+
+    graph.set_weight(depots[0], graph.names[graph.targets[graph.offsets[depots[0]]]], 1)
+    cache.query(depots[0], depots[1])
+    print(f"  after set_weight: {cache}")
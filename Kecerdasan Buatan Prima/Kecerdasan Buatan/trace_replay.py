@@ -0,0 +1,510 @@
+"""
+Replay a SearchTracer buffer as the step-by-step simulation output the
+teaching modules used to print directly.
+
+Each renderer rebuilds the open list / visited set / path from the event
+stream (pushing and popping a model heap or queue in the same order as the
+search did), so the printed snapshots match the live ones. When the ring
+buffer dropped old events that state is unknown, so snapshot lines are
+skipped and only the per-event lines are printed.
+
+Usage:
+    python trace_replay.py trace.pkl
+"""
+
+import heapq
+import sys
+from collections import deque
+
+from indexed_heap import make_open_list
+from search_trace import (
+    POP, SKIP, ENQUEUE, GOAL, CUTOFF, BACKTRACK, BOUND, INTERSECT, LEVEL,
+    EXHAUSTED, SearchTracer,
+)
+
+
+# -------------------------
+# a_star.py
+#   POP(node, f, g)  SKIP(node, f)  ENQUEUE(node, g, f)  GOAL(node)  EXHAUSTED
+# -------------------------
+def render_a_star(meta, events, complete):
+    h = meta['heuristics']
+    heap = make_open_list(meta.get('open_list', 'lazy'))
+    heap.push((h[meta['start']], 0, meta['start']))
+    yield f"Starting A* Search from {meta['start']} to {meta['goal']}"
+    yield f"Heuristics: {h}"
+    yield f"Initial priority queue: {heap.entries()}"
+    yield ""
+    expanding = False
+    for kind, node, a, b, _ in events:
+        if expanding and kind in (POP, SKIP, EXHAUSTED):
+            if complete:
+                yield f"Priority queue now: {heap.entries()}"
+            yield "---"
+            expanding = False
+        if kind == POP:
+            if complete:
+                heap.pop()
+            yield f"Popped: {node} (f: {a}, g: {b}, h: {h[node]})"
+            expanding = True
+        elif kind == SKIP:
+            if complete:
+                heap.pop()
+            yield f"Skipped: {node} (f: {a}, superseded entry)"
+        elif kind == ENQUEUE:
+            if complete:
+                heap.push((b, a, node))
+            yield f"Updated neighbor: {node} (g: {a}, h: {h[node]}, f: {b})"
+        elif kind == GOAL:
+            yield f"Goal {node} reached!"
+            expanding = False
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# greedy.py
+#   POP(node, h)  SKIP(node, h)  ENQUEUE(node, h)  GOAL(node)  EXHAUSTED
+# -------------------------
+def render_greedy(meta, events, complete):
+    h = meta['heuristics']
+    heap = [(h[meta['start']], meta['start'])]
+    yield f"Starting Greedy Search from {meta['start']} to {meta['goal']}"
+    yield f"Heuristics: {h}"
+    yield f"Initial priority queue: {heap}"
+    yield ""
+    expanding = False
+    for kind, node, a, _, _ in events:
+        if expanding and kind in (POP, SKIP, EXHAUSTED):
+            if complete:
+                yield f"Priority queue now: {heap}"
+            yield "---"
+            expanding = False
+        if kind in (POP, SKIP):
+            if complete:
+                heapq.heappop(heap)
+            yield f"Popped: {node} (heuristic: {a})"
+            if kind == SKIP:
+                yield f"Already visited {node}, skipping"
+            else:
+                yield f"Visiting: {node}"
+                expanding = True
+        elif kind == ENQUEUE:
+            if complete:
+                heapq.heappush(heap, (a, node))
+            yield f"Pushed neighbor: {node} (heuristic: {a})"
+        elif kind == GOAL:
+            yield f"Goal {node} reached!"
+            expanding = False
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# weighted_a_star.py
+#   POP(node, f)  SKIP(node, f)  ENQUEUE(node, g, f)  GOAL(node)  EXHAUSTED
+# -------------------------
+def render_weighted_a_star(meta, events, complete):
+    h, weight = meta['heuristics'], meta['weight']
+    yield f"Starting Weighted A* from {meta['start']} to {meta['goal']} with weight {weight}"
+    yield f"Heuristics: {h}"
+    yield ""
+    expanding = False
+    for kind, node, a, b, _ in events:
+        if expanding and kind in (POP, SKIP, EXHAUSTED):
+            yield "---"
+            expanding = False
+        if kind == POP:
+            yield f"Expand: {node} (f: {a})"
+            expanding = True
+        elif kind == ENQUEUE:
+            yield (f"  Enqueue: {node} (g: {a}, h: {h[node]}, "
+                   f"w*h: {weight * h[node]}, f: {b})")
+        elif kind == GOAL:
+            yield f"Goal {node} reached!"
+            expanding = False
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# weighted_a_star.py (ARA*)
+#   BOUND(None, weight)  POP(node, f)  ENQUEUE(node, g, f)  GOAL(node, cost, bound)
+#   EXHAUSTED
+# -------------------------
+def render_ara_star(meta, events, complete):
+    h = meta['heuristics']
+    weight = meta['initial_weight']
+    yield f"Starting ARA* from {meta['start']} to {meta['goal']} with weight {weight}"
+    yield f"Heuristics: {h}"
+    expanding = False
+    for kind, node, a, b, _ in events:
+        if expanding and kind in (POP, BOUND, GOAL, EXHAUSTED):
+            yield "---"
+            expanding = False
+        if kind == BOUND:
+            weight = a
+            yield ""
+            yield f"Search with weight {weight} (reusing open and INCONS nodes)"
+        elif kind == POP:
+            yield f"Expand: {node} (f: {a})"
+            expanding = True
+        elif kind == ENQUEUE:
+            yield (f"  Enqueue: {node} (g: {a}, h: {h[node]}, "
+                   f"w*h: {weight * h[node]}, f: {b})")
+        elif kind == GOAL:
+            yield f"Path to {node} with cost {a}, suboptimality bound {b}"
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# memory_bounded.py (IDA*)
+#   BOUND(None, bound)  POP(node, g, f)  CUTOFF(node, bound)  GOAL(node)  EXHAUSTED
+# -------------------------
+def render_ida_star(meta, events, complete):
+    h = meta['heuristics']
+    yield f"Starting IDA* from {meta['start']} to {meta['goal']}"
+    yield f"Heuristics: {h}"
+    yield f"Initial bound: {h[meta['start']]}"
+    yield ""
+    first = True
+    for kind, node, a, b, _ in events:
+        if kind == BOUND:
+            if not first:
+                yield f"New bound: {a}"
+                yield "---"
+            first = False
+            yield f"Iteration with bound: {a}"
+        elif kind == POP:
+            yield f"  Expanding: {node} (g: {a}, h: {h[node]}, f: {b})"
+        elif kind == CUTOFF:
+            yield f"  f > bound ({a}), cutoff"
+        elif kind == GOAL:
+            yield f"  Goal {node} reached!"
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# depth_limited.py
+#   POP(node, depth)  GOAL(node)  CUTOFF(node, limit)  BACKTRACK(node)  EXHAUSTED
+# -------------------------
+def render_depth_limited(meta, events, complete):
+    yield f"Starting DLS from {meta['start']} to {meta['goal']} with depth limit {meta['limit']}"
+    yield ""
+    path = []
+    visited = set()
+    # A node joins `visited` once it is neither the goal nor cut off,
+    # i.e. when the event after its POP is a child POP or its BACKTRACK.
+    pending = None
+    for kind, node, a, _, _ in events:
+        if pending is not None and kind in (POP, BACKTRACK):
+            visited.add(pending)
+        pending = None
+        if kind == POP:
+            del path[a:]
+            path.append(node)
+            yield f"Visiting node: {node} at depth {a}"
+            if complete:
+                yield f"Current path: {path}"
+                yield f"Visited: {list(visited)}"
+            pending = node
+        elif kind == GOAL:
+            yield f"Goal {node} found!"
+        elif kind == CUTOFF:
+            yield f"Depth limit {a} reached at node {node}, cutting off"
+        elif kind == BACKTRACK:
+            visited.discard(node)
+            yield f"Backtracking from {node}"
+
+
+# -------------------------
+# dijkstra.py
+#   POP(node, dist)  SKIP(node, dist)  ENQUEUE(node, dist, via)  EXHAUSTED
+# -------------------------
+def render_dijkstra(meta, events, complete):
+    start = meta['start']
+    distances = {node: float('inf') for node in meta['nodes']}
+    distances[start] = 0
+    heap = [(0, start)]
+    yield f"Starting Dijkstra from node: {start}"
+    yield f"Initial distances: {distances}"
+    yield f"Initial priority queue: {heap}"
+    yield ""
+    expanding = False
+    for kind, node, a, b, _ in events:
+        if expanding and kind in (POP, SKIP, EXHAUSTED):
+            yield "---"
+            expanding = False
+        if kind in (POP, SKIP):
+            if complete:
+                heapq.heappop(heap)
+            yield f"Popped: {node} with distance {a}"
+            if kind == SKIP:
+                yield f"Skipping {node} as better path found"
+            else:
+                expanding = True
+        elif kind == ENQUEUE:
+            distances[node] = a
+            yield f"Updated distance for {node} to {a} via {b}"
+            if complete:
+                heapq.heappush(heap, (a, node))
+                yield f"Priority queue now: {heap}"
+                yield f"Distances now: {distances}"
+        elif kind == EXHAUSTED and complete:
+            yield ""
+            yield f"Final shortest distances: {distances}"
+
+
+# -------------------------
+# bidirectional_heuristic.py
+#   POP(node, f, None, side)  SKIP(node, f, None, side)
+#   ENQUEUE(node, g, f, side)  INTERSECT(node, cost)  EXHAUSTED
+# -------------------------
+def render_bidirectional_a_star(meta, events, complete):
+    heuristics = {'f': meta['heuristics'], 'b': meta.get('reverse_heuristics') or {}}
+    yield f"Starting Bidirectional A* from {meta['start']} to {meta['goal']}"
+    yield f"Heuristics: {heuristics['f']}"
+    if heuristics['b']:
+        yield f"Reverse heuristics: {heuristics['b']}"
+    yield ""
+    round_done = False
+    for kind, node, a, b, side in events:
+        label = "Forward" if side == 'f' else "Backward"
+        if round_done and (side == 'f' or kind == EXHAUSTED):
+            yield "---"
+            round_done = False
+        if kind == POP:
+            yield f"{label} expand: {node} (f: {a})"
+            round_done = side == 'b'
+        elif kind == SKIP:
+            yield f"  {label} reject: {node} (cannot improve the best meeting cost)"
+        elif kind == ENQUEUE:
+            yield f"  {label} enqueue: {node} (g: {a}, h: {heuristics[side].get(node, 0)}, f: {b})"
+        elif kind == INTERSECT:
+            yield f"Meeting at {node} (cost: {a})"
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# search_countours.py (beam search)
+#   POP(node, h)  ENQUEUE(node, h)  GOAL(node)  LEVEL(None, beam_size)  EXHAUSTED
+# -------------------------
+def render_beam(meta, events, complete):
+    h, width = meta['heuristics'], meta['beam_width']
+    beam = [(h[meta['start']], meta['start'])]
+    candidates = []
+    yield f"Starting Beam Search from {meta['start']} to {meta['goal']} with beam width {width}"
+    yield f"Heuristics: {h}"
+    yield f"Initial beam: {beam}"
+    yield ""
+    in_level = False
+    for kind, node, a, _, _ in events:
+        if kind == POP:
+            if not in_level and complete:
+                yield f"Current beam: {beam}"
+            in_level = True
+            yield f"Expanding: {node} (h: {a})"
+        elif kind == ENQUEUE:
+            candidates.append((a, node))
+            yield f"Added neighbor: {node} (h: {a})"
+        elif kind == GOAL:
+            yield f"Goal {node} reached!"
+        elif kind == LEVEL:
+            beam = heapq.nsmallest(width, candidates)
+            candidates = []
+            in_level = False
+            if complete:
+                yield f"Next beam (top {width}): {beam}"
+            yield "---"
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# search_countours.py (beam-stack search)
+#   POP(node, f, depth)  CUTOFF(None, f, depth)  LEVEL(None, size, depth)
+#   GOAL(node, cost)  BACKTRACK(None, depth)  EXHAUSTED
+# -------------------------
+def render_beam_stack(meta, events, complete):
+    yield (f"Starting Beam-Stack Search from {meta['start']} to {meta['goal']} "
+           f"with beam width {meta['beam_width']}")
+    yield f"Heuristics: {meta['heuristics']}"
+    yield ""
+    for kind, node, a, b, _ in events:
+        if kind == POP:
+            yield f"Expanding: {node} (f: {a}, layer {b})"
+        elif kind == GOAL:
+            yield f"Path to {node} with cost {a}; nodes with f >= {a} are pruned from now on"
+        elif kind == CUTOFF:
+            yield f"  Layer {b} pruned from f {a} on (kept on the beam stack)"
+        elif kind == LEVEL:
+            yield f"Layer {b}: {a} nodes"
+            yield "---"
+        elif kind == BACKTRACK:
+            yield f"Backtrack to layer {a}"
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+# -------------------------
+# breadth_first.py
+#   POP(node)  ENQUEUE(node)  EXHAUSTED
+# -------------------------
+def render_breadth_first(meta, events, complete):
+    start = meta['start']
+    queue = deque([start])
+    visited = {start}
+    order = []
+    yield f"Starting BFS from node: {start}"
+    yield f"Initial queue: {list(queue)}"
+    yield f"Initial visited: {list(visited)}"
+    yield ""
+    expanding = False
+    for kind, node, _, _, _ in events:
+        if expanding and kind in (POP, EXHAUSTED):
+            yield "---"
+            expanding = False
+        if kind == POP:
+            if complete:
+                queue.popleft()
+            order.append(node)
+            yield f"Dequeued: {node}"
+            if complete:
+                yield f"Current BFS order: {order}"
+            expanding = True
+        elif kind == ENQUEUE:
+            queue.append(node)
+            visited.add(node)
+            yield f"Enqueued neighbor: {node}"
+            if complete:
+                yield f"Queue now: {list(queue)}"
+                yield f"Visited now: {list(visited)}"
+        elif kind == EXHAUSTED and complete:
+            yield ""
+            yield f"Final BFS traversal order: {order}"
+
+
+# -------------------------
+# depth_first.py
+#   POP(node)  SKIP(node)  ENQUEUE(node)  EXHAUSTED
+# -------------------------
+def render_depth_first(meta, events, complete):
+    start = meta['start']
+    stack = [start]
+    visited = set()
+    order = []
+    yield f"Starting DFS from node: {start}"
+    yield f"Initial stack: {stack}"
+    yield f"Initial visited: {list(visited)}"
+    yield ""
+    expanding = False
+    for kind, node, _, _, _ in events:
+        if expanding and kind in (POP, SKIP, EXHAUSTED):
+            yield "---"
+            expanding = False
+        if kind == POP:
+            if complete:
+                stack.pop()
+            visited.add(node)
+            order.append(node)
+            yield f"Popped and visited: {node}"
+            if complete:
+                yield f"Current DFS order: {order}"
+                yield f"Visited now: {list(visited)}"
+            expanding = True
+        elif kind == SKIP:
+            if complete:
+                stack.pop()
+            yield f"Skipped {node} (already visited)"
+            yield "---"
+        elif kind == ENQUEUE:
+            stack.append(node)
+            yield f"Pushed neighbor: {node}"
+            if complete:
+                yield f"Stack now: {stack}"
+        elif kind == EXHAUSTED and complete:
+            yield ""
+            yield f"Final DFS traversal order: {order}"
+
+
+# -------------------------
+# bidirectional.py
+#   POP(node, None, None, side)  ENQUEUE(node, parent, None, side)
+#   INTERSECT(node)  EXHAUSTED
+# -------------------------
+def render_bidirectional(meta, events, complete):
+    queues = {'f': deque([meta['start']]), 'b': deque([meta['goal']])}
+    yield f"Starting Bidirectional Search from {meta['start']} to {meta['goal']}"
+    yield f"Initial forward queue: {list(queues['f'])}"
+    yield f"Initial backward queue: {list(queues['b'])}"
+    yield ""
+    round_done = False
+    for kind, node, a, _, side in events:
+        if round_done and (side == 'f' or kind == EXHAUSTED):
+            if complete:
+                yield f"Forward queue: {list(queues['f'])}"
+                yield f"Backward queue: {list(queues['b'])}"
+            yield "---"
+            round_done = False
+        if kind == POP:
+            if complete:
+                queues[side].popleft()
+            direction = "forward" if side == 'f' else "backward"
+            yield f"Expanding {direction} from: {node}"
+            round_done = side == 'b'
+        elif kind == ENQUEUE:
+            queues[side].append(node)
+            label = "Forward" if side == 'f' else "Backward"
+            yield f"{label}: Added {node} to queue, parent {a}"
+        elif kind == INTERSECT:
+            yield f"Intersection found at {node}!"
+            round_done = False
+        elif kind == EXHAUSTED:
+            yield "No path found"
+
+
+RENDERERS = {
+    "a_star": render_a_star,
+    "greedy": render_greedy,
+    "weighted_a_star": render_weighted_a_star,
+    "ara_star": render_ara_star,
+    "ida_star": render_ida_star,
+    "depth_limited": render_depth_limited,
+    "dijkstra": render_dijkstra,
+    "bidirectional_a_star": render_bidirectional_a_star,
+    "beam": render_beam,
+    "beam_stack": render_beam_stack,
+    "breadth_first": render_breadth_first,
+    "depth_first": render_depth_first,
+    "bidirectional": render_bidirectional,
+}
+
+
+def replay_lines(tracer):
+    """Yield the simulation output lines for a recorded trace."""
+    if tracer.algorithm is None:
+        return
+    renderer = RENDERERS.get(tracer.algorithm)
+    if renderer is None:
+        raise ValueError(f"No renderer for algorithm {tracer.algorithm!r}")
+    complete = tracer.dropped == 0
+    if not complete:
+        yield f"[{tracer.dropped} earlier events dropped by the ring buffer; state snapshots omitted]"
+    yield from renderer(tracer.meta, tracer.events, complete)
+
+
+def replay(tracer, file=None):
+    """Print the simulation output for a recorded trace."""
+    file = file or sys.stdout
+    for line in replay_lines(tracer):
+        print(line, file=file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python trace_replay.py <trace.pkl>")
+        sys.exit(2)
+    replay(SearchTracer.load(sys.argv[1]))
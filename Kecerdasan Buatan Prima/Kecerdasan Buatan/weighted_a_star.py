@@ -1,6 +1,9 @@
 import heapq
+import time
 
-def weighted_a_star(graph, weights, heuristics, start, goal, weight=1.5):
+from search_trace import POP, SKIP, ENQUEUE, GOAL, BOUND, EXHAUSTED
+
+def weighted_a_star(graph, weights, heuristics, start, goal, weight=1.5, tracer=None):
     """
     Weighted A* implementation with simulation.
 
@@ -11,6 +14,8 @@ def weighted_a_star(graph, weights, heuristics, start, goal, weight=1.5):
     start: Starting node.
     goal: Goal node.
     weight: Weight for heuristic, default 1.5.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
 
     Returns:
     list or None: Path from start to goal if found, else None.
@@ -29,19 +34,25 @@ def weighted_a_star(graph, weights, heuristics, start, goal, weight=1.5):
     parent = {start: None}
     g = {start: 0}
 
-    print(f"Starting Weighted A* from {start} to {goal} with weight {weight}")
-    print(f"Heuristics: {heuristics}")
-    print()
+    emit = None
+    if tracer is not None:
+        tracer.begin("weighted_a_star", start=start, goal=goal,
+                     heuristics=heuristics, weight=weight)
+        emit = tracer.emit
 
     while open_list:
         f, current = heapq.heappop(open_list)
         if current in closed_list:
+            if emit:
+                emit(SKIP, current, f)
             continue
         closed_list.add(current)
-        print(f"Expand: {current} (f: {f})")
+        if emit:
+            emit(POP, current, f)
 
         if current == goal:
-            print(f"Goal {goal} reached!")
+            if emit:
+                emit(GOAL, current)
             return reconstruct_path(parent, goal)
 
         for neighbor in graph.get(current, []):
@@ -54,15 +65,137 @@ def weighted_a_star(graph, weights, heuristics, start, goal, weight=1.5):
                 f = tentative_g + weight * heuristics[neighbor]
                 heapq.heappush(open_list, (f, neighbor))
                 parent[neighbor] = current
-                print(f"  Enqueue: {neighbor} (g: {tentative_g}, h: {heuristics[neighbor]}, w*h: {weight * heuristics[neighbor]}, f: {f})")
-
-        print("---")
+                if emit:
+                    emit(ENQUEUE, neighbor, tentative_g, f)
 
-    print("No path found")
+    if emit:
+        emit(EXHAUSTED)
     return None
 
+def ara_star(graph, weights, heuristics, start, goal, initial_weight=3.0, weight_step=0.5,
+             deadline=None, tracer=None):
+    """
+    Anytime Repairing A* (ARA*): weighted A* with a falling weight.
+
+    The first run uses initial_weight; each later run lowers the weight by
+    weight_step (not below 1) and reuses the g-values, the open list and
+    the INCONS list (nodes improved after they were closed) of the run
+    before, instead of searching from scratch.
+
+    Args:
+    graph (dict): Adjacency list representation of the graph.
+    weights (dict): Weights for edges, e.g., {(u,v): weight}.
+    heuristics (dict): Consistent heuristic values for each node.
+    start: Starting node.
+    goal: Goal node.
+    initial_weight: Weight of the first run, default 3.0.
+    weight_step: Weight decrease per run, default 0.5.
+    deadline: Optional time budget in seconds; the search stops when it
+        runs out and the last path yielded is the best found.
+    tracer (SearchTracer): Optional event recorder; replay it with
+        trace_replay.replay to print the step-by-step simulation.
+
+    Yields:
+    tuple: (path, cost, bound) each time the path or its suboptimality
+    bound improves; cost <= bound * optimal cost, and bound 1 means the
+    path is optimal. cost is the sum of the path's edges, which can be
+    below g[goal] when a closed node on it was improved this run.
+
+    Raises:
+    ValueError: weight_step <= 0 (raised on the first next()).
+    """
+    if weight_step <= 0:
+        raise ValueError("weight_step must be positive")
+
+    def reconstruct_path(parent, goal):
+        path = []
+        current = goal
+        while current is not None:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        return path
+
+    stop_at = None if deadline is None else time.monotonic() + deadline
+    inf = float('inf')
+    parent = {start: None}
+    g = {start: 0}
+    open_set = {start}
+    incons = set()
+    best_cost, best_bound = inf, inf
+    weight = max(1.0, initial_weight)
+
+    emit = None
+    if tracer is not None:
+        tracer.begin("ara_star", start=start, goal=goal, heuristics=heuristics,
+                     initial_weight=weight)
+        emit = tracer.emit
+
+    while True:
+        open_list = [(g[node] + weight * heuristics[node], node) for node in open_set]  # (f, node)
+        heapq.heapify(open_list)
+        closed_list = set()
+        if emit:
+            emit(BOUND, None, weight)
+
+        while open_list:
+            f, current = open_list[0]
+            if current not in open_set or f != g[current] + weight * heuristics[current]:
+                heapq.heappop(open_list)  # Outdated entry
+                continue
+            if f >= g.get(goal, inf) + weight * heuristics[goal]:
+                break
+            if stop_at is not None and time.monotonic() >= stop_at:
+                return
+            heapq.heappop(open_list)
+            open_set.discard(current)
+            closed_list.add(current)
+            if emit:
+                emit(POP, current, f)
+
+            for neighbor in graph.get(current, []):
+                edge_weight = weights.get((current, neighbor), 1)
+                tentative_g = g[current] + edge_weight
+                if neighbor not in g or tentative_g < g[neighbor]:
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    if neighbor in closed_list:
+                        incons.add(neighbor)
+                    else:
+                        open_set.add(neighbor)
+                        f = tentative_g + weight * heuristics[neighbor]
+                        heapq.heappush(open_list, (f, neighbor))
+                        if emit:
+                            emit(ENQUEUE, neighbor, tentative_g, f)
+
+        if goal not in g:
+            if emit:
+                emit(EXHAUSTED)
+            return
+        path = reconstruct_path(parent, goal)
+        cost = sum(weights.get(edge, 1) for edge in zip(path, path[1:]))
+        lower = min((g[node] + heuristics[node] for node in open_set | incons), default=inf)
+        if cost <= lower:
+            bound = 1.0
+        else:
+            bound = min(weight, cost / lower) if lower > 0 else weight
+        if cost < best_cost or bound < best_bound:
+            best_cost, best_bound = cost, bound
+            if emit:
+                emit(GOAL, goal, cost, bound)
+            yield path, cost, bound
+        if bound <= 1.0 or weight <= 1.0:
+            return
+        weight = max(1.0, weight - weight_step)
+        open_set |= incons
+        incons = set()
+
 # Example usage
 if __name__ == "__main__":
+    from heuristic_provider import CoordinateHeuristics
+    from search_trace import SearchTracer
+    from trace_replay import replay
+
     # Graph: A -> B(1), C(4); B -> D(2); C -> E(3); D -> E(1)
     graph = {
         'A': ['B', 'C'],
@@ -81,14 +214,16 @@ if __name__ == "__main__":
         ('D', 'E'): 1
     }
 
-    # Heuristics (e.g., straight-line distance to E)
-    heuristics = {
-        'A': 3,
-        'B': 2,
-        'C': 1,
-        'D': 1,
-        'E': 0
+    # Node positions; heuristics are Manhattan distances to E
+    coords = {
+        'A': (3, 0),
+        'B': (2, 0),
+        'C': (0, 1),
+        'D': (1, 0),
+        'E': (0, 0)
     }
+    provider = CoordinateHeuristics(graph, coords, metric='manhattan')
+    heuristics = provider.heuristic('E')
 
     print("Graph adjacency list:")
     for node, neighbors in graph.items():
@@ -98,8 +233,19 @@ if __name__ == "__main__":
         print(f"{edge}: {weight}")
     print()
 
-    path = weighted_a_star(graph, weights, heuristics, 'A', 'E', weight=1.5)
+    tracer = SearchTracer()
+    path = weighted_a_star(graph, weights, heuristics, 'A', 'E', weight=1.5, tracer=tracer)
+    replay(tracer)
     if path:
         print(f"\nPath found: {path}")
     else:
         print("\nNo path found")
+    print()
+
+    tracer = SearchTracer()
+    solutions = list(ara_star(graph, weights, heuristics, 'A', 'E', initial_weight=3.0,
+                              weight_step=1.0, tracer=tracer))
+    replay(tracer)
+    for path, cost, bound in solutions:
+        print(f"ARA* path: {path} (cost: {cost}, bound: {bound})")
+